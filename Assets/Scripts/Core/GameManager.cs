@@ -213,13 +213,15 @@ namespace FocusFounder.Core
         {
             if (!_gameInitialized) return;
 
-            // Tick all services that need regular updates
-            var deltaTime = Services.Get<ITimeProvider>()?.DeltaTime ?? 0f;
+            // Tick all services that need regular updates, one fixed step at a time in fixed-step mode
+            var clock = Services.Get<ISimulationClock>();
+            if (clock == null) return;
+            var steps = clock.ConsumeSteps(out var stepDeltaTime);
 
-            if (deltaTime > 0f) // Only tick when focused
+            for (int i = 0; i < steps; i++) // No steps while unfocused
             {
-                Services.Get<IEmployeeService>()?.TickAllEmployees(deltaTime);
-                Services.Get<IOfficeService>()?.TickAllOffices(deltaTime);
+                Services.Get<IEmployeeService>()?.TickAllEmployees(stepDeltaTime);
+                Services.Get<IOfficeService>()?.TickAllOffices(stepDeltaTime);
             }
         }
 
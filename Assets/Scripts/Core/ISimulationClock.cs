@@ -6,6 +6,10 @@ namespace FocusFounder.Core
     public interface ISimulationClock : ITimeProvider
     {
         bool Running { get; }
+        bool FixedStep { get; }
         void SetRunning(bool running);
+
+        // Once per frame: how many simulation steps to run now, each stepDeltaTime long
+        int ConsumeSteps(out float stepDeltaTime);
     }
 }
\ No newline at end of file
@@ -6,15 +6,26 @@ namespace FocusFounder.Core
     /// <summary>
     /// Central clock that controls all simulation timing
     /// Only advances when the game is focused and running
+    /// In fixed-step mode frame time is banked and spent in whole steps of fixedDeltaTime
     /// </summary>
     public sealed class SimulationClock : Singleton<SimulationClock>, ISimulationClock
     {
+        [Header("Timestep")]
+        [Tooltip("Advance the simulation in whole steps of Fixed Delta Time so results do not depend on frame rate")]
+        [SerializeField] private bool fixedStep = true;
+        [SerializeField] private float fixedDeltaTime = 0.05f;
+        [Tooltip("Most steps run in one frame; time owed beyond one more frame of catch-up is dropped")]
+        [SerializeField] private int maxStepsPerFrame = 8;
+
         private bool _running = true;
         private IFocusService _focusService;
+        private double _accumulator;
 
         public bool Running => _running;
         public float DeltaTime => _running && _focusService?.IsFocused == true ? Time.deltaTime : 0f;
         public double NowRealtime => Time.realtimeSinceStartupAsDouble;
+        public bool FixedStep => fixedStep;
+        public double DroppedTime { get; private set; }   // simulated seconds lost to the catch-up cap
 
         public void Initialize(IFocusService focusService)
         {
@@ -25,5 +36,38 @@ namespace FocusFounder.Core
         {
             _running = running;
         }
+
+        public int ConsumeSteps(out float stepDeltaTime)
+        {
+            var deltaTime = DeltaTime;
+            if (!fixedStep)
+            {
+                stepDeltaTime = deltaTime;
+                return deltaTime > 0f ? 1 : 0;
+            }
+
+            stepDeltaTime = fixedDeltaTime;
+            _accumulator += deltaTime;
+            var steps = (int)(_accumulator / fixedDeltaTime);
+            if (steps > maxStepsPerFrame)
+            {
+                // Catch up over the next frame at most instead of chasing a long hitch
+                var budget = 2.0 * maxStepsPerFrame * fixedDeltaTime;
+                if (_accumulator > budget)
+                {
+                    DroppedTime += _accumulator - budget;
+                    _accumulator = budget;
+                }
+                steps = maxStepsPerFrame;
+            }
+            _accumulator -= steps * (double)fixedDeltaTime;
+            return steps;
+        }
+
+        private void OnValidate()
+        {
+            fixedDeltaTime = Mathf.Max(0.001f, fixedDeltaTime);
+            maxStepsPerFrame = Mathf.Max(1, maxStepsPerFrame);
+        }
     }
 }
\ No newline at end of file
@@ -0,0 +1,81 @@
+using System;
+using UnityEngine;
+
+namespace FocusFounder.Data
+{
+    /// <summary>
+    /// AnimationCurve sampled into an evenly spaced table at content-build time
+    /// (curve_bake.py), read with a clamped linear lookup instead of a Hermite evaluation.
+    /// The table is only used while the curve still hashes to sourceHash; once the curve
+    /// is edited without a re-bake, Evaluate falls back to the curve itself
+    /// </summary>
+    [Serializable]
+    public struct BakedCurve
+    {
+        [SerializeField] public float start;
+        [SerializeField] public float end;
+        [SerializeField] public float maxError; // largest |table - curve| measured when baking
+        [SerializeField] public int sourceHash; // Hash() of the curve the table was baked from
+        [SerializeField] public float[] samples;
+
+        [NonSerialized] private int verified; // 0 not compared with the curve yet, 1 current, -1 stale
+
+        public bool IsBaked => samples != null && samples.Length >= 2 && end > start;
+
+        public bool IsCurrent(AnimationCurve curve) => IsBaked && curve != null && sourceHash == Hash(curve);
+
+        public float Evaluate(float time)
+        {
+            var last = samples.Length - 1;
+            var x = Mathf.Clamp((time - start) * (last / (end - start)), 0f, last);
+            var i = Mathf.Min((int)x, last - 1);
+            var a = samples[i];
+            return a + (samples[i + 1] - a) * (x - i);
+        }
+
+        public float Evaluate(AnimationCurve curve, float time)
+        {
+            // Compared once, since reading curve.keys allocates
+            if (verified == 0)
+                verified = IsCurrent(curve) ? 1 : -1;
+            return verified > 0 ? Evaluate(time) : curve.Evaluate(time);
+        }
+
+        /// <summary>Compare with the curve again on the next Evaluate (call from OnValidate)</summary>
+        public void Invalidate()
+        {
+            verified = 0;
+        }
+
+        /// <summary>
+        /// FNV-1a over the bits of every key's time, value, slopes, weights and weighted mode,
+        /// then the wrap modes as serialized (0 ping-pong, 1 loop, 2 clamp); curve_bake.py
+        /// computes the same hash from the .asset text
+        /// </summary>
+        public static int Hash(AnimationCurve curve)
+        {
+            unchecked
+            {
+                var hash = 2166136261u;
+                foreach (var key in curve.keys)
+                {
+                    hash = (hash ^ (uint)BitConverter.SingleToInt32Bits(key.time)) * 16777619u;
+                    hash = (hash ^ (uint)BitConverter.SingleToInt32Bits(key.value)) * 16777619u;
+                    hash = (hash ^ (uint)BitConverter.SingleToInt32Bits(key.inTangent)) * 16777619u;
+                    hash = (hash ^ (uint)BitConverter.SingleToInt32Bits(key.outTangent)) * 16777619u;
+                    hash = (hash ^ (uint)BitConverter.SingleToInt32Bits(key.inWeight)) * 16777619u;
+                    hash = (hash ^ (uint)BitConverter.SingleToInt32Bits(key.outWeight)) * 16777619u;
+                    hash = (hash ^ (uint)key.weightedMode) * 16777619u;
+                }
+                hash = (hash ^ (uint)SerializedWrap(curve.preWrapMode)) * 16777619u;
+                hash = (hash ^ (uint)SerializedWrap(curve.postWrapMode)) * 16777619u;
+                return (int)hash;
+            }
+        }
+
+        private static int SerializedWrap(WrapMode mode)
+        {
+            return mode == WrapMode.PingPong ? 0 : mode == WrapMode.Loop ? 1 : 2;
+        }
+    }
+}
\ No newline at end of file
@@ -30,6 +30,7 @@ namespace FocusFounder.Data
         [Header("Output")]
         public RewardBundle baseReward;
         public AnimationCurve difficultyMultiplier = AnimationCurve.Constant(1f, 10f, 1f);
+        [HideInInspector] public BakedCurve difficultyMultiplierBaked;
 
         [Header("Requirements")]
         public string[] requiredSkills;
@@ -46,6 +47,7 @@ namespace FocusFounder.Data
                 id = name.ToLower().Replace(" ", "_");
 
             baseDuration = Mathf.Max(1f, baseDuration);
+            difficultyMultiplierBaked.Invalidate();
         }
 
         public float GetDurationForLevel(float level)
@@ -56,7 +58,7 @@ namespace FocusFounder.Data
 
         public RewardBundle GetRewardForLevel(float level)
         {
-            var multiplier = difficultyMultiplier.Evaluate(level);
+            var multiplier = difficultyMultiplierBaked.Evaluate(difficultyMultiplier, level);
             return baseReward * multiplier;
         }
     }
@@ -1,5 +1,4 @@
 using System.Collections.Generic;
-using System.Linq;
 using UnityEngine;
 
 namespace FocusFounder.Services
@@ -15,8 +14,9 @@ namespace FocusFounder.Services
     public class TaskService : Singleton<TaskService>, ITaskService
     {
         [SerializeField] private BaseYieldStrategy defaultYieldStrategy;
+        [SerializeField] private TaskRoutingPolicy routingPolicy = TaskRoutingPolicy.SkillAware;
 
-        private Dictionary<string, Queue<TaskInstance>> _officeQueues = new();
+        private Dictionary<string, TaskRouter> _officeQueues = new();
         private IEconomyService _economyService;
         private IEventBus _eventBus;
 
@@ -35,7 +35,7 @@ namespace FocusFounder.Services
             var task = new TaskInstance(taskDef);
 
             if (!_officeQueues.ContainsKey(office.Id))
-                _officeQueues[office.Id] = new Queue<TaskInstance>();
+                _officeQueues[office.Id] = new TaskRouter(routingPolicy);
 
             _officeQueues[office.Id].Enqueue(task);
             OnTaskQueued?.Invoke(task);
@@ -46,12 +46,10 @@ namespace FocusFounder.Services
             if (!_officeQueues.ContainsKey(office.Id))
                 return null;
 
-            var queue = _officeQueues[office.Id];
-            if (queue.Count == 0)
+            var task = _officeQueues[office.Id].Dequeue(employee);
+            if (task == null)
                 return null;
 
-            // Simple FIFO for now - could implement priority/routing strategies
-            var task = queue.Dequeue();
             OnTaskStarted?.Invoke(employee, task);
             return task;
         }
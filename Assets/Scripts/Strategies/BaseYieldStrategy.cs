@@ -11,13 +11,19 @@ namespace FocusFounder.Strategies
         [Header("Quality Scaling")]
         [SerializeField] private float qualityMultiplier = 1f;
         [SerializeField] private AnimationCurve qualityCurve = AnimationCurve.Linear(0f, 0.5f, 100f, 1.5f);
+        [SerializeField, HideInInspector] private BakedCurve qualityCurveBaked;
+
+        private void OnValidate()
+        {
+            qualityCurveBaked.Invalidate();
+        }
 
         public RewardBundle ComputeYield(Employee employee, TaskInstance task, GlobalModifiers globalMods)
         {
             var baseReward = task.Definition.GetRewardForLevel(employee.Level);
 
             // Quality impact
-            var qualityMultiplier = qualityCurve.Evaluate(employee.Stats.quality);
+            var qualityMultiplier = qualityCurveBaked.Evaluate(qualityCurve, employee.Stats.quality);
 
             // Global revenue modifier
             var globalMultiplier = globalMods.RevenueMultiplier;
@@ -0,0 +1,365 @@
+# Unity AnimationCurve evaluation for the Python tooling.
+# Reads the serialized curve format of .asset files (m_Curve keys with
+# in/out slopes and weights, m_PreInfinity / m_PostInfinity) and evaluates it
+# the way AnimationCurve.Evaluate does, vectorized over NumPy arrays:
+#
+#   segment       cubic Hermite from the keys' out/in slopes; when either key
+#                 of the segment is weighted on that side, the weighted Bezier
+#                 (control points at weight * segment width along the tangents,
+#                 1/3 for an unweighted side) solved for time; an infinite
+#                 slope on either side makes the segment stepped
+#   wrap modes    2 clamp (the first/last key's value), 1 loop, 0 ping-pong
+#
+# Curves can be baked into fixed-resolution lookup tables (linear between
+# samples) with a measured error bound; bake_to_tolerance doubles the
+# resolution until the bound holds. DEFAULT_CURVES are the curves the C# field
+# initializers create, for objects that have no asset yet.
+#
+#   python animation_curve.py ../Data/Tasks/Task_.asset --at 1 5 10
+#   python animation_curve.py ../Data/Tasks/Task_.asset --bake 256 --bench 10000000
+import argparse
+import re
+import sys
+import time
+
+import numpy as np
+
+PING_PONG, LOOP, CLAMP = 0, 1, 2
+# WeightedMode flags
+WEIGHTED_IN, WEIGHTED_OUT = 1, 2
+_UNWEIGHTED = 1.0 / 3.0
+_BISECTIONS = 40
+_CHUNK = 1 << 14
+
+_FIELD = re.compile(r"^(\s*)(\w+):\n\1  serializedVersion: \d+\n\1  m_Curve:(.*?)\n\1  m_PreInfinity: (\d+)\n"
+                    r"\1  m_PostInfinity: (\d+)", re.M | re.S)
+_KEY_FIELDS = ("time", "value", "inSlope", "outSlope", "weightedMode", "inWeight", "outWeight")
+
+
+class Curve:
+    """Keyframes as parallel arrays; evaluate() accepts scalars or arrays of time."""
+
+    def __init__(self, keys, pre_wrap=CLAMP, post_wrap=CLAMP):
+        keys = sorted(keys, key=lambda key: key["time"])
+        column = lambda name, default=0.0: np.array([float(key.get(name, default)) for key in keys])
+        self.time = column("time")
+        self.value = column("value")
+        self.in_slope = column("inSlope")
+        self.out_slope = column("outSlope")
+        self.weighted_mode = column("weightedMode").astype(np.int64)
+        self.in_weight = np.clip(column("inWeight", _UNWEIGHTED), 0.0, 1.0)
+        self.out_weight = np.clip(column("outWeight", _UNWEIGHTED), 0.0, 1.0)
+        self.pre_wrap = pre_wrap
+        self.post_wrap = post_wrap
+        self._segment = None
+
+    @classmethod
+    def linear(cls, time_start, value_start, time_end, value_end):
+        """AnimationCurve.Linear."""
+        slope = (value_end - value_start) / (time_end - time_start) if time_end != time_start else 0.0
+        return cls([{"time": time_start, "value": value_start, "inSlope": slope, "outSlope": slope},
+                    {"time": time_end, "value": value_end, "inSlope": slope, "outSlope": slope}])
+
+    @classmethod
+    def constant(cls, time_start, time_end, value):
+        """AnimationCurve.Constant."""
+        return cls([{"time": time_start, "value": value}, {"time": time_end, "value": value}])
+
+    def __len__(self):
+        return len(self.time)
+
+    def source_hash(self):
+        """C# BakedCurve.Hash: FNV-1a over the float32 bits of each key, then the wrap modes, as an int32."""
+        floats = np.column_stack([column.astype(np.float32).view(np.uint32) for column in
+                                  (self.time, self.value, self.in_slope, self.out_slope, self.in_weight,
+                                   self.out_weight)])
+        words = np.column_stack((floats, self.weighted_mode.astype(np.uint32))).ravel().tolist()
+        value = 2166136261
+        for word in words + [self.pre_wrap, self.post_wrap]:
+            value = ((value ^ word) * 16777619) & 0xFFFFFFFF
+        return value - (1 << 32) if value >= 1 << 31 else value
+
+    @property
+    def start(self):
+        return float(self.time[0])
+
+    @property
+    def end(self):
+        return float(self.time[-1])
+
+    def _wrap(self, t):
+        """Map times outside [start, end] into it by the wrap modes (clamped times stay out)."""
+        span = self.end - self.start
+        if span <= 0:
+            return t
+        for mode, outside in ((self.pre_wrap, t < self.start), (self.post_wrap, t > self.end)):
+            if mode == CLAMP or not outside.any():
+                continue
+            offset = t[outside] - self.start
+            if mode == LOOP:
+                t[outside] = self.start + np.mod(offset, span)
+            else:
+                phase = np.mod(offset, 2.0 * span)
+                t[outside] = self.start + np.where(phase > span, 2.0 * span - phase, phase)
+        return t
+
+    def _prepare(self):
+        """Per-segment polynomial coefficients, computed once per curve."""
+        if self._segment is not None:
+            return self._segment
+        t0, t1 = self.time[:-1], self.time[1:]
+        v0, v1 = self.value[:-1], self.value[1:]
+        s0, s1 = self.out_slope[:-1], self.in_slope[1:]
+        dx = t1 - t0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = np.where(dx > 0, 1.0 / np.where(dx > 0, dx, 1.0), 0.0)
+            m0, m1 = s0 * dx, s1 * dx
+            # Hermite in the segment's local u: v0 + m0 u + c2 u^2 + c3 u^3
+            c2 = -3 * v0 - 2 * m0 - m1 + 3 * v1
+            c3 = 2 * v0 + m0 + m1 - 2 * v1
+        stepped = np.isinf(s0) | np.isinf(s1)
+        m0, c2, c3 = (np.where(stepped, 0.0, c) for c in (m0, c2, c3))
+        w0 = np.where(self.weighted_mode[:-1] & WEIGHTED_OUT, self.out_weight[:-1], _UNWEIGHTED)
+        w1 = np.where(self.weighted_mode[1:] & WEIGHTED_IN, self.in_weight[1:], _UNWEIGHTED)
+        weighted = (((self.weighted_mode[:-1] & WEIGHTED_OUT) != 0) | ((self.weighted_mode[1:] & WEIGHTED_IN) != 0)) & ~stepped
+        self._segment = {"t0": t0, "inv": inv, "c0": v0, "c1": m0, "c2": c2, "c3": c3,
+                         "weighted": weighted, "bezier": (v0, v0 + w0 * dx * s0, v1 - w1 * dx * s1, v1, w0, 1.0 - w1)}
+        return self._segment
+
+    def evaluate(self, t, out=None):
+        """Value at t (scalar or array); out, when given, receives the float64 result."""
+        t = np.asarray(t, np.float64)
+        scalar = t.ndim == 0
+        shape = t.shape
+        t = t.ravel()
+        result = np.empty(len(t)) if out is None else out.reshape(-1)
+        if len(self) < 2:
+            result[:] = self.value[0] if len(self) else 0.0
+        else:
+            # Chunks small enough to stay in cache between the passes over them
+            for start in range(0, len(t), _CHUNK):
+                chunk = t[start:start + _CHUNK]
+                if self._needs_wrap(chunk):
+                    chunk = self._wrap(chunk.copy())
+                self._segments(chunk, result[start:start + _CHUNK])
+        if scalar:
+            return float(result[0])
+        return result.reshape(shape) if out is None else out
+
+    def _needs_wrap(self, t):
+        return len(t) and ((self.pre_wrap != CLAMP and self.start > t.min()) or
+                (self.post_wrap != CLAMP and self.end < t.max()))
+
+    def _segments(self, t, out):
+        seg = self._prepare()
+        if len(self) == 2:
+            # One segment: scalar coefficients, no lookup
+            i = 0
+            u = t - seg["t0"][0]
+            u *= seg["inv"][0]
+            coefficient = lambda name: seg[name][0]
+        else:
+            i = np.searchsorted(self.time[1:-1], t, side="right")
+            u = t - seg["t0"][i]
+            u *= seg["inv"][i]
+            coefficient = lambda name: seg[name][i]
+        # Clamping u makes times before the first key and after the last
+        # evaluate to those keys' values, which is the clamp wrap mode
+        np.clip(u, 0.0, 1.0, out=u)
+        np.multiply(coefficient("c3"), u, out=out)
+        out += coefficient("c2")
+        out *= u
+        out += coefficient("c1")
+        out *= u
+        out += coefficient("c0")
+
+        if seg["weighted"].any():
+            weighted = np.flatnonzero(seg["weighted"][i]) if len(self) > 2 else np.arange(len(t))
+            j = i[weighted] if len(self) > 2 else 0
+            p0, p1, p2, p3, x1, x2 = (c[j] for c in seg["bezier"])
+            s = _bezier_parameter(u[weighted], x1, x2)
+            out[weighted] = _bezier_value(s, p0, p1, p2, p3)
+        # Exact end value (the Hermite sum at u = 1 can be an ulp off, and stepped segments hold v0)
+        np.copyto(out, self.value[-1], where=t >= self.end)
+
+    def bake(self, resolution=256, start=None, end=None):
+        """Lookup table of resolution samples over [start, end] (the key range by default)."""
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        return BakedCurve(self.evaluate(np.linspace(start, end, resolution)).astype(np.float32), start, end,
+                          self.pre_wrap, self.post_wrap)
+
+
+def _bezier_value(s, p0, p1, p2, p3):
+    r = 1.0 - s
+    return r * r * r * p0 + 3 * r * r * s * p1 + 3 * r * s * s * p2 + s * s * s * p3
+
+
+def _bezier_parameter(u, x1, x2):
+    """Bezier parameter whose time (0, x1, x2, 1 control points) equals u; monotonic, so bisection."""
+    lo = np.zeros_like(u)
+    hi = np.ones_like(u)
+    for _ in range(_BISECTIONS):
+        mid = 0.5 * (lo + hi)
+        below = _bezier_value(mid, 0.0, x1, x2, 1.0) < u
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+class BakedCurve:
+    """A curve sampled at evenly spaced times, evaluated by linear interpolation.
+
+    evaluate() follows the C# BakedCurve.Evaluate step for step in float32, so
+    the tooling and the game read the same values from the same table. It is
+    several times faster than Curve.evaluate on many-key curves, but a
+    one-segment curve is already just a cubic, so there the two are close.
+    """
+
+    def __init__(self, table, start, end, pre_wrap=CLAMP, post_wrap=CLAMP):
+        self.table = np.asarray(table, np.float32)
+        if len(self.table) < 2:
+            raise ValueError("a baked curve needs at least two samples")
+        self.start = float(start)
+        self.end = float(end)
+        self.pre_wrap = pre_wrap
+        self.post_wrap = post_wrap
+        last = np.float32(len(self.table) - 1)
+        span = np.float32(self.end) - np.float32(self.start)
+        self._scale = last / span if span > 0 else np.float32(0.0)
+        self._slope = np.diff(self.table)
+        # (a, b - a) per segment side by side, so one gather fetches both
+        self._pairs = np.column_stack((self.table[:-1], self._slope)).view(np.uint64).ravel()
+
+    def evaluate(self, t, out=None):
+        """Value at t (scalar or array); out, when given, receives the float32 result."""
+        t = np.asarray(t)
+        scalar = t.ndim == 0
+        shape = t.shape
+        t = t.ravel()
+        result = np.empty(len(t), np.float32) if out is None else out.reshape(-1)
+        wrap = Curve([{"time": self.start}, {"time": self.end}], self.pre_wrap, self.post_wrap)
+        size = min(len(t), _CHUNK)
+        x, floor = np.empty(size, np.float32), np.empty(size, np.float32)
+        i = np.empty(size, np.int32)
+        pairs = np.empty(size, np.uint64)
+        start32 = np.float32(self.start)
+        last = np.float32(len(self.table) - 1)
+        for start in range(0, len(t), _CHUNK):
+            chunk = t[start:start + _CHUNK]
+            n = len(chunk)
+            if wrap._needs_wrap(chunk):
+                chunk = wrap._wrap(chunk.astype(np.float64))
+            xs, fs, index, o = x[:n], floor[:n], i[:n], result[start:start + n]
+            # x = Clamp((time - start) * scale, 0, last); i = Min((int)x, last - 1), in float32 as in C#
+            xs[...] = chunk
+            xs -= start32
+            xs *= self._scale
+            np.clip(xs, 0.0, last, out=xs)
+            np.floor(xs, out=fs)
+            np.minimum(fs, last - 1, out=fs)
+            index[...] = fs
+            xs -= fs
+            # a + (b - a) * (x - i)
+            np.take(self._pairs, index, out=pairs[:n])
+            gathered = pairs[:n].view(np.float32)
+            np.multiply(gathered[1::2], xs, out=o)
+            o += gathered[0::2]
+        if scalar:
+            return float(result[0])
+        return result.reshape(shape) if out is None else out
+
+    def max_error(self, curve, samples=65536):
+        """Largest |baked - exact| over samples evenly spaced times, including every key."""
+        t = np.union1d(np.linspace(self.start, self.end, samples), curve.time)
+        return float(np.abs(self.evaluate(t) - curve.evaluate(t)).max())
+
+
+def bake_to_tolerance(curve, tolerance, start=None, end=None, max_resolution=1 << 16):
+    """Smallest power-of-two-plus-one table whose measured error is within tolerance."""
+    resolution = 3
+    while True:
+        baked = curve.bake(resolution, start, end)
+        error = baked.max_error(curve)
+        if error <= tolerance or resolution >= max_resolution:
+            return baked, error
+        resolution = (resolution - 1) * 2 + 1
+
+
+def parse_curves(text):
+    """field name -> Curve for every serialized AnimationCurve in an .asset's text."""
+    curves = {}
+    for match in _FIELD.finditer(text):
+        body = match.group(3)
+        keys = []
+        for chunk in re.split(r"\n\s*- serializedVersion: \d+", body)[1:]:
+            fields = dict(re.findall(r"^\s*(\w+): (\S+)", chunk, re.M))
+            keys.append({name: _number(fields[name]) for name in _KEY_FIELDS if name in fields})
+        curves[match.group(2)] = Curve(keys, int(match.group(4)), int(match.group(5)))
+    return curves
+
+
+def _number(text):
+    # Unity writes infinite tangents as Infinity / -Infinity
+    return float(text.replace("Infinity", "inf"))
+
+
+def load_curves(path):
+    with open(path, encoding="utf-8") as f:
+        return parse_curves(f.read())
+
+
+# The curves the C# field initializers create
+DEFAULT_CURVES = {
+    "TaskDefinitionSO.difficultyMultiplier": Curve.constant(1.0, 10.0, 1.0),
+    "BaseYieldStrategy.qualityCurve": Curve.linear(0.0, 0.5, 100.0, 1.5),
+    "EmployeeArchetypeSO.productivityGrowth": Curve.linear(1.0, 1.0, 10.0, 2.0),
+    "EmployeeArchetypeSO.efficiencyGrowth": Curve.linear(1.0, 1.0, 10.0, 1.5),
+    "UpgradeDefinitionSO.costScaling": Curve.linear(1.0, 1.0, 10.0, 5.0),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate and bake the AnimationCurves of .asset files")
+    parser.add_argument("assets", nargs="*", help=".asset files (default: the C# default curves)")
+    parser.add_argument("--at", type=float, nargs="+", default=[], help="print each curve's value at these times")
+    parser.add_argument("--bake", type=int, help="bake to a table of this many samples and report its error")
+    parser.add_argument("--tolerance", type=float,
+                        help="bake to the smallest table within this absolute error instead")
+    parser.add_argument("--bench", type=int, help="time exact and baked evaluation of this many samples")
+    args = parser.parse_args(argv)
+
+    curves = {}
+    for path in args.assets:
+        curves.update({f"{path}:{name}": curve for name, curve in load_curves(path).items()})
+    if not args.assets:
+        curves = dict(DEFAULT_CURVES)
+
+    for name, curve in curves.items():
+        print(f"{name}: {len(curve)} keys over [{curve.start:g}, {curve.end:g}], "
+              f"wrap {curve.pre_wrap}/{curve.post_wrap}")
+        if args.at:
+            print("  " + "  ".join(f"{t:g} -> {curve.evaluate(t):.6g}" for t in args.at))
+        baked = None
+        if args.tolerance is not None:
+            baked, error = bake_to_tolerance(curve, args.tolerance)
+            print(f"  baked: {len(baked.table)} samples, max error {error:.3g}")
+        elif args.bake:
+            baked = curve.bake(args.bake)
+            print(f"  baked: {len(baked.table)} samples, max error {baked.max_error(curve):.3g}")
+        if args.bench:
+            t = np.random.default_rng(0).uniform(curve.start - 1.0, curve.end + 1.0, args.bench)
+            start = time.perf_counter()
+            curve.evaluate(t)
+            exact = time.perf_counter() - start
+            line = f"  {args.bench} samples: exact {exact * 1000:.0f} ms"
+            if baked is not None:
+                start = time.perf_counter()
+                baked.evaluate(t)
+                line += f", baked {(time.perf_counter() - start) * 1000:.0f} ms"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
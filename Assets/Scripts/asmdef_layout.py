@@ -0,0 +1,200 @@
+# Assembly definition layout for the generated scripts.
+# Splits the output into one assembly per layer so that editing a view model
+# no longer recompiles the simulation core. References between assemblies come
+# from the type dependency graph (csharp_deps), package references from the
+# external usings; a layout whose assemblies would reference each other in a
+# cycle is refused, since Unity cannot compile it. Folders that share an
+# assembly with another folder (Data joins Domain) get an .asmref.
+# Management (GameManager and friends) stays in Assembly-CSharp, which sees
+# every auto-referenced assembly.
+#
+#   python asmdef_layout.py                 # check and print the planned layout
+#   python generate.py --asmdef             # generate, then write the layout
+import argparse
+import json
+import sys
+
+import unity_meta
+from csharp_deps import DependencyGraph, strongly_connected
+from csharp_validator import generated_files
+from generator_manifest import OUTPUT_ROOT, Manifest, write_scripts
+
+DEFAULT_ASSEMBLY = "Assembly-CSharp"
+
+# Assembly -> output folders, in dependency order; the first folder holds the .asmdef
+LAYERS = {
+    "FocusFounder.Core": ["Core"],
+    "FocusFounder.Domain": ["Domain", "Data"],
+    "FocusFounder.Strategies": ["Strategies"],
+    "FocusFounder.Services": ["Services"],
+    "FocusFounder.Focus": ["Focus"],
+    "FocusFounder.UI": ["UI"],
+    "FocusFounder.Animation": ["Animation"],
+}
+
+# using prefix -> package assembly that provides it
+PACKAGE_ASSEMBLIES = {
+    "TMPro": "Unity.TextMeshPro",
+    "Unity.Mathematics": "Unity.Mathematics",
+    "UnityEngine.UI": "UnityEngine.UI",
+}
+
+
+class LayoutError(ValueError):
+    pass
+
+
+def assembly_for_folder(folder):
+    for assembly, folders in LAYERS.items():
+        if folder in folders:
+            return assembly
+    return DEFAULT_ASSEMBLY
+
+
+def _assembly_of(label):
+    return assembly_for_folder(label.split("/", 1)[0])
+
+
+class Layout:
+    """Planned assemblies: files, references and the cost of touching each one."""
+
+    def __init__(self, files):
+        self.graph = DependencyGraph(files, _assembly_of)
+        self.files = {}
+        for label in self.graph.files:
+            self.files.setdefault(self.graph.assembly(label), []).append(label)
+
+        # assembly -> {referenced assembly: [(file, dependency file, types)]}
+        self.uses = {assembly: {} for assembly in self.files}
+        for label, deps in self.graph.edges.items():
+            source = self.graph.assembly(label)
+            for dep, names in deps.items():
+                target = self.graph.assembly(dep)
+                if target != source:
+                    self.uses[source].setdefault(target, []).append((label, dep, names))
+
+        self.packages = {assembly: set() for assembly in self.files}
+        for label, source in self.graph.files.items():
+            for target, _ in source.usings:
+                for prefix, package in PACKAGE_ASSEMBLIES.items():
+                    if target == prefix or target.startswith(prefix + "."):
+                        self.packages[self.graph.assembly(label)].add(package)
+
+    def references(self, assembly):
+        return sorted(self.uses[assembly]) + sorted(self.packages[assembly])
+
+    def problems(self):
+        """Reasons Unity could not compile the layout, with the references behind each."""
+        found = []
+        for assembly, targets in sorted(self.uses.items()):
+            if assembly != DEFAULT_ASSEMBLY and DEFAULT_ASSEMBLY in targets:
+                found.append((f"{assembly} uses types that stay in {DEFAULT_ASSEMBLY}",
+                              [(assembly, DEFAULT_ASSEMBLY, targets[DEFAULT_ASSEMBLY])]))
+        graph = {assembly: set(targets) for assembly, targets in self.uses.items()}
+        for cycle in strongly_connected(graph):
+            members = set(cycle)
+            edges = [(assembly, target, uses) for assembly in cycle
+                     for target, uses in sorted(self.uses[assembly].items()) if target in members]
+            found.append((f"assembly cycle: {' <-> '.join(cycle)}", edges))
+        return found
+
+    def check(self):
+        problems = self.problems()
+        if problems:
+            lines = []
+            for message, edges in problems:
+                lines.append(message)
+                # The thinnest edges are usually the ones to break, so list them first
+                for source, target, uses in sorted(edges, key=lambda edge: len(edge[2])):
+                    lines.append(f"  {source} -> {target}: {len(uses)} reference(s)")
+                    lines += [f"    {label} -> {dep} ({', '.join(names)})" for label, dep, names in uses[:3]]
+                    if len(uses) > 3:
+                        lines.append(f"    ... {len(uses) - 3} more")
+            raise LayoutError("\n".join(lines))
+
+    def recompiled_by(self, assembly):
+        """Files Unity recompiles when a file of assembly changes (it plus its dependants)."""
+        dependants = {assembly}
+        changed = True
+        while changed:
+            changed = False
+            for source, targets in self.uses.items():
+                if source not in dependants and dependants & set(targets):
+                    dependants.add(source)
+                    changed = True
+        return sum(len(self.files[name]) for name in dependants)
+
+    def asset_files(self):
+        """folder -> {file name: contents} of every .asmdef / .asmref to write."""
+        assets = {}
+        for assembly, folders in LAYERS.items():
+            if assembly not in self.files:
+                continue
+            assets.setdefault(folders[0], {})[f"{assembly}.asmdef"] = asmdef_text(assembly, self.references(assembly))
+            for folder in folders[1:]:
+                assets.setdefault(folder, {})[f"{assembly}.asmref"] = json.dumps({"reference": assembly}, indent=4)
+        return assets
+
+    def summary(self):
+        total = len(self.graph.files)
+        lines = [f"{'assembly':<26}{'files':>6}{'recompiled on edit':>20}  references"]
+        for assembly in list(LAYERS) + [DEFAULT_ASSEMBLY]:
+            if assembly in self.files:
+                lines.append(f"{assembly:<26}{len(self.files[assembly]):>6}"
+                             f"{self.recompiled_by(assembly):>14} / {total:<3}  {', '.join(self.references(assembly))}")
+        return "\n".join(lines)
+
+
+def asmdef_text(name, references):
+    # Field order and 4-space indent as the Unity editor writes them
+    return json.dumps({
+        "name": name,
+        "rootNamespace": name,
+        "references": references,
+        "includePlatforms": [],
+        "excludePlatforms": [],
+        "allowUnsafeCode": False,
+        "overrideReferences": False,
+        "precompiledReferences": [],
+        "autoReferenced": True,
+        "defineConstraints": [],
+        "versionDefines": [],
+        "noEngineReferences": False,
+    }, indent=4)
+
+
+def write_layout(layout, root=OUTPUT_ROOT):
+    """Write the .asmdef/.asmref files (and their .meta) under root; refuses cyclic layouts."""
+    layout.check()
+    manifest = Manifest(root)
+    reports = []
+    for folder, assets in sorted(layout.asset_files().items()):
+        # Assets carry no C# type to derive a GUID from; key it on the file name
+        seeds = {f"{folder}/{name}": unity_meta.derive_guid("asmdef", name) for name in assets}
+        reports.append(write_scripts(folder, assets, root, manifest, seeds, complete=False))
+    manifest.save()
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan (and optionally write) the per-layer assembly definitions")
+    parser.add_argument("--write", action="store_true", help="write the .asmdef/.asmref files")
+    parser.add_argument("--out", default=OUTPUT_ROOT, help="output root (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    layout = Layout(generated_files())
+    print(layout.summary())
+    try:
+        if args.write:
+            for report in write_layout(layout, args.out):
+                print(report)
+        else:
+            layout.check()
+    except LayoutError as exc:
+        print(f"refusing to emit this layout:\n{exc}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
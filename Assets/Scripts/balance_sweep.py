@@ -0,0 +1,326 @@
+# Monte Carlo balance sweeps: distributions of cash, research and reputation at
+# day 1, 7 and 30 of a save instead of single trajectories.
+#
+# Each replica is a small company (a few employees, each auto-requeueing one
+# task definition) simulated with its own seed; replicas are fanned out in
+# batches over a process pool and only a per-replica summary comes back. The
+# summaries are folded into fixed-accuracy quantile sketches as they arrive, so
+# memory stays flat however many replicas run, and the result does not depend
+# on how replicas were batched or scheduled.
+#
+# Model, per employee: the headless_sim / fast_forward rules (Employee.Tick,
+# TaskInstance, BaseYieldStrategy):
+#   task duration  TaskInstance takes definition.baseDuration as it is (it does
+#                  not call GetDurationForLevel, nor apply durationVariation)
+#   work rate      Stats.productivity = base * (1 + (level - 1) * 0.1) * morale / 100;
+#                  employees start at morale 100 and nothing lowers it yet
+#   frames         a task takes a whole number of frames of --frame seconds and
+#                  the next one starts on the following frame (0: continuous)
+#   level-up       every 10 * level tasks (10 XP each, threshold level * 100)
+#   reward         task_reward(): baseReward * difficultyMultiplier(level)
+#                  * qualityCurve(Stats.quality) * revenue multiplier, per
+#                  completed task, with Stats.quality = base * (1 + (level - 1) * 0.1)
+#
+# Within a level every task takes the same time, so each level is one block of
+# 10 * level tasks in closed form; day 30 is a few hundred blocks. A replica's
+# spread comes from which task definitions its employees happen to work.
+#
+#   python balance_sweep.py --replicas 10000 --reward 5 1 0.1
+#   python balance_sweep.py --replicas 500 --employees 8 --frame 0 --json
+import argparse
+import glob
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from animation_curve import bake_to_tolerance, parse_curves
+from curve_bake import TOLERANCE, read_baked
+from headless_sim import DATA_DIR, read_asset_fields
+
+DAYS = (1, 7, 30)
+METRICS = ("cash", "research", "reputation", "tasks", "level")
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+LEVEL_STEP = 0.1
+TASKS_PER_LEVEL = 10  # level * 100 XP at 10 XP per task
+_CHUNK = 4096
+
+_REWARD_BLOCK = re.compile(r"^  baseReward:\n((?:    \w+: .*\n)+)", re.M)
+
+
+def load_definitions(data_dir=DATA_DIR):
+    """Every TaskDefinitionSO asset under data_dir/Tasks as a plain dict."""
+    definitions = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "Tasks", "*.asset"))):
+        fields = read_asset_fields(path)
+        if "baseDuration" not in fields:
+            continue
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        reward = {"cash": 0.0, "research": 0.0, "reputation": 0.0}
+        block = _REWARD_BLOCK.search(text)
+        if block:
+            for key, value in re.findall(r"(\w+): (\S+)", block.group(1)):
+                if key in reward:
+                    reward[key] = float(value)
+        # The baked table the game reads, or one baked here for an unbaked or stale asset
+        baked = read_baked(text).get("difficultyMultiplier")
+        curve = parse_curves(text).get("difficultyMultiplier")
+        if baked is None and curve is not None and len(curve) >= 2 and curve.end > curve.start:
+            baked, _ = bake_to_tolerance(curve, TOLERANCE)
+        table = list(zip(np.linspace(baked.start, baked.end, len(baked.table)).tolist(),
+                         baked.table.tolist())) if baked else []
+        definitions.append({
+            "name": fields.get("m_Name") or os.path.basename(path),
+            "base_duration": max(1.0, float(fields["baseDuration"])),
+            "variation": float(fields.get("durationVariation", 0.2)),
+            "reward": [reward["cash"], reward["research"], reward["reputation"]],
+            # (time, value) samples, interpolated linearly and clamped like BakedCurve
+            "difficulty": table or [(1.0, 1.0), (10.0, 1.0)],
+        })
+    return definitions
+
+
+def task_seconds(definition, level, productivity=1.0, frame=1 / 60):
+    """Seconds each task of the given levels takes: baseDuration / Stats.productivity, in whole frames."""
+    seconds = definition["base_duration"] / (productivity * (1.0 + (np.asarray(level, np.float64) - 1.0) * LEVEL_STEP))
+    if frame > 0:
+        # TaskInstance.Advance(frame * productivity) until remaining <= 0
+        seconds = np.ceil(seconds / frame - 1e-9) * frame
+    return seconds
+
+
+def task_reward(definition, level, quality=1.0, revenue=1.0):
+    """BaseYieldStrategy.ComputeYield's (cash, research, reputation) for one task at each level,
+    shape (levels, 3); quality is the archetype's base quality."""
+    level = np.asarray(level, np.float64)
+    stats_quality = quality * (1.0 + (level - 1.0) * LEVEL_STEP)
+    # qualityCurve: the default Linear(0, 0.5, 100, 1.5), clamped at its keys
+    multiplier = np.interp(level, *zip(*definition["difficulty"])) * (0.5 + np.clip(stats_quality, 0.0, 100.0) / 100.0)
+    return (multiplier * revenue)[..., None] * np.asarray(definition["reward"], np.float64)
+
+
+def simulate_employee(definition, checkpoints, productivity=1.0, quality=1.0, revenue=1.0, frame=1 / 60):
+    """(tasks, level, reward[3]) at every checkpoint (seconds, ascending) for one employee."""
+    out_tasks = np.zeros(len(checkpoints))
+    out_level = np.ones(len(checkpoints))
+    out_reward = np.zeros((len(checkpoints), 3))
+    clock = 0.0
+    tasks = 0.0
+    reward = np.zeros(3)
+    first = 1
+    pending = 0
+    count = 64
+    while pending < len(checkpoints):
+        level = np.arange(first, first + count, dtype=np.float64)
+        per_task = task_seconds(definition, level, productivity, frame)
+        level_tasks = TASKS_PER_LEVEL * level
+        per_reward = task_reward(definition, level, quality, revenue)
+        ends = clock + np.cumsum(level_tasks * per_task)
+        done_tasks = tasks + np.cumsum(level_tasks)
+        done_reward = reward + np.cumsum(level_tasks[:, None] * per_reward, axis=0)
+        while pending < len(checkpoints) and checkpoints[pending] < ends[-1]:
+            at = checkpoints[pending]
+            i = int(np.searchsorted(ends, at, side="right"))
+            start = ends[i - 1] if i else clock
+            # Tasks of the unfinished level completed by then
+            partial = math.floor((at - start) / per_task[i] + 1e-9)
+            out_tasks[pending] = (done_tasks[i - 1] if i else tasks) + partial
+            out_level[pending] = level[i]
+            out_reward[pending] = (done_reward[i - 1] if i else reward) + partial * per_reward[i]
+            pending += 1
+        clock, tasks, reward = ends[-1], done_tasks[-1], done_reward[-1]
+        first += count
+        count = min(count * 2, _CHUNK)
+    return out_tasks, out_level, out_reward
+
+
+def simulate_replica(index, config):
+    """Summary of one replica: array[len(days), len(METRICS)], company totals and mean level."""
+    # Seeded by (seed, index) so a replica is the same whichever worker runs it
+    rng = np.random.default_rng([config["seed"], index])
+    definitions = config["definitions"]
+    checkpoints = [day * config["play_hours"] * 3600.0 for day in config["days"]]
+    summary = np.zeros((len(checkpoints), len(METRICS)))
+    for _ in range(config["employees"]):
+        definition = definitions[int(rng.integers(len(definitions)))]
+        tasks, level, reward = simulate_employee(definition, checkpoints, config["productivity"],
+                                                 config["quality"], config["revenue"], config["frame"])
+        summary[:, :3] += reward
+        summary[:, 3] += tasks
+        summary[:, 4] += level
+    summary[:, 4] /= config["employees"]
+    return summary
+
+
+def _run_batch(start, count, config):
+    return np.stack([simulate_replica(index, config) for index in range(start, start + count)])
+
+
+class QuantileSketch:
+    """Streaming quantiles of non-negative values with a fixed relative accuracy.
+
+    Values land in logarithmic buckets (gamma = (1 + accuracy) / (1 - accuracy)),
+    so any quantile is reported within `accuracy` of a true sample value and the
+    bucket count only grows with the log of the value range, not the sample count.
+    """
+
+    def __init__(self, accuracy=0.001):
+        self.accuracy = accuracy
+        self._log_gamma = math.log((1 + accuracy) / (1 - accuracy))
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, values):
+        values = np.asarray(values, np.float64)
+        self.count += values.size
+        self.total += float(values.sum())
+        positive = values[values > 0]
+        self.zeros += values.size - positive.size
+        if positive.size:
+            keys, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+                                     return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q):
+        if not self.count:
+            return float("nan")
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(key-1), gamma^key] in relative terms
+                return 2 * math.exp(key * self._log_gamma) / (1 + math.exp(self._log_gamma))
+        return 2 * math.exp(max(self.buckets) * self._log_gamma) / (1 + math.exp(self._log_gamma))
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else float("nan")
+
+
+class Sweep:
+    """Sketches for every (day, metric), fed one batch of replica summaries at a time."""
+
+    def __init__(self, days, accuracy=0.001):
+        self.days = days
+        self.sketches = {(day, metric): QuantileSketch(accuracy) for day in days for metric in METRICS}
+        self.replicas = 0
+
+    def add(self, summaries):
+        self.replicas += len(summaries)
+        for d, day in enumerate(self.days):
+            for m, metric in enumerate(METRICS):
+                self.sketches[day, metric].add(summaries[:, d, m])
+
+    def report(self):
+        return {f"day {day}": {metric: {"mean": self.sketches[day, metric].mean,
+                                        **{f"p{round(q * 100)}": self.sketches[day, metric].quantile(q)
+                                           for q in QUANTILES}}
+                               for metric in METRICS}
+                for day in self.days}
+
+
+def run_sweep(config, replicas, jobs=None, batch=None, accuracy=0.001, on_progress=None):
+    """Run replicas over a process pool, aggregating as batches finish; returns the Sweep."""
+    sweep = Sweep(config["days"], accuracy)
+    workers = jobs or os.cpu_count() or 1
+    batch = batch or max(1, min(200, replicas // (workers * 8) or 1))
+    starts = iter(range(0, replicas, batch))
+    if workers == 1:
+        for start in starts:
+            sweep.add(_run_batch(start, min(batch, replicas - start), config))
+            if on_progress:
+                on_progress(sweep.replicas)
+        return sweep
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A bounded number of batches in flight keeps memory flat for any replica count
+        running = set()
+        for start in starts:
+            running.add(pool.submit(_run_batch, start, min(batch, replicas - start), config))
+            if len(running) >= workers * 2:
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    sweep.add(future.result())
+                if on_progress:
+                    on_progress(sweep.replicas)
+        for future in running:
+            sweep.add(future.result())
+    return sweep
+
+
+def print_report(report):
+    columns = ["mean"] + [f"p{round(q * 100)}" for q in QUANTILES]
+    print(f"{'':<18}" + "".join(f"{name:>12}" for name in columns))
+    for day, metrics in report.items():
+        for metric, numbers in metrics.items():
+            print(f"{day + ' ' + metric:<18}" + "".join(f"{numbers[name]:>12.4g}" for name in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo balance sweep over seeded replicas")
+    parser.add_argument("--replicas", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=3, help="employees per replica (default: %(default)s)")
+    parser.add_argument("--days", type=int, nargs="+", default=list(DAYS))
+    parser.add_argument("--play-hours", type=float, default=24.0,
+                        help="hours the simulation clock runs per day (default: %(default)s)")
+    parser.add_argument("--frame", type=float, default=1 / 60,
+                        help="seconds per frame, 0 for continuous time (default: 1/60)")
+    parser.add_argument("--productivity", type=float, default=1.0, help="archetype base productivity")
+    parser.add_argument("--quality", type=float, default=1.0, help="archetype base quality")
+    parser.add_argument("--revenue", type=float, default=1.0, help="global revenue multiplier")
+    parser.add_argument("--reward", type=float, nargs=3, metavar=("CASH", "RESEARCH", "REPUTATION"),
+                        help="override every definition's baseReward")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--accuracy", type=float, default=0.001,
+                        help="relative accuracy of the reported percentiles (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--json", action="store_true", help="print the percentiles as JSON")
+    args = parser.parse_args(argv)
+
+    definitions = load_definitions() or [{"name": "default", "base_duration": 30.0, "variation": 0.2,
+                                         "reward": [0.0, 0.0, 0.0], "difficulty": [(1.0, 1.0), (10.0, 1.0)]}]
+    if args.reward:
+        for definition in definitions:
+            definition["reward"] = list(args.reward)
+    if not any(any(definition["reward"]) for definition in definitions):
+        print("note: every task definition has an empty baseReward; pass --reward to see currencies",
+              file=sys.stderr)
+
+    config = {
+        "seed": args.seed,
+        "days": sorted(args.days),
+        "play_hours": args.play_hours,
+        "employees": args.employees,
+        "frame": args.frame,
+        "productivity": args.productivity,
+        "quality": args.quality,
+        "revenue": args.revenue,
+        "definitions": definitions,
+    }
+    start = time.perf_counter()
+    sweep = run_sweep(config, args.replicas, args.jobs, accuracy=args.accuracy)
+    elapsed = time.perf_counter() - start
+
+    report = sweep.report()
+    if args.json:
+        print(json.dumps(report, indent=1))
+    else:
+        print_report(report)
+    print(f"{sweep.replicas} replicas in {elapsed:.1f} s ({sweep.replicas / elapsed:.0f} replicas/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+# Type dependency graph over the generated (or checked-in) C# sources.
+# Each file's declared types, namespaces and using directives come from the
+# csharp_validator tokenizer; every identifier the file mentions is resolved to
+# a declared type through the file's enclosing namespaces and usings (relative
+# `using Core;` inside FocusFounder.Domain included) or through a qualified
+# name such as Services.SaveService. The planner walks the reverse graph to
+# list what a change transitively affects; Tarjan's algorithm reports the
+# dependency cycles, at file level and between namespaces.
+#
+#   python csharp_deps.py                           # namespace graph + cycles
+#   python csharp_deps.py --changed Domain/Employee.cs
+#   python csharp_deps.py --repo --json
+import argparse
+import json
+import os
+import sys
+
+from csharp_validator import analyze, checked_in_files, generated_files, tokenize
+
+_DECLARATION_KEYWORDS = {"namespace", "using"}
+
+
+class SourceFile:
+    """What one file declares and which identifiers it mentions."""
+
+    def __init__(self, label, text):
+        self.label = label
+        facts = analyze(text)
+        self.namespaces = facts["namespaces"]
+        # Top-level types only; nested types travel with their outer type
+        self.types = [(namespace, name) for namespace, name, _, _, _ in facts["types"] if "." not in name]
+        self.usings = [(target, enclosing) for target, enclosing, _ in facts["usings"]]
+        self.references = set()
+        self.qualified = set()
+        tokens = tokenize(text) if not facts["errors"] else []
+        skip_until_semicolon = False
+        for i, (kind, value, _) in enumerate(tokens):
+            if skip_until_semicolon:
+                skip_until_semicolon = value != ";" and value != "{"
+                continue
+            if kind != "ident":
+                continue
+            if value in _DECLARATION_KEYWORDS:
+                skip_until_semicolon = True
+                continue
+            self.references.add(value)
+            if i >= 2 and tokens[i - 1][1] == "." and tokens[i - 2][0] == "ident":
+                # Walk back over A.B.C to record the qualifier of the last segment
+                j = i - 2
+                parts = [tokens[j][1]]
+                while j >= 2 and tokens[j - 1][1] == "." and tokens[j - 2][0] == "ident":
+                    j -= 2
+                    parts.insert(0, tokens[j][1])
+                self.qualified.add((".".join(parts), value))
+
+    @property
+    def namespace(self):
+        return self.namespaces[0] if self.namespaces else ""
+
+
+def _ancestors(namespace):
+    """FocusFounder.Domain -> [FocusFounder.Domain, FocusFounder, ""]."""
+    parts = namespace.split(".") if namespace else []
+    return [".".join(parts[:cut]) for cut in range(len(parts), -1, -1)]
+
+
+def _join(namespace, name):
+    return f"{namespace}.{name}" if namespace else name
+
+
+class DependencyGraph:
+    """File-level dependency graph; edges point from a file to the files it uses."""
+
+    def __init__(self, files, assembly_of=None):
+        self.files = {label: SourceFile(label, text) for label, text in files.items()}
+        self._assembly_of = assembly_of
+        self.declared_namespaces = set()
+        for source in self.files.values():
+            for namespace in source.namespaces:
+                self.declared_namespaces.update(ns for ns in _ancestors(namespace) if ns)
+        # simple name -> {namespace: declaring file}
+        self.declarations = {}
+        for label, source in self.files.items():
+            for namespace, name in source.types:
+                self.declarations.setdefault(name, {})[namespace] = label
+
+        # file -> {dependency file: sorted type names that cause the edge}
+        self.edges = {label: {} for label in self.files}
+        for label, source in self.files.items():
+            for target, type_name in self._resolve(source):
+                if target != label:
+                    self.edges[label].setdefault(target, set()).add(type_name)
+        self.edges = {label: {dep: sorted(names) for dep, names in deps.items()} for label, deps in self.edges.items()}
+        self.reverse = {label: set() for label in self.files}
+        for label, deps in self.edges.items():
+            for dep in deps:
+                self.reverse[dep].add(label)
+
+    def _resolve_namespace(self, name, enclosing):
+        for outer in _ancestors(enclosing):
+            candidate = _join(outer, name)
+            if candidate in self.declared_namespaces:
+                return candidate
+        return None
+
+    def _visible_namespaces(self, source):
+        visible = []
+        for namespace in source.namespaces or [""]:
+            visible.extend(_ancestors(namespace))
+        for target, enclosing in source.usings:
+            resolved = self._resolve_namespace(target, enclosing)
+            if resolved:
+                visible.append(resolved)
+        return visible
+
+    def _resolve(self, source):
+        """(declaring file, type name) for every type the source refers to."""
+        visible = self._visible_namespaces(source)
+        for name in source.references:
+            declared = self.declarations.get(name)
+            if not declared:
+                continue
+            for namespace in visible:
+                if namespace in declared:
+                    yield declared[namespace], _join(namespace, name)
+                    break
+        for qualifier, name in source.qualified:
+            declared = self.declarations.get(name)
+            if not declared:
+                continue
+            namespace = self._resolve_namespace(qualifier, source.namespace)
+            if namespace in declared:
+                yield declared[namespace], _join(namespace, name)
+
+    def assembly(self, label):
+        """Assembly a file compiles into (its namespace unless assembly_of says otherwise)."""
+        if self._assembly_of is not None:
+            return self._assembly_of(label)
+        return self.files[label].namespace or "Assembly-CSharp"
+
+    def affected(self, changed):
+        """Files that must recompile when the changed files change, changed included."""
+        seen = set()
+        pending = [label for label in changed if label in self.files]
+        while pending:
+            label = pending.pop()
+            if label in seen:
+                continue
+            seen.add(label)
+            pending.extend(self.reverse[label] - seen)
+        return sorted(seen)
+
+    def plan(self, changed):
+        """Affected files and assemblies for a change; unknown labels are reported back."""
+        changed = [self.find(label) or label for label in changed]
+        files = self.affected(changed)
+        assemblies = {}
+        for label in files:
+            assemblies.setdefault(self.assembly(label), []).append(label)
+        return {
+            "changed": [label for label in changed if label in self.files],
+            "unknown": [label for label in changed if label not in self.files],
+            "files": files,
+            "assemblies": {name: sorted(labels) for name, labels in sorted(assemblies.items())},
+        }
+
+    def find(self, name):
+        """Label for a path or bare file name, or None."""
+        if name in self.files:
+            return name
+        matches = [label for label in self.files if label.rsplit("/", 1)[-1] == name.rsplit("/", 1)[-1]]
+        return matches[0] if len(matches) == 1 else None
+
+    def namespace_edges(self):
+        """(namespace, namespace) -> [(file, dependency file, type names)] across namespaces."""
+        edges = {}
+        for label, deps in self.edges.items():
+            for dep, names in deps.items():
+                source, target = self.files[label].namespace, self.files[dep].namespace
+                if source != target:
+                    edges.setdefault((source, target), []).append((label, dep, names))
+        return edges
+
+    def file_cycles(self):
+        return strongly_connected(self.edges)
+
+    def namespace_cycles(self):
+        graph = {}
+        for source, target in self.namespace_edges():
+            graph.setdefault(source, set()).add(target)
+            graph.setdefault(target, set())
+        return strongly_connected(graph)
+
+    def cycle_evidence(self, cycle):
+        """The cross-namespace references that hold a namespace cycle together."""
+        members = set(cycle)
+        return [(source, target, uses) for (source, target), uses in sorted(self.namespace_edges().items())
+                if source in members and target in members]
+
+
+def strongly_connected(graph):
+    """Components with more than one node (i.e. cycles), via iterative Tarjan."""
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in sorted(graph):
+        if root in index:
+            continue
+        work = [(root, iter(sorted(graph[root])))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(graph.get(child, ())))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    components.append(sorted(component))
+    return components
+
+
+def report(graph):
+    return {
+        "files": len(graph.files),
+        "namespaces": {f"{source} -> {target}": len(uses)
+                       for (source, target), uses in sorted(graph.namespace_edges().items())},
+        "namespace_cycles": [
+            {"namespaces": cycle,
+             "references": [{"from": source, "to": target,
+                             "uses": [{"file": label, "dependency": dep, "types": names}
+                                      for label, dep, names in uses]}
+                            for source, target, uses in graph.cycle_evidence(cycle)]}
+            for cycle in graph.namespace_cycles()
+        ],
+        "file_cycles": graph.file_cycles(),
+    }
+
+
+def print_report(data):
+    print(f"{data['files']} files")
+    for edge, count in data["namespaces"].items():
+        print(f"  {edge} ({count} references)")
+    for cycle in data["namespace_cycles"]:
+        print(f"cycle: {' <-> '.join(cycle['namespaces'])}")
+        for reference in cycle["references"]:
+            for use in reference["uses"]:
+                print(f"  {use['file']} -> {use['dependency']} ({', '.join(use['types'])})")
+    for cycle in data["file_cycles"]:
+        print(f"file cycle: {', '.join(cycle)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dependency graph and rebuild planner for the generated C#")
+    parser.add_argument("--repo", nargs="?", const=os.path.dirname(os.path.abspath(__file__)),
+                        help="analyse the checked-in scripts under this folder instead")
+    parser.add_argument("--changed", action="append", default=[], metavar="FILE",
+                        help="plan the rebuild for a changed file (repeatable)")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    graph = DependencyGraph(checked_in_files(args.repo) if args.repo else generated_files())
+    if args.changed:
+        plan = graph.plan(args.changed)
+        if args.json:
+            json.dump(plan, sys.stdout, indent=2)
+            print()
+        else:
+            for label in plan["unknown"]:
+                print(f"? {label}: no such file")
+            print(f"{len(plan['files'])} files in {len(plan['assemblies'])} assemblies affected")
+            for assembly, labels in plan["assemblies"].items():
+                print(f"  {assembly}: {', '.join(labels)}")
+        return 1 if plan["unknown"] else 0
+
+    data = report(graph)
+    if args.json:
+        json.dump(data, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
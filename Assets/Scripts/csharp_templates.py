@@ -0,0 +1,204 @@
+# Small template layer for the generated C# sources.
+# Lets a category stamp out families of types (one readonly struct per focus
+# event, one ScriptableObject per content type, ...) from a spec list instead of
+# copy-pasting literals.
+#
+#   {{ expr }}                         value of a Python expression
+#   {% for x in expr %} ... {% endfor %}   with loop.index / loop.first / loop.last
+#   {% if expr %} {% elif expr %} {% else %} {% endif %}
+#   {% set name = expr %}
+#   {% include "partial" %}            render a registered partial in place
+#
+# A line holding nothing but a {% %} tag disappears entirely, newline included,
+# so block tags can sit on their own lines without leaving blank lines behind.
+# Templates compile to Python code objects once; the code is cached in memory
+# and marshalled under .generator_cache/ so later runs skip compilation too.
+import hashlib
+import marshal
+import os
+import re
+import sys
+
+ENGINE_VERSION = "1"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".generator_cache", "templates")
+
+_TOKEN = re.compile(r"(\{\{.*?\}\}|\{%.*?%\})", re.S)
+_STANDALONE_TAG = re.compile(r"^[ \t]*(\{%(?:(?!%\})[^\n])*%\})[ \t]*(?:\n|\Z)", re.M)
+_FOR = re.compile(r"for\s+(.+?)\s+in\s+(.+)$", re.S)
+_SET = re.compile(r"set\s+(\w+(?:\s*,\s*\w+)*)\s*=(?!=)\s*(.+)$", re.S)
+_INCLUDE = re.compile(r"""include\s+(["'])(\w[\w./-]*)\1$""")
+
+# Partials shared by every template (name -> source)
+PARTIALS = {}
+_compiled = {}
+
+
+class TemplateSyntaxError(ValueError):
+    pass
+
+
+class Loop:
+    """The `loop` variable inside a {% for %} body."""
+
+    __slots__ = ("index0", "length")
+
+    def __init__(self, index0, length):
+        self.index0 = index0
+        self.length = length
+
+    @property
+    def index(self):
+        return self.index0 + 1
+
+    @property
+    def first(self):
+        return self.index0 == 0
+
+    @property
+    def last(self):
+        return self.index0 == self.length - 1
+
+
+def camel(name):
+    """PascalCase -> camelCase, the parameter spelling of a property name."""
+    return name[:1].lower() + name[1:]
+
+
+def register_partial(name, source):
+    PARTIALS[name] = source
+
+
+def _cache_key(source, name):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (ENGINE_VERSION, sys.implementation.cache_tag, name, source):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _line_of(source, offset):
+    return source.count("\n", 0, offset) + 1
+
+
+def translate(source, name="<template>"):
+    """Python source equivalent to the template."""
+    source = _STANDALONE_TAG.sub(r"\1", source)
+    lines = []
+    stack = []  # (block keyword, loop id or None)
+    loop_ids = 0
+
+    def emit(code):
+        lines.append("    " * len(stack) + code)
+
+    def enclosing_loop():
+        for keyword, loop_id in reversed(stack):
+            if keyword == "for":
+                return loop_id
+        return None
+
+    position = 0
+    for match in _TOKEN.finditer(source):
+        if match.start() > position:
+            emit(f"_w({source[position:match.start()]!r})")
+        position = match.end()
+        token = match.group(0)
+        body = token[2:-2].strip()
+        line = _line_of(source, match.start())
+
+        if token.startswith("{{"):
+            emit(f"_w(str({body}))")
+            continue
+
+        keyword = body.split(None, 1)[0] if body else ""
+        if keyword == "for":
+            parsed = _FOR.match(body)
+            if not parsed:
+                raise TemplateSyntaxError(f"{name}:{line}: malformed for tag {token!r}")
+            loop_ids += 1
+            emit(f"_items{loop_ids} = list({parsed.group(2)})")
+            emit(f"for _i{loop_ids}, ({parsed.group(1)}) in enumerate(_items{loop_ids}):")
+            stack.append(("for", loop_ids))
+            emit(f"loop = _loop{loop_ids} = _Loop(_i{loop_ids}, len(_items{loop_ids}))")
+        elif keyword == "if":
+            emit(f"if {body[2:].strip()}:")
+            stack.append(("if", None))
+            emit("pass")
+        elif keyword in ("elif", "else"):
+            if not stack or stack[-1][0] != "if":
+                raise TemplateSyntaxError(f"{name}:{line}: {keyword} outside if")
+            stack.pop()
+            emit(f"elif {body[4:].strip()}:" if keyword == "elif" else "else:")
+            stack.append(("if", None))
+            emit("pass")
+        elif keyword in ("endfor", "endif"):
+            if not stack or stack[-1][0] != keyword[3:]:
+                raise TemplateSyntaxError(f"{name}:{line}: unexpected {keyword}")
+            stack.pop()
+            outer = enclosing_loop()
+            if keyword == "endfor" and outer is not None:
+                emit(f"loop = _loop{outer}")
+        elif keyword == "set":
+            parsed = _SET.match(body)
+            if not parsed:
+                raise TemplateSyntaxError(f"{name}:{line}: malformed set tag {token!r}")
+            emit(f"{parsed.group(1)} = {parsed.group(2)}")
+        elif keyword == "include":
+            parsed = _INCLUDE.match(body)
+            if not parsed:
+                raise TemplateSyntaxError(f"{name}:{line}: malformed include tag {token!r}")
+            emit(f"_include({parsed.group(2)!r}, globals())")
+        else:
+            raise TemplateSyntaxError(f"{name}:{line}: unknown tag {token!r}")
+
+    if position < len(source):
+        emit(f"_w({source[position:]!r})")
+    if stack:
+        raise TemplateSyntaxError(f"{name}: unclosed {stack[-1][0]} block")
+    return "\n".join(lines) + "\n"
+
+
+def compile_template(source, name="<template>", cache_dir=CACHE_DIR):
+    """Code object for the template, from memory, the disk cache, or compiled."""
+    key = _cache_key(source, name)
+    code = _compiled.get(key)
+    if code is not None:
+        return code
+
+    cache_path = os.path.join(cache_dir, key + ".bin") if cache_dir else None
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            code = None
+
+    if code is None:
+        try:
+            code = compile(translate(source, name), f"<template {name}>", "exec")
+        except SyntaxError as exc:
+            raise TemplateSyntaxError(f"{name}: invalid expression: {exc.msg}") from exc
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(code, f)
+            os.replace(tmp_path, cache_path)
+
+    _compiled[key] = code
+    return code
+
+
+def _include(partial, namespace):
+    if partial not in PARTIALS:
+        raise KeyError(f"unknown partial {partial!r}")
+    # A copy, so the partial sees the caller's variables but cannot rebind them
+    exec(compile_template(PARTIALS[partial], partial), dict(namespace))
+
+
+def render(source, template_name="<template>", **context):
+    """Render template source with context as its variables."""
+    out = []
+    namespace = {"_w": out.append, "_Loop": Loop, "_include": _include, "camel": camel}
+    namespace.update(context)
+    exec(compile_template(source, template_name), namespace)
+    return "".join(out)
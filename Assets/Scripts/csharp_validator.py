@@ -0,0 +1,405 @@
+# Structural validator for the generated C# sources.
+# A pure-Python tokenizer (comments, verbatim/interpolated strings, chars)
+# feeds checks that would otherwise only surface after a Unity domain reload:
+# balanced braces/brackets/parentheses, a namespace and a type declaration per
+# file, duplicate type names across categories, and `using FocusFounder.*`
+# directives (including the relative `using Core;` form inside a FocusFounder
+# namespace) that no generated file declares.
+#
+# Per-file results are cached by content hash under .generator_cache/ (only
+# the files of the latest run are kept), and the files are tokenized in a
+# process pool.
+#
+#   python csharp_validator.py             # validate the generator output
+#   python csharp_validator.py --repo      # validate the checked-in scripts
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+VALIDATOR_VERSION = "1"
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".generator_cache", "validation.json")
+
+# Namespace roots that come from outside the generated code
+EXTERNAL_ROOTS = {"System", "UnityEngine", "UnityEditor", "Unity", "TMPro", "Newtonsoft"}
+
+_TYPE_KEYWORDS = {"class", "struct", "interface", "enum", "record"}
+_MODIFIERS = {"public", "internal", "private", "protected", "static", "sealed", "abstract", "partial",
+              "readonly", "unsafe", "new", "file", "ref"}
+_CLOSERS = {")": "(", "]": "[", "}": "{"}
+
+_SCAN = re.compile(r"""
+      (?P<newline>\n)
+    | (?P<space>[ \t\r\f\v]+)
+    | (?P<line_comment>//[^\n]*)
+    | (?P<block_comment>/\*)
+    | (?P<preprocessor>^[ \t]*\#[^\n]*)
+    | (?P<string_start>\$@"|@\$"|\$"|@"|")
+    | (?P<char>'(?:\\.|[^'\\\n])+')
+    | (?P<ident>@?[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<number>\d[\w.]*)
+    | (?P<punct>=>|\?\?=|\?\?|\?\.|::|&&|\|\||[-+*/%&|^!<>=]=?|[{}()\[\];,.:?~])
+    | (?P<other>.)
+""", re.X | re.M)
+
+
+class CSharpSyntaxError(ValueError):
+    def __init__(self, message, line):
+        super().__init__(message)
+        self.line = line
+
+
+def _scan_string(text, pos, prefix, line):
+    """End position and line after the string starting at pos (after prefix)."""
+    verbatim = "@" in prefix
+    interpolated = "$" in prefix
+    start_line = line
+    while pos < len(text):
+        ch = text[pos]
+        if ch == "\n":
+            if not verbatim:
+                raise CSharpSyntaxError("newline in string literal", start_line)
+            line += 1
+        elif ch == "\\" and not verbatim:
+            pos += 1
+        elif ch == '"':
+            if verbatim and text.startswith('""', pos):
+                pos += 1
+            else:
+                return pos + 1, line
+        elif ch == "{" and interpolated:
+            if text.startswith("{{", pos):
+                pos += 1
+            else:
+                pos, line = _scan_hole(text, pos + 1, line)
+                continue
+        pos += 1
+    raise CSharpSyntaxError("unterminated string literal", start_line)
+
+
+def _scan_hole(text, pos, line):
+    """Skip an interpolation hole up to and including its closing brace."""
+    depth = 0
+    while pos < len(text):
+        match = _SCAN.match(text, pos)
+        kind = match.lastgroup
+        if kind == "newline":
+            line += 1
+        elif kind == "block_comment":
+            end = text.find("*/", pos + 2)
+            if end < 0:
+                raise CSharpSyntaxError("unterminated comment", line)
+            line += text.count("\n", pos, end)
+            pos = end + 2
+            continue
+        elif kind == "string_start":
+            pos, line = _scan_string(text, match.end(), match.group(), line)
+            continue
+        elif kind == "punct":
+            token = match.group()
+            if token in "([{":
+                depth += 1
+            elif token in ")]}":
+                if depth == 0:
+                    if token != "}":
+                        raise CSharpSyntaxError(f"unbalanced {token!r} in interpolation", line)
+                    return match.end(), line
+                depth -= 1
+        pos = match.end()
+    raise CSharpSyntaxError("unterminated interpolation", line)
+
+
+def tokenize(text):
+    """(kind, text, line) for every significant token; comments and strings collapse."""
+    tokens = []
+    pos = 0
+    line = 1
+    length = len(text)
+    while pos < length:
+        match = _SCAN.match(text, pos)
+        kind = match.lastgroup
+        if kind == "newline":
+            line += 1
+        elif kind == "block_comment":
+            end = text.find("*/", pos + 2)
+            if end < 0:
+                raise CSharpSyntaxError("unterminated comment", line)
+            line += text.count("\n", pos, end)
+            pos = end + 2
+            continue
+        elif kind == "string_start":
+            start_line = line
+            pos, line = _scan_string(text, match.end(), match.group(), line)
+            tokens.append(("string", '""', start_line))
+            continue
+        elif kind in ("ident", "punct", "number", "char", "other"):
+            tokens.append((kind, match.group(), line))
+        pos = match.end()
+    return tokens
+
+
+def analyze(text):
+    """Per-file facts and local errors. Cross-file checks happen in validate()."""
+    result = {"errors": [], "namespaces": [], "types": [], "usings": []}
+    errors = result["errors"]
+    try:
+        tokens = tokenize(text)
+    except CSharpSyntaxError as exc:
+        errors.append({"line": exc.line, "message": str(exc)})
+        return result
+
+    brackets = []       # (char, line)
+    frames = []         # (kind, name) for every open brace
+    file_namespace = None
+    pending = None      # ("namespace" | "type", name) awaiting its { or ;
+
+    def current_namespace():
+        names = [name for kind, name in frames if kind == "namespace"]
+        if file_namespace:
+            names.insert(0, file_namespace)
+        return ".".join(names)
+
+    def at_declaration_level():
+        return all(kind in ("namespace", "type") for kind, _ in frames)
+
+    i = 0
+    count = len(tokens)
+    while i < count:
+        kind, value, line = tokens[i]
+        if value in "([{" and kind == "punct":
+            brackets.append((value, line))
+            if value == "{":
+                if pending is not None:
+                    frames.append((pending[0], pending[1]))
+                    pending = None
+                else:
+                    frames.append(("block", None))
+        elif value in ")]}" and kind == "punct":
+            expected = _CLOSERS[value]
+            if not any(opener == expected for opener, _ in brackets):
+                errors.append({"line": line, "message": f"unmatched {value!r}"})
+            else:
+                # Recover at the matching opener so one typo yields one error
+                while brackets[-1][0] != expected:
+                    opener, opened_at = brackets.pop()
+                    errors.append({"line": opened_at,
+                                   "message": f"{opener!r} is not closed before {value!r} on line {line}"})
+                    if opener == "{" and frames:
+                        frames.pop()
+                brackets.pop()
+                if value == "}" and frames:
+                    frames.pop()
+        elif value == ";" and kind == "punct":
+            if pending is not None and pending[0] == "namespace" and not frames:
+                file_namespace = pending[1]
+                result["namespaces"].append(file_namespace)
+            pending = None
+        elif kind == "ident" and at_declaration_level():
+            if value == "namespace" and i + 1 < count:
+                name_parts = []
+                j = i + 1
+                while j < count and (tokens[j][0] == "ident" or tokens[j][1] == "."):
+                    name_parts.append(tokens[j][1])
+                    j += 1
+                name = "".join(name_parts)
+                pending = ("namespace", name)
+                if j < count and tokens[j][1] == "{":
+                    frames_ns = current_namespace()
+                    result["namespaces"].append(f"{frames_ns}.{name}" if frames_ns else name)
+                i = j
+                continue
+            if value == "using" and i + 1 < count and tokens[i + 1][1] not in ("(", "static", "var") \
+                    and all(kind == "namespace" for kind, _ in frames):
+                j = i + 1
+                parts = []
+                while j < count and tokens[j][1] != ";":
+                    parts.append(tokens[j][1])
+                    j += 1
+                if "=" not in parts:
+                    result["usings"].append(["".join(parts), current_namespace(), line])
+                i = j
+                continue
+            type_keyword = value
+            j = i
+            if value == "record" and i + 1 < count and tokens[i + 1][1] in ("class", "struct"):
+                j = i + 1
+                type_keyword = "record " + tokens[j][1]
+            if value in _TYPE_KEYWORDS and j + 1 < count and tokens[j + 1][0] == "ident":
+                name = tokens[j + 1][1].lstrip("@")
+                is_partial = any(tokens[k][1] == "partial" for k in range(max(0, i - 6), i)
+                                 if tokens[k][1] in _MODIFIERS)
+                outer = ".".join(name for kind, name in frames if kind == "type")
+                result["types"].append([current_namespace(), f"{outer}.{name}" if outer else name,
+                                        type_keyword, is_partial, line])
+                pending = ("type", name)
+                i = j + 2
+                continue
+            if value == "delegate":
+                # delegate <return type> Name(...);
+                j = i + 1
+                while j + 1 < count and tokens[j + 1][1] != "(":
+                    j += 1
+                if j < count and tokens[j][0] == "ident" and j > i + 1:
+                    outer = ".".join(name for kind, name in frames if kind == "type")
+                    name = tokens[j][1]
+                    result["types"].append([current_namespace(), f"{outer}.{name}" if outer else name,
+                                            "delegate", False, line])
+        i += 1
+
+    for opener, opened_at in brackets:
+        errors.append({"line": opened_at, "message": f"{opener!r} is never closed"})
+    if not result["namespaces"]:
+        errors.append({"line": 1, "message": "no namespace declaration"})
+    if not result["types"]:
+        errors.append({"line": 1, "message": "no type declaration"})
+    return result
+
+
+def _digest(text):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(VALIDATOR_VERSION.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _analyze_batch(items):
+    return [(key, analyze(text)) for key, text in items]
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _resolve_using(target, enclosing, declared):
+    """True when a using directive names a namespace that exists.
+
+    declared holds every declared namespace and all of their parents.
+    """
+    # Inside namespace A.B, `using C;` may mean A.B.C, A.C or C
+    parts = enclosing.split(".") if enclosing else []
+    for cut in range(len(parts), -1, -1):
+        candidate = ".".join(parts[:cut] + [target])
+        if candidate in declared:
+            return True
+    root = target.split(".", 1)[0]
+    if root == "FocusFounder":
+        return False
+    return root in EXTERNAL_ROOTS or not enclosing.startswith("FocusFounder")
+
+
+def validate(files, jobs=None, cache_path=CACHE_PATH):
+    """Validate files ({label: C# source}); returns {label: [errors]} for failing files.
+
+    label is typically "Category/File.cs"; the part before the first slash is
+    used to tell categories apart when reporting duplicate types.
+    """
+    cache = _load_cache(cache_path) if cache_path else {}
+    keys = {label: _digest(text) for label, text in files.items()}
+    todo = [(key, files[label]) for label, key in keys.items() if key not in cache]
+    # Identical files only need analyzing once
+    todo = list(dict(todo).items())
+
+    if todo:
+        workers = jobs or os.cpu_count() or 1
+        if workers == 1 or len(todo) < 64:
+            analyzed = _analyze_batch(todo)
+        else:
+            chunk = max(16, len(todo) // (workers * 4))
+            batches = [todo[i:i + chunk] for i in range(0, len(todo), chunk)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                analyzed = [pair for batch in pool.map(_analyze_batch, batches) for pair in batch]
+        cache.update(analyzed)
+    if cache_path and (todo or len(cache) > len(set(keys.values()))):
+        # Keep only this run's files, so edits and removed files do not pile up
+        _save_cache(cache_path, {key: cache[key] for key in keys.values()})
+
+    results = {label: cache[key] for label, key in keys.items()}
+    problems = {label: list(result["errors"]) for label, result in results.items()}
+
+    declared = set()
+    for result in results.values():
+        for namespace in result["namespaces"]:
+            parts = namespace.split(".")
+            declared.update(".".join(parts[:cut]) for cut in range(1, len(parts) + 1))
+
+    owners = {}
+    for label, result in results.items():
+        for namespace, name, _, is_partial, line in result["types"]:
+            if not is_partial:
+                owners.setdefault(f"{namespace}.{name}", []).append((label, line))
+    for qualified, places in owners.items():
+        if len(places) > 1:
+            for label, line in places:
+                others = ", ".join(other for other, _ in places if other != label)
+                problems[label].append({"line": line, "message": f"type {qualified} is also declared in {others}"})
+
+    for label, result in results.items():
+        for target, enclosing, line in result["usings"]:
+            if not _resolve_using(target, enclosing, declared):
+                problems[label].append({"line": line, "message": f"using {target}: no such namespace"})
+
+    return {label: errors for label, errors in problems.items() if errors}
+
+
+def format_problems(problems):
+    lines = []
+    for label in sorted(problems):
+        for error in sorted(problems[label], key=lambda e: e["line"]):
+            lines.append(f"{label}:{error['line']}: {error['message']}")
+    return "\n".join(lines)
+
+
+def generated_files(categories=None):
+    """folder/name -> C# source for everything the generator produces."""
+    from generator_registry import discover, render_category
+
+    if categories is None:
+        categories, _ = discover()
+    return {f"{category.folder}/{name}": content
+            for category in categories for name, content in render_category(category).items()}
+
+
+def checked_in_files(repo_dir):
+    from generator_drift import index_checked_in
+
+    files = {}
+    for rel_path, path in index_checked_in(repo_dir).items():
+        with open(path, encoding="utf-8-sig") as f:
+            files[rel_path] = f.read()
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Structural checks for the generated C# scripts")
+    parser.add_argument("--repo", nargs="?", const=os.path.dirname(os.path.abspath(__file__)),
+                        help="validate the checked-in scripts under this folder instead")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    files = checked_in_files(args.repo) if args.repo else generated_files()
+    problems = validate(files, args.jobs, None if args.no_cache else CACHE_PATH)
+    if problems:
+        print(format_problems(problems))
+    print(f"{len(files)} files, {len(problems)} with problems")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# Bakes the AnimationCurves of the content assets into lookup tables.
+# A curve field F is baked when the asset's script declares a BakedCurve
+# field named FBaked (TaskDefinitionSO.difficultyMultiplierBaked,
+# BaseYieldStrategy.qualityCurveBaked). The table is written into the .asset
+# next to the curve, sized to the smallest power of two plus one that keeps
+# the measured error within the tolerance, with the hash of the curve's keys
+# it was baked from. At runtime BakedCurve.Evaluate does a clamped linear
+# lookup, and the Python tooling reads the same table through
+# animation_curve.BakedCurve, which mirrors that lookup in float32. A table
+# whose hash no longer matches its curve (the curve was edited in the
+# inspector since) is stale: the game evaluates the curve instead, and
+# generate.py --bake-curves / --validate fail until it is baked again.
+#
+# Curves that do not clamp at both ends are left unbaked and keep using
+# AnimationCurve.Evaluate.
+#
+#   python curve_bake.py                   # bake every asset under Assets/Data
+#   python curve_bake.py --check           # exit 1 if any table is missing or stale
+import argparse
+import glob
+import os
+import re
+import sys
+
+import numpy as np
+
+from animation_curve import CLAMP, BakedCurve, bake_to_tolerance, parse_curves
+from generator_registry import SCRIPTS_DIR
+from headless_sim import DATA_DIR
+from unity_meta import read_guid
+
+TOLERANCE = 1e-4
+SUFFIX = "Baked"
+
+_SCRIPT_GUID = re.compile(r"^  m_Script: \{fileID: \d+, guid: ([0-9a-f]{32})", re.M)
+_BAKED_FIELD = re.compile(r"\bBakedCurve\s+(\w+)" + SUFFIX + r"\s*;")
+
+
+def baked_fields(scripts_dir=SCRIPTS_DIR):
+    """Script GUID -> curve field names the script keeps a BakedCurve for."""
+    fields = {}
+    for path in glob.glob(os.path.join(scripts_dir, "**", "*.cs"), recursive=True):
+        if f"{os.sep}Unity_Scripts{os.sep}" in path:
+            continue
+        with open(path, encoding="utf-8-sig") as f:
+            names = _BAKED_FIELD.findall(f.read())
+        guid = read_guid(path + ".meta") if names else None
+        if guid:
+            fields[guid] = names
+    return fields
+
+
+def _block_end(lines, start, indent):
+    """Index of the first line after lines[start] that is not nested deeper than indent."""
+    end = start + 1
+    while end < len(lines) and (not lines[end].strip() or len(lines[end]) - len(lines[end].lstrip()) > indent
+                                or lines[end].startswith(" " * indent + "- ")):
+        end += 1
+    return end
+
+
+def _number(value):
+    # Shortest float32 text, integers without ".0", as Unity writes them
+    text = str(np.float32(value))
+    return text[:-2] if text.endswith(".0") else text
+
+
+def baked_yaml(field, baked, error, source_hash, indent="  "):
+    """Unity YAML for a serialized BakedCurve field."""
+    lines = [f"{indent}{field}:", f"{indent}  start: {_number(baked.start)}", f"{indent}  end: {_number(baked.end)}",
+             f"{indent}  maxError: {_number(error)}", f"{indent}  sourceHash: {source_hash}", f"{indent}  samples:"]
+    lines += [f"{indent}  - {_number(value)}" for value in baked.table]
+    return lines
+
+
+def _tables(text):
+    """(field name, {"start", "end", "sourceHash"}, samples) for every baked table in an .asset's text."""
+    lines = text.split("\n")
+    for index, line in enumerate(lines):
+        match = re.match(r"^(\s*)(\w+)" + SUFFIX + r":$", line)
+        if not match:
+            continue
+        end = _block_end(lines, index, len(match.group(1)))
+        body = "\n".join(lines[index + 1:end])
+        fields = dict(re.findall(r"^\s*(start|end|sourceHash): (\S+)$", body, re.M))
+        samples = [float(value) for value in re.findall(r"^\s*- (\S+)$", body, re.M)]
+        yield match.group(2), fields, samples
+
+
+def _current(fields, samples, curve):
+    """Whether a table is what the game would use for curve: well formed and baked from it."""
+    return (len(samples) >= 2 and "start" in fields and "end" in fields and curve is not None
+            and fields.get("sourceHash") == str(curve.source_hash()))
+
+
+def read_baked(text):
+    """field name -> BakedCurve for every baked table in an .asset's text that is current with its curve."""
+    curves = parse_curves(text)
+    return {field: BakedCurve(samples, float(fields["start"]), float(fields["end"]))
+            for field, fields, samples in _tables(text) if _current(fields, samples, curves.get(field))}
+
+
+def stale_tables(data_dir=DATA_DIR):
+    """[(path, field)] for every baked table under data_dir that was not baked from its curve as it is now."""
+    stale = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "**", "*.asset"), recursive=True)):
+        with open(path, encoding="utf-8", newline="") as f:
+            text = f.read()
+        curves = parse_curves(text)
+        stale += [(path, field) for field, fields, samples in _tables(text)
+                  if not _current(fields, samples, curves.get(field))]
+    return stale
+
+
+def bake_text(text, fields, tolerance=TOLERANCE):
+    """(new text, [(field, samples, error or None if not bakeable)]) with the tables of fields (re)written."""
+    curves = parse_curves(text)
+    lines = text.split("\n")
+    report = []
+    for field in fields:
+        curve = curves.get(field)
+        if curve is None:
+            continue
+        start = next(i for i, line in enumerate(lines) if re.match(rf"^\s*{field}:$", line))
+        indent = len(lines[start]) - len(lines[start].lstrip())
+        # Drop the previous table, wherever it is
+        old = next((i for i, line in enumerate(lines) if line == " " * indent + field + SUFFIX + ":"), None)
+        if old is not None:
+            del lines[old:_block_end(lines, old, indent)]
+            start = next(i for i, line in enumerate(lines) if re.match(rf"^\s*{field}:$", line))
+        if len(curve) < 2 or curve.end <= curve.start or curve.pre_wrap != CLAMP or curve.post_wrap != CLAMP:
+            report.append((field, 0, None))
+            continue
+        baked, error = bake_to_tolerance(curve, tolerance)
+        at = _block_end(lines, start, indent)
+        lines[at:at] = baked_yaml(field + SUFFIX, baked, error, curve.source_hash(), " " * indent)
+        report.append((field, len(baked.table), error))
+    return "\n".join(lines), report
+
+
+def asset_fields(text, fields_by_guid):
+    match = _SCRIPT_GUID.search(text)
+    return fields_by_guid.get(match.group(1), []) if match else []
+
+
+def bake_assets(data_dir=DATA_DIR, tolerance=TOLERANCE, check=False, scripts_dir=SCRIPTS_DIR):
+    """Bake every asset under data_dir; returns [(path, field, samples, error, changed)]."""
+    fields_by_guid = baked_fields(scripts_dir)
+    results = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "**", "*.asset"), recursive=True)):
+        with open(path, encoding="utf-8", newline="") as f:
+            text = f.read()
+        fields = asset_fields(text, fields_by_guid)
+        if not fields:
+            continue
+        new_text, report = bake_text(text, fields, tolerance)
+        changed = new_text != text
+        if changed and not check:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                f.write(new_text)
+            os.replace(tmp_path, path)
+        results += [(path, field, samples, error, changed) for field, samples, error in report]
+    return results
+
+
+def print_results(results, check=False):
+    for path, field, samples, error, changed in results:
+        where = f"{os.path.relpath(path)}:{field}"
+        if error is None:
+            print(f"{where}: not clamped at both ends, left unbaked")
+        else:
+            state = ("stale" if check else "baked") if changed else "up to date"
+            print(f"{where}: {samples} samples, max error {error:.3g} ({state})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bake AnimationCurves in the content assets into lookup tables")
+    parser.add_argument("--data", default=DATA_DIR, help="content folder (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="largest allowed |table - curve| (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="write nothing; exit 1 if any table is missing or stale")
+    args = parser.parse_args(argv)
+
+    results = bake_assets(args.data, args.tolerance, args.check)
+    print_results(results, args.check)
+    if not results:
+        print("no assets with BakedCurve fields")
+    return 1 if args.check and any(changed for *_, changed in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# Event-driven fast-forward of the employee/task loop, for offline progress.
+# Instead of replaying frames it jumps from event to event with the Employee.Tick
+# rules solved in closed form:
+#
+#   morale ramp   while morale < 100 it climbs at 2/s, so productivity grows
+#                 linearly and the work done in t seconds is
+#                 b*k/100 * (m0*t + t^2)  (b: base productivity, k: level
+#                 multiplier); a completion inside the ramp is the root of that
+#                 quadratic, and morale reaching 100 is an event of its own
+#   steady state  at morale 100 the rate b*k is constant, so the completions
+#                 up to the next level-up (ceil((level*100 - xp) / 10) of them,
+#                 each worth 10 XP) are taken as one block
+#   completion    TaskService.CompleteTask's auto-requeue: the employee starts
+#                 a fresh instance of the same definition immediately
+#
+# The cost is O(morale events + level-ups), not O(frames): a night away is a
+# few dozen iterations, vectorized across employees.
+#
+# Agreement with the fixed-step loop (headless_sim, auto-assign on): a fixed
+# step of dt rounds every task up to a whole number of steps and throws away
+# the overshoot, so fixed-step completions trail the exact ones by at most a
+# relative p*dt/D (p: productivity, D: task duration) plus one task per
+# employee; tolerance() below is that bound, checked by --compare.
+#
+#   python fast_forward.py --hours 8 --employees 100000
+#   python fast_forward.py --compare --hours 1
+#   python fast_forward.py --traces /tmp/traces    # one employee per user, offline time from the trace
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from headless_sim import EmployeeColumns, HeadlessSim, load_task_durations
+
+MORALE_MAX = 100.0
+MORALE_RATE = 2.0
+LEVEL_STEP = 0.1
+TASK_XP = 10.0
+
+
+def tolerance(productivity, duration, dt):
+    """Largest relative shortfall of fixed-step completions against the exact count."""
+    return productivity * dt / duration
+
+
+class FastForward:
+    """Employee state in float64 columns, advanced analytically."""
+
+    def __init__(self, level, morale, experience, remaining, base_productivity, duration):
+        self.level = np.asarray(level, np.float64).copy()
+        self.morale = np.asarray(morale, np.float64).copy()
+        self.experience = np.asarray(experience, np.float64).copy()
+        self.remaining = np.asarray(remaining, np.float64).copy()
+        self.base_productivity = np.asarray(base_productivity, np.float64).copy()
+        # Duration of the task each employee keeps requeueing
+        self.duration = np.asarray(duration, np.float64).copy()
+        self.completed = np.zeros(len(self.level), np.int64)
+        self.iterations = 0
+
+    @classmethod
+    def from_columns(cls, columns, task_durations):
+        """Snapshot of headless_sim columns (every employee assumed to be working)."""
+        duration = np.asarray(task_durations, np.float64)[columns.task_definition]
+        remaining = np.where(columns.has_task, columns.remaining, duration)
+        return cls(columns.level, columns.morale, columns.experience, remaining,
+                   columns.base_productivity, duration)
+
+    def to_columns(self, columns):
+        columns.level[:] = self.level
+        columns.morale[:] = self.morale
+        columns.experience[:] = self.experience
+        columns.remaining[:] = self.remaining
+        columns.has_task[:] = True
+        columns.completed += self.completed
+
+    def _rate(self, index):
+        """Productivity at morale 100: base * (1 + (level - 1) * 0.1)."""
+        return self.base_productivity[index] * (1.0 + (self.level[index] - 1.0) * LEVEL_STEP)
+
+    def _complete(self, index, count):
+        """count completions for employees index; the last may level them up."""
+        self.completed[index] += count
+        self.experience[index] += TASK_XP * count
+        threshold = self.level[index] * 100.0
+        up = self.experience[index] >= threshold
+        self.experience[index] -= np.where(up, threshold, 0.0)
+        self.level[index] += up
+        self.remaining[index] = self.duration[index]
+
+    def advance(self, seconds):
+        """Move every employee seconds forward (a scalar, or one value per employee); returns the
+        number of loop iterations."""
+        left = np.broadcast_to(np.asarray(seconds, np.float64), len(self.level)).copy()
+        iterations = 0
+        while True:
+            active = np.flatnonzero(left > 0)
+            if not len(active):
+                break
+            iterations += 1
+            ramping = active[self.morale[active] < MORALE_MAX]
+            steady = active[self.morale[active] >= MORALE_MAX]
+            if len(ramping):
+                self._ramp(ramping, left)
+            if len(steady):
+                self._steady(steady, left)
+        self.iterations += iterations
+        return iterations
+
+    def _ramp(self, index, left):
+        """One event while morale climbs: a completion, morale reaching 100, or the horizon."""
+        k = self._rate(index) / 100.0  # work per second per morale point
+        m0 = self.morale[index]
+        r = self.remaining[index]
+        to_full = (MORALE_MAX - m0) / MORALE_RATE
+        # work(t) = k * (m0*t + t^2) = r  ->  t = (-m0 + sqrt(m0^2 + 4r/k)) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            to_complete = np.where(k > 0, (-m0 + np.sqrt(m0 * m0 + 4.0 * r / k)) / 2.0, np.inf)
+        step = np.minimum(np.minimum(to_full, to_complete), left[index])
+        completes = (to_complete <= step) & (to_complete <= left[index])
+
+        self.remaining[index] = np.maximum(0.0, r - k * (m0 * step + step * step))
+        self.morale[index] = np.where(step >= to_full, MORALE_MAX, m0 + MORALE_RATE * step)
+        left[index] -= step
+        if completes.any():
+            self._complete(index[completes], 1)
+
+    def _steady(self, index, left):
+        """Completions up to the next level-up (or the horizon) as one block."""
+        rate = self._rate(index)
+        horizon = left[index]
+        r = self.remaining[index]
+        d = self.duration[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            first = np.where(rate > 0, r / rate, np.inf)
+            period = np.where(rate > 0, d / rate, np.inf)
+            fit = np.where(first <= horizon, 1 + np.floor((horizon - first) / period), 0)
+        to_level = np.ceil((self.level[index] * 100.0 - self.experience[index]) / TASK_XP)
+        count = np.minimum(fit, to_level).astype(np.int64)
+
+        idle = count == 0
+        if idle.any():
+            # Nothing finishes before the horizon: just work towards it
+            who = index[idle]
+            self.remaining[who] = np.maximum(0.0, r[idle] - rate[idle] * horizon[idle])
+            left[who] = 0.0
+        busy = ~idle
+        if busy.any():
+            who = index[busy]
+            left[who] -= first[busy] + (count[busy] - 1) * period[busy]
+            self._complete(who, count[busy])
+
+
+def compare(count=2000, hours=1.0, dt=0.1, seed=3):
+    """Run fast-forward and the fixed-step loop side by side; returns (report lines, within tolerance)."""
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(5.0, 60.0, 4).astype(np.float32)
+    columns = EmployeeColumns(count)
+    columns.base_productivity[:] = rng.uniform(0.5, 2.0, count)
+    columns.morale[:] = rng.uniform(10.0, 100.0, count)
+    sim = HeadlessSim(columns, durations)
+    definitions = rng.integers(0, len(durations), count)
+    for definition in range(len(durations)):
+        sim.assign(definitions == definition, definition)
+    ff = FastForward.from_columns(columns, durations)
+
+    seconds = hours * 3600.0
+    start = time.perf_counter()
+    ff.advance(seconds)
+    ff_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    sim.run(int(round(seconds / dt)), dt, auto_assign=True)
+    fixed_elapsed = time.perf_counter() - start
+
+    exact = ff.completed.astype(np.float64)
+    stepped = columns.completed.astype(np.float64)
+    # Productivity only grows with level, so the final rate bounds the per-task step loss
+    productivity = columns.base_productivity * (1.0 + (ff.level - 1.0) * LEVEL_STEP)
+    allowed = exact * tolerance(productivity, ff.duration, dt) + 1.0
+    shortfall = exact - stepped
+    within = bool(np.all(shortfall <= allowed) and np.all(shortfall >= -1.0))
+    worst = int(np.argmax(shortfall - allowed))
+    lines = [
+        f"{count} employees, {hours:g} h: fast-forward {ff_elapsed * 1000:.1f} ms "
+        f"({ff.iterations} iterations), fixed step dt={dt} {fixed_elapsed * 1000:.0f} ms",
+        f"completions: exact {int(exact.sum())}, fixed step {int(stepped.sum())} "
+        f"({(stepped.sum() / exact.sum() - 1) * 100:+.3f}%)",
+        f"closest to the bound: {float(shortfall[worst]):.0f} completions short, {float(allowed[worst]):.1f} allowed",
+        f"levels: {int(np.count_nonzero(ff.level != columns.level))} employees differ "
+        f"(max {float(np.abs(ff.level - columns.level).max()):.0f})",
+    ]
+    return lines, within
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fast-forward the employee loop between events")
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--morale", type=float, default=50.0, help="starting morale (default: %(default)s)")
+    parser.add_argument("--compare", action="store_true",
+                        help="check against the fixed-step simulator instead")
+    parser.add_argument("--dt", type=float, default=0.1, help="fixed step for --compare (default: %(default)s)")
+    parser.add_argument("--traces", help="focus_traces.py directory: advance one employee per user by the "
+                                         "user's paused time instead of --hours")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        lines, within = compare(hours=args.hours, dt=args.dt)
+        print("\n".join(lines))
+        print("within tolerance" if within else "OUT OF TOLERANCE")
+        return 0 if within else 1
+
+    seconds = args.hours * 3600.0
+    if args.traces:
+        from focus_traces import offline_seconds, open_traces
+
+        seconds = offline_seconds(open_traces(args.traces))
+        args.employees = len(seconds)
+    durations = list((load_task_durations() or {"default": 30.0}).values())
+    columns = EmployeeColumns(args.employees, morale=args.morale)
+    HeadlessSim(columns, durations).assign(np.ones(args.employees, bool), 0)
+    ff = FastForward.from_columns(columns, durations)
+    start = time.perf_counter()
+    ff.advance(seconds)
+    elapsed = time.perf_counter() - start
+    span = f"{np.mean(seconds) / 3600:.1f} h offline on average" if args.traces else f"{args.hours:g} h"
+    print(f"{args.employees} employees, {span} in {elapsed * 1000:.1f} ms ({ff.iterations} iterations)")
+    print(f"tasks completed {int(ff.completed.sum())}, mean level {ff.level.mean():.3f}, "
+          f"max level {ff.level.max():.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
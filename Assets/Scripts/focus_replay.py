@@ -0,0 +1,416 @@
+# Offline replay of FocusService's crediting rules over recorded focus traces.
+# Credited time, session events and daily totals for many users at once.
+#
+# A trace is one user's OnApplicationFocus / OnApplicationPause callbacks as
+# int64 microsecond UTC timestamps plus a kind: FOCUS / UNFOCUS
+# (OnApplicationFocus(true/false)) or PAUSE / RESUME (OnApplicationPause).
+# Traces are stored CSR-style: events sorted by time within each user, and
+# offsets[u]:offsets[u + 1] is user u's slice. Only the low two bits of a kind
+# are read, so focus_traces.py flag columns can be passed as they are.
+#
+# Semantics, exactly as in Focus/FocusService.cs:
+#   FOCUS, RESUME   StartGainFocusSequence: stop any running coroutine, start
+#                   GainFocusAfterDebounce
+#   UNFOCUS, PAUSE  LoseFocus: ignored unless focused (a running debounce keeps
+#                   running). Otherwise the session is credited if it lasted
+#                   at least minSessionSec (SessionEnded), focus is dropped and
+#                   the coroutine is stopped.
+#   debounce wake   after debounceSec: if Application.isFocused (the last
+#                   FOCUS/UNFOCUS was FOCUS), GainFocus, which does nothing if
+#                   already focused and otherwise resets the daily total when
+#                   the local date changed and sets focusedAt. Then, after
+#                   minSessionSec, if still focused: SessionStarted(focusedAt).
+#   daily total     only reset inside GainFocus, so every credited session
+#                   counts towards the local date of its focusedAt.
+# A callback and a coroutine wake at the same instant run callback first, as
+# Unity calls OnApplicationFocus before resuming coroutines in a frame. With
+# --frame, coroutine waits end on the first frame at or after their deadline
+# (event timestamps are taken to be frame times already). Coroutines still
+# pending after a user's last event run to completion, or up to replay(end=).
+#
+# The replay steps event index k for every user of a chunk at once. Each step
+# resolves the wakes due before that event and then applies it, all with
+# masked NumPy passes, so the cost is (longest trace) x (users in the chunk).
+# ScalarFocusService is the line-by-line reference it is checked against.
+#
+#   python focus_replay.py --check
+#   python focus_replay.py --users 100000 --days 30     # synthetic month, timed
+#   python focus_replay.py --traces /tmp/traces          # focus_traces.py output
+import argparse
+import sys
+import time
+
+import numpy as np
+
+FOCUS, UNFOCUS, PAUSE, RESUME = 0, 1, 2, 3
+KIND_NAMES = ("focus", "unfocus", "pause", "resume")
+SECOND = 1_000_000
+DAY = 86_400 * SECOND
+DEBOUNCE_SEC = 1.0
+MIN_SESSION_SEC = 3.0
+CHUNK = 1 << 15
+
+# Coroutine phases
+_IDLE, _DEBOUNCE, _MIN_SESSION = 0, 1, 2
+
+
+def _micros(seconds):
+    return int(round(float(seconds) * SECOND))
+
+
+def _after(t, delay, frame):
+    """When a WaitForSeconds(delay) started at t resumes."""
+    t = t + delay
+    if frame:
+        t = -(-t // frame) * frame
+    return t
+
+
+class ReplayResult:
+    """Per-user totals and counts, plus the session events when collected."""
+
+    def __init__(self, users, days, day0, collect_events):
+        self.credited = np.zeros(users, np.int64)  # microseconds
+        self.daily = np.zeros((users, days), np.int64)  # microseconds, by local date from day0
+        self.day0 = day0  # local day number (days since 1970-01-01) of column 0
+        self.focus_gained = np.zeros(users, np.int64)
+        self.focus_lost = np.zeros(users, np.int64)
+        self.sessions_started = np.zeros(users, np.int64)
+        self.sessions_ended = np.zeros(users, np.int64)
+        self.open_at_end = np.zeros(users, bool)
+        self.collect_events = collect_events
+        self._started, self._ended = [], []
+
+    @property
+    def session_started(self):
+        """(user, at) of every SessionStarted, ordered by user and time."""
+        return _ordered(self._started, 2)
+
+    @property
+    def session_ended(self):
+        """(user, at, duration) of every SessionEnded, ordered by user and time."""
+        return _ordered(self._ended, 3)
+
+
+def _ordered(parts, width):
+    if not parts:
+        return tuple(np.zeros(0, np.int64) for _ in range(width))
+    columns = [np.concatenate(column) for column in zip(*parts)]
+    order = np.lexsort((columns[1], columns[0]))
+    return tuple(column[order] for column in columns)
+
+
+def replay(offsets, times, kinds, debounce=DEBOUNCE_SEC, min_session=MIN_SESSION_SEC, utc_offset=0.0,
+           frame=0.0, end=None, collect_events=False, chunk=CHUNK):
+    """Replay every user's trace; utc_offset (seconds, scalar or per user) fixes the local date."""
+    offsets = np.asarray(offsets, np.int64)
+    times = np.asarray(times, np.int64)
+    kinds = np.asarray(kinds)
+    users = len(offsets) - 1
+    local = np.broadcast_to(np.asarray(utc_offset, np.float64) * SECOND, users).astype(np.int64)
+    counts = np.diff(offsets)
+    has_events = counts > 0
+    if has_events.any():
+        first = times[offsets[:-1][has_events]] + local[has_events]
+        last = times[offsets[1:][has_events] - 1] + local[has_events]
+        day0, days = int(first.min() // DAY), int(last.max() // DAY - first.min() // DAY) + 1
+    else:
+        day0, days = 0, 1
+    result = ReplayResult(users, days, day0, collect_events)
+    params = (_micros(debounce), _micros(min_session), _micros(frame),
+              np.iinfo(np.int64).max if end is None else int(end))
+    for lo in range(0, users, chunk):
+        hi = min(users, lo + chunk)
+        _replay_chunk(lo, hi, offsets, times, kinds, local[lo:hi], params, result)
+    return result
+
+
+def _replay_chunk(lo, hi, offsets, times, kinds, local, params, result):
+    debounce, min_session, frame, end = params
+    n = hi - lo
+    start, count = offsets[lo:hi], offsets[lo + 1:hi + 1] - offsets[lo:hi]
+    focused = np.zeros(n, bool)
+    focused_at = np.zeros(n, np.int64)
+    platform = np.zeros(n, bool)  # Application.isFocused
+    phase = np.zeros(n, np.int8)
+    wake = np.zeros(n, np.int64)
+    users = np.arange(lo, hi)
+    state = (focused, focused_at, platform, phase, wake)
+
+    for k in range(int(count.max(initial=0))):
+        active = count > k
+        index = np.where(active, start + k, 0)
+        t = np.where(active, times[index], 0)
+        kind = kinds[index] & 0x03  # focus_traces keeps scenario flags above the kind
+        _resolve(active, t, True, state, debounce, min_session, frame, users, result)
+
+        gain = active & ((kind == FOCUS) | (kind == RESUME))
+        platform[active & (kind == FOCUS)] = True
+        platform[active & (kind == UNFOCUS)] = False
+        # StartGainFocusSequence: restart the coroutine
+        phase[gain] = _DEBOUNCE
+        wake[gain] = _after(t[gain], debounce, frame)
+        # LoseFocus
+        lose = active & ~gain & focused
+        if lose.any():
+            u = np.flatnonzero(lose)
+            duration = t[u] - focused_at[u]
+            credit = duration >= min_session
+            c, d = u[credit], duration[credit]
+            result.credited[lo + c] += d
+            day = (focused_at[c] + local[c]) // DAY - result.day0
+            np.add.at(result.daily, (lo + c, day), d)
+            result.sessions_ended[lo + c] += 1
+            if result.collect_events:
+                result._ended.append((lo + c, t[c], d))
+            result.focus_lost[lo + u] += 1
+            focused[u] = False
+            phase[u] = _IDLE
+
+    # Coroutines left running after the last event
+    _resolve(phase != _IDLE, end, False, state, debounce, min_session, frame, users, result)
+    result.open_at_end[lo:hi] = focused
+
+
+def _resolve(active, t, strict, state, debounce, min_session, frame, users, result):
+    """Run the coroutine wakes due before t (at or before t unless strict): the debounce, then the
+    minimum-session wait."""
+    focused, focused_at, platform, phase, wake = state
+
+    def due(mask):
+        return mask & ((wake < t) if strict else (wake <= t))
+
+    first = due(active & (phase == _DEBOUNCE))
+    if first.any():
+        gained = first & platform & ~focused
+        focused[gained] = True
+        focused_at[gained] = wake[gained]
+        result.focus_gained[users[gained]] += 1
+        proceed = first & platform
+        phase[first & ~platform] = _IDLE
+        phase[proceed] = _MIN_SESSION
+        wake[proceed] = _after(wake[proceed], min_session, frame)
+    second = due(active & (phase == _MIN_SESSION))
+    if second.any():
+        started = second & focused
+        result.sessions_started[users[started]] += 1
+        if result.collect_events:
+            result._started.append((users[started], focused_at[started]))
+        phase[second] = _IDLE
+
+
+class ScalarFocusService:
+    """Line-by-line transcription of FocusService, with its coroutine run by a one-slot scheduler."""
+
+    def __init__(self, debounce=DEBOUNCE_SEC, min_session=MIN_SESSION_SEC, utc_offset=0.0, frame=0.0):
+        self.debounce_sec = _micros(debounce)
+        self.min_session_sec = _micros(min_session)
+        self.utc_offset = _micros(utc_offset)
+        self.frame = _micros(frame)
+        self.is_focused = False
+        self.focused_at = 0
+        self.total_focus_time_today = 0
+        self.last_reset_date = None
+        self.application_is_focused = False
+        self.coroutine = None  # [phase, wake]
+        self.now = 0
+        self.events = []  # (name, at[, duration])
+        self.daily = {}  # local day number -> total when the day was closed
+
+    def _date(self):
+        return (self.now + self.utc_offset) // DAY
+
+    def initialize(self, now):
+        self.now = now
+        self.last_reset_date = self._date()
+
+    def run_until(self, t, inclusive):
+        """Resume the coroutine while its wake is before t (or at t when inclusive)."""
+        while self.coroutine and (self.coroutine[1] < t or inclusive and self.coroutine[1] <= t):
+            phase, self.now = self.coroutine
+            if phase == _DEBOUNCE:
+                if self.application_is_focused:
+                    self.gain_focus()
+                    self.coroutine = [_MIN_SESSION, _after(self.now, self.min_session_sec, self.frame)]
+                else:
+                    self.coroutine = None
+            else:
+                if self.is_focused:
+                    self.events.append(("SessionStarted", self.focused_at))
+                self.coroutine = None
+
+    def on_event(self, t, kind):
+        if self.last_reset_date is None:
+            self.initialize(t)
+        self.run_until(t, False)
+        self.now = t
+        if kind in (FOCUS, UNFOCUS):
+            self.application_is_focused = kind == FOCUS
+        if kind in (FOCUS, RESUME):
+            self.start_gain_focus_sequence()
+        else:
+            self.lose_focus()
+
+    def start_gain_focus_sequence(self):
+        self.coroutine = [_DEBOUNCE, _after(self.now, self.debounce_sec, self.frame)]
+
+    def gain_focus(self):
+        if self.is_focused:
+            return
+        self.reset_daily_time_if_needed()
+        self.is_focused = True
+        self.focused_at = self.now
+        self.events.append(("FocusGained", self.now))
+
+    def lose_focus(self):
+        if not self.is_focused:
+            return
+        end_time = self.now
+        session_duration = end_time - self.focused_at
+        if session_duration >= self.min_session_sec:
+            self.total_focus_time_today += session_duration
+            self.events.append(("SessionEnded", end_time, session_duration))
+        self.is_focused = False
+        self.events.append(("FocusLost", self.now))
+        self.coroutine = None
+
+    def reset_daily_time_if_needed(self):
+        today = self._date()
+        if today != self.last_reset_date:
+            self.daily[self.last_reset_date] = self.total_focus_time_today
+            self.total_focus_time_today = 0
+            self.last_reset_date = today
+
+    def daily_totals(self):
+        totals = dict(self.daily)
+        if self.last_reset_date is not None:
+            totals[self.last_reset_date] = self.total_focus_time_today
+        return {day: total for day, total in totals.items() if total}
+
+
+def random_traces(users, events, seed=0):
+    """(offsets, times, kinds) of adversarial traces: gaps at and around the debounce and minimum
+    session, simultaneous callbacks, and long gaps across midnight."""
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(0, events + 1, users)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    total = int(offsets[-1])
+    edges = np.array([0, 1, SECOND - 1, SECOND, SECOND + 1, 3 * SECOND, 4 * SECOND, 4 * SECOND + 1])
+    gaps = np.select([rng.random(total) < 0.4, rng.random(total) < 0.5],
+                     [rng.choice(edges, total), rng.integers(0, 10 * SECOND, total)],
+                     rng.integers(0, 8 * 3600 * SECOND, total))
+    gaps[offsets[:-1][counts > 0]] = rng.integers(0, DAY, int((counts > 0).sum()))
+    user = np.repeat(np.arange(users), counts)
+    times = 1_700_000_000 * SECOND + np.cumsum(gaps)
+    # Restart the clock per user so every trace starts near the same date
+    times -= np.concatenate(([0], np.cumsum(gaps)[offsets[1:-1] - 1]))[user] if users > 1 else 0
+    kinds = rng.choice([FOCUS, UNFOCUS, PAUSE, RESUME], total, p=[0.35, 0.35, 0.15, 0.15]).astype(np.int8)
+    return offsets, times, kinds
+
+
+def check(users=2000, events=40, seed=1, frame=0.0):
+    """Compare replay() with ScalarFocusService; returns the number of mismatching users."""
+    offsets, times, kinds = random_traces(users, events, seed)
+    if frame:
+        # Callbacks arrive on frames, so with frames every timestamp is a frame time
+        times = times // _micros(frame) * _micros(frame)
+    rng = np.random.default_rng(seed + 1)
+    utc_offset = rng.choice([-8, 0, 5.5, 9], users) * 3600
+    result = replay(offsets, times, kinds, utc_offset=utc_offset, frame=frame, collect_events=True)
+    started, ended = result.session_started, result.session_ended
+    started_by_user = np.split(started[1], np.searchsorted(started[0], np.arange(1, users)))
+    ended_at = np.split(ended[1], np.searchsorted(ended[0], np.arange(1, users)))
+    ended_duration = np.split(ended[2], np.searchsorted(ended[0], np.arange(1, users)))
+
+    mismatches = 0
+    for u in range(users):
+        service = ScalarFocusService(utc_offset=utc_offset[u], frame=frame)
+        for i in range(offsets[u], offsets[u + 1]):
+            service.on_event(int(times[i]), int(kinds[i]))
+        service.run_until(np.iinfo(np.int64).max, True)
+        expected_started = [e[1] for e in service.events if e[0] == "SessionStarted"]
+        expected_ended = [e[1:] for e in service.events if e[0] == "SessionEnded"]
+        daily = {result.day0 + d: int(v) for d, v in enumerate(result.daily[u]) if v}
+        if (expected_started != started_by_user[u].tolist()
+                or expected_ended != list(zip(ended_at[u].tolist(), ended_duration[u].tolist()))
+                or service.daily_totals() != daily
+                or sum(duration for _, duration in expected_ended) != result.credited[u]
+                or sum(e[0] == "FocusGained" for e in service.events) != result.focus_gained[u]
+                or sum(e[0] == "FocusLost" for e in service.events) != result.focus_lost[u]
+                or service.is_focused != result.open_at_end[u]):
+            mismatches += 1
+    return mismatches
+
+
+def synthetic_month(users, days, sessions_per_day=8, seed=0, start=1_700_000_000 * SECOND):
+    """(offsets, times, kinds): focus/unfocus pairs of log-normal length through each day, with
+    some sessions ending in a pause instead and occasional quick refocus bounces."""
+    rng = np.random.default_rng(seed)
+    sessions = rng.poisson(sessions_per_day * days, users)
+    per_event = 2
+    counts = sessions * per_event
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    total = int(sessions.sum())
+    user = np.repeat(np.arange(users), sessions)
+    # Session starts uniform over the span, sorted per user with one sort of user * span + start
+    span = days * DAY
+    starts = np.sort(user * span + rng.integers(0, span, total)) - user * span + start
+    lengths = np.exp(rng.normal(np.log(120.0), 1.2, total)) * SECOND
+    gap = np.diff(starts, append=np.iinfo(np.int64).max)
+    last = np.zeros(total, bool)
+    last[np.cumsum(sessions)[sessions > 0] - 1] = True
+    ends = starts + np.minimum(lengths.astype(np.int64), np.where(last, lengths.astype(np.int64), gap - 1))
+    times = np.empty(2 * total, np.int64)
+    kinds = np.empty(2 * total, np.int8)
+    times[0::2], times[1::2] = starts, ends
+    paused = rng.random(total) < 0.2
+    kinds[0::2] = np.where(paused, RESUME, FOCUS)
+    kinds[1::2] = np.where(paused, PAUSE, UNFOCUS)
+    return offsets, times, kinds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay focus traces through FocusService's crediting rules")
+    parser.add_argument("--check", action="store_true", help="compare the vectorized replay with the scalar reference")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--sessions-per-day", type=float, default=8.0)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SEC, help="debounceSec (default: %(default)s)")
+    parser.add_argument("--min-session", type=float, default=MIN_SESSION_SEC,
+                        help="minSessionSec (default: %(default)s)")
+    parser.add_argument("--frame", type=float, default=0.0, help="frame length in seconds (default: continuous)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--traces", help="replay a focus_traces.py directory instead of a synthetic month")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failed = 0
+        for frame in (0.0, args.frame or 1 / 60):
+            mismatches = check(frame=frame)
+            failed += mismatches
+            print(f"frame {frame:g} s: {mismatches} of 2000 users differ from ScalarFocusService")
+        return 1 if failed else 0
+
+    started = time.perf_counter()
+    utc_offset = 0.0
+    if args.traces:
+        from focus_traces import open_traces
+
+        traces = open_traces(args.traces)
+        offsets, times, kinds, utc_offset = traces.offsets, traces.times, traces.flags, traces.utc_offset
+    else:
+        offsets, times, kinds = synthetic_month(args.users, args.days, args.sessions_per_day, args.seed)
+    generated = time.perf_counter()
+    result = replay(offsets, times, kinds, args.debounce, args.min_session, utc_offset, frame=args.frame)
+    elapsed = time.perf_counter() - generated
+    print(f"{len(offsets) - 1} users, {len(times)} events ({int(np.diff(offsets).max())} for the longest trace); "
+          f"generated in {generated - started:.2f} s, replayed in {elapsed:.2f} s")
+    daily = result.daily / SECOND / 60
+    print(f"credited per user: mean {result.credited.mean() / SECOND / 3600:.2f} h; "
+          f"{int(result.sessions_ended.sum())} sessions credited of {int(result.focus_lost.sum())} focus losses")
+    print(f"daily minutes per user: median {np.median(daily):.1f}, p95 {np.percentile(daily, 95):.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# Seeded synthetic focus traces for load-testing FocusService, the clock and
+# the offline-progress path, streamed to disk as binary columns.
+#
+# Each user gets a month (--days) of app sessions: a Poisson number per day
+# (per-user rates vary), starting at waking hours of the user's local time,
+# with log-normal lengths. Sessions are spiced with the cases the focus rules
+# exist for:
+#   burst       rapid alt-tab toggles shorter than the debounce before the
+#               focus that sticks
+#   short       a session ending just under minSessionSec after the debounce
+#   midnight    a session straddling local midnight
+#   background  the app paused (PAUSE ... RESUME) instead of unfocused,
+#               across a long gap: the offline-progress case
+#
+# Output directory, readable with open_traces() and laid out the way
+# focus_replay.replay() takes it:
+#   header.json     counts, seed, parameters and the column table
+#   offsets.i64     users + 1 event offsets (user u is offsets[u]:offsets[u + 1])
+#   times.i64       int64 microseconds since the Unix epoch (UTC), sorted per user
+#   flags.u8        kind (focus_replay FOCUS/UNFOCUS/PAUSE/RESUME) in the low two
+#                   bits, plus the scenario bits below
+#   utc_offset.i32  each user's UTC offset in seconds
+# Users are generated in fixed blocks, each from its own seed, and appended as
+# they are made, so memory stays at one block and the output does not depend
+# on anything but the seed and the parameters.
+#
+#   python focus_traces.py --out /tmp/traces --users 100000 --days 30
+#   python focus_replay.py --traces /tmp/traces
+#   python fast_forward.py --traces /tmp/traces
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from focus_replay import DAY, DEBOUNCE_SEC, FOCUS, MIN_SESSION_SEC, PAUSE, RESUME, SECOND, UNFOCUS
+
+FORMAT = "focus-traces"
+VERSION = 1
+BLOCK = 4096
+START = 1_700_006_400 * SECOND  # 2023-11-15 00:00 UTC
+
+KIND_MASK = 0x03
+BURST = 0x04
+SHORT = 0x08
+MIDNIGHT = 0x10
+BACKGROUND = 0x20
+FLAG_NAMES = {"burst": BURST, "short": SHORT, "midnight": MIDNIGHT, "background": BACKGROUND}
+
+COLUMNS = {
+    "offsets": ("offsets.i64", "<i8"),
+    "times": ("times.i64", "<i8"),
+    "flags": ("flags.u8", "u1"),
+    "utc_offset": ("utc_offset.i32", "<i4"),
+}
+
+PARAMETERS = {
+    "sessions_per_day": 8.0,
+    "session_median_sec": 120.0,
+    "session_sigma": 1.2,
+    "burst": 0.15,
+    "short": 0.05,
+    "midnight": 0.02,
+    "background": 0.3,
+    "background_min_sec": 1800.0,
+    "debounce_sec": DEBOUNCE_SEC,
+    "min_session_sec": MIN_SESSION_SEC,
+}
+_UTC_OFFSETS = np.array([-8, -5, 0, 1, 3, 5.5, 8, 9]) * 3600
+
+
+def generate_block(rng, users, days, start, p):
+    """(counts, times, flags, utc_offset) for one block of users."""
+    debounce = int(p["debounce_sec"] * SECOND)
+    min_session = int(p["min_session_sec"] * SECOND)
+    utc_offset = rng.choice(_UTC_OFFSETS, users).astype(np.int32)
+    rate = rng.gamma(2.0, p["sessions_per_day"] / 2.0, users)
+    sessions = rng.poisson(rate * days)
+    n = int(sessions.sum())
+    user = np.repeat(np.arange(users), sessions)
+
+    # Start times: a local day, then a waking-hours time of day (7:00 to 24:00)
+    day = rng.integers(0, days, n)
+    clock = (7 * 3600 + rng.beta(2.0, 2.0, n) * 17 * 3600) * SECOND
+    starts = start + day * DAY + clock.astype(np.int64) - utc_offset[user].astype(np.int64) * SECOND
+    lengths = (np.exp(rng.normal(np.log(p["session_median_sec"]), p["session_sigma"], n)) * SECOND).astype(np.int64)
+    flags = np.zeros(n, np.uint8)
+
+    midnight = rng.random(n) < p["midnight"]
+    local = starts[midnight] + utc_offset[user[midnight]].astype(np.int64) * SECOND
+    next_midnight = (local // DAY + 1) * DAY - utc_offset[user[midnight]].astype(np.int64) * SECOND
+    starts[midnight] = next_midnight - (rng.random(int(midnight.sum())) * lengths[midnight]).astype(np.int64) - 1
+    flags[midnight] |= MIDNIGHT
+
+    short = rng.random(n) < p["short"]
+    lengths[short] = debounce + min_session - rng.integers(1, SECOND // 2, int(short.sum()))
+    flags[short] |= SHORT
+
+    # Sort the sessions of each user by start
+    order = np.argsort(user.astype(np.int64) * (days + 2) * DAY + (starts - start + DAY), kind="stable")
+    starts, lengths, flags = starts[order], lengths[order], flags[order]
+    user = user[order]
+    never = np.iinfo(np.int64).max
+    last_of_user = np.ones(n, bool)
+    last_of_user[:-1] = user[1:] != user[:-1]
+
+    def following(values):
+        """values of the same user's next session, never for a user's last session."""
+        out = np.full(n, never)
+        out[:-1] = values[1:]
+        out[last_of_user] = never
+        return out
+
+    # Bursts before a focus: k toggle pairs g apart, kept clear of the previous session
+    toggles = np.where(rng.random(n) < p["burst"], rng.integers(1, 4, n), 0)
+    spacing = (rng.uniform(0.05, 0.9, n) * debounce).astype(np.int64)
+    previous_end = np.full(n, np.iinfo(np.int64).min)
+    previous_end[1:] = (starts + lengths)[:-1]
+    previous_end[1:][last_of_user[:-1]] = np.iinfo(np.int64).min
+    toggles[starts - 2 * toggles * spacing <= previous_end] = 0
+    lead = 2 * toggles * spacing
+    # Every session ends before the next one's first event; overlapped ones are dropped
+    ends = np.minimum(starts + lengths, following(starts - lead) - 1)
+    keep = ends > starts
+    user, starts, ends, flags, toggles, spacing = (a[keep] for a in (user, starts, ends, flags, toggles, spacing))
+    n = len(user)
+    last_of_user = np.ones(n, bool)
+    last_of_user[:-1] = user[1:] != user[:-1]
+
+    # Background: paused instead of unfocused when the gap to the user's next session is long
+    next_start = following(starts - 2 * toggles * spacing)
+    paused = ~last_of_user & (next_start - ends > p["background_min_sec"] * SECOND) & (rng.random(n) < p["background"])
+    resumed = np.zeros(n, bool)
+    resumed[1:] = paused[:-1]
+    flags[paused | resumed] |= BACKGROUND
+    toggles[resumed] = 0
+    flags[toggles > 0] |= BURST
+
+    # Lay out 2 * toggles + 2 events per session
+    per_session = 2 * toggles + 2
+    counts = np.bincount(user, weights=per_session, minlength=users).astype(np.int64)
+    session_of = np.repeat(np.arange(n), per_session)
+    first_event = np.cumsum(per_session) - per_session
+    i = np.arange(len(session_of)) - first_event[session_of]
+    last = i == per_session[session_of] - 1
+    times = np.where(last, ends[session_of], starts[session_of] - (2 * toggles[session_of] - i) * spacing[session_of])
+    # The focus that sticks is a resume after a pause; toggles are plain focus/unfocus
+    sticks = i == 2 * toggles[session_of]
+    kinds = np.where(last, np.where(paused[session_of], PAUSE, UNFOCUS),
+                     np.where(i % 2 == 1, UNFOCUS, np.where(sticks & resumed[session_of], RESUME, FOCUS)))
+    out_flags = flags[session_of] | kinds.astype(np.uint8)
+    return counts, times.astype(np.int64), out_flags.astype(np.uint8), utc_offset
+
+
+def write_traces(path, users, days=30, seed=0, start=START, parameters=None):
+    """Generate users' traces into path; returns the header."""
+    p = dict(PARAMETERS, **(parameters or {}))
+    os.makedirs(path, exist_ok=True)
+    files = {name: open(os.path.join(path, file), "wb") for name, (file, _) in COLUMNS.items()}
+    total = 0
+    try:
+        files["offsets"].write(np.zeros(1, "<i8").tobytes())
+        for block, lo in enumerate(range(0, users, BLOCK)):
+            size = min(BLOCK, users - lo)
+            counts, times, flags, utc_offset = generate_block(np.random.default_rng([seed, block]), size, days,
+                                                              start, p)
+            files["offsets"].write((total + np.cumsum(counts)).astype("<i8").tobytes())
+            files["times"].write(times.astype("<i8").tobytes())
+            files["flags"].write(flags.tobytes())
+            files["utc_offset"].write(utc_offset.astype("<i4").tobytes())
+            total += int(counts.sum())
+    finally:
+        for f in files.values():
+            f.close()
+
+    lengths = {"offsets": users + 1, "times": total, "flags": total, "utc_offset": users}
+    header = {
+        "format": FORMAT,
+        "version": VERSION,
+        "users": users,
+        "events": total,
+        "days": days,
+        "start": start,
+        "seed": seed,
+        "block": BLOCK,
+        "parameters": p,
+        "time_unit": "us",
+        "kinds": {"focus": FOCUS, "unfocus": UNFOCUS, "pause": PAUSE, "resume": RESUME},
+        "flags": dict(FLAG_NAMES, kind_mask=KIND_MASK),
+        "columns": {name: {"file": file, "dtype": dtype, "length": lengths[name]}
+                    for name, (file, dtype) in COLUMNS.items()},
+    }
+    tmp_path = os.path.join(path, f"header.json.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, os.path.join(path, "header.json"))
+    return header
+
+
+class Traces:
+    """A trace directory, its columns memory-mapped."""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "header.json"), encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("format") != FORMAT or self.header.get("version") != VERSION:
+            raise ValueError(f"{path}: not a {FORMAT} v{VERSION} directory")
+        for name, column in self.header["columns"].items():
+            data = np.memmap(os.path.join(path, column["file"]), dtype=column["dtype"], mode="r",
+                             shape=(column["length"],)) if column["length"] else np.zeros(0, column["dtype"])
+            setattr(self, name, data)
+        self.users = self.header["users"]
+
+
+def open_traces(path):
+    return Traces(path)
+
+
+def offline_seconds(traces, chunk=1 << 16):
+    """Per user, the total seconds spent paused (PAUSE to the next RESUME): the offline-progress time."""
+    total = np.zeros(traces.users)
+    for lo in range(0, traces.users, chunk):
+        hi = min(traces.users, lo + chunk)
+        a, b = int(traces.offsets[lo]), int(traces.offsets[hi])
+        times = np.asarray(traces.times[a:b])
+        kinds = np.asarray(traces.flags[a:b]) & KIND_MASK
+        user = np.repeat(np.arange(lo, hi), np.diff(traces.offsets[lo:hi + 1]))
+        resume = np.flatnonzero((kinds[1:] == RESUME) & (kinds[:-1] == PAUSE) & (user[1:] == user[:-1])) + 1
+        np.add.at(total, user[resume], (times[resume] - times[resume - 1]) / SECOND)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write seeded synthetic focus traces as binary columns")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    for name, value in PARAMETERS.items():
+        parser.add_argument("--" + name.replace("_", "-"), type=float, default=value,
+                            help=f"(default: {value:g})")
+    args = parser.parse_args(argv)
+
+    parameters = {name: getattr(args, name) for name in PARAMETERS}
+    started = time.perf_counter()
+    header = write_traces(args.out, args.users, args.days, args.seed, parameters=parameters)
+    elapsed = time.perf_counter() - started
+    traces = open_traces(args.out)
+    flags = np.asarray(traces.flags)
+    size = sum(os.path.getsize(os.path.join(args.out, c["file"])) for c in header["columns"].values())
+    print(f"{header['users']} users, {header['events']} events in {elapsed:.2f} s "
+          f"({header['events'] / max(elapsed, 1e-9) / 1e6:.1f} M events/s), {size / 2**20:.0f} MiB")
+    print("events by scenario: " + ", ".join(f"{name} {int(np.count_nonzero(flags & bit))}"
+                                             for name, bit in FLAG_NAMES.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
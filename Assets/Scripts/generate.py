@@ -0,0 +1,210 @@
+# Single driver for the Unity script generator.
+# Replaces running script_1.py ... script_11.py by hand: categories come from
+# script.py's registry, cross-cell dependencies (script_4 extending script_3's
+# domain_scripts, script_8 extending script_7's service_scripts) are resolved
+# by generator_registry, and categories render and stage their files in a
+# process pool; the run then commits every staged file at once.
+#
+#   python generate.py                      # everything, one worker per core
+#   python generate.py --category Services --out /tmp/Unity_Scripts  # default: <project>/Unity_Scripts
+#   python generate.py --drift              # compare with the checked-in scripts
+#   python generate.py --validate           # structural C# checks (and no stale curve tables) before writing
+#   python generate.py --asmdef             # also write per-layer assembly definitions
+#   python generate.py --bake-curves        # first bake the content assets' curves into lookup tables
+#   python generate.py --out drop.zip       # stream everything into an archive (or .tar.gz)
+#   python generate.py --out memory         # render and "write" without touching disk
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import asmdef_layout
+import csharp_validator
+import curve_bake
+import generator_drift
+import generator_sinks
+import unity_meta
+from generator_manifest import OUTPUT_ROOT, Manifest, write_scripts
+from generator_registry import SCRIPTS_DIR, discover, render_category
+
+
+class CategoryResult:
+    """Outcome of one category: write report, manifest entries and timings."""
+
+    def __init__(self, category):
+        self.name = category.name
+        self.folder = category.folder
+        self.report = None
+        self.entries = {}
+        self.staged = []  # (temp path, final path) awaiting run()'s commit
+        self.unregistered = []
+        self.missing = []
+        self.render_sec = 0.0
+        self.write_sec = 0.0
+
+
+def run_category(category, root=OUTPUT_ROOT, guid_seeds=None, sink=None):
+    """Render one category and write it incrementally. Runs inside a worker.
+
+    Without a sink the changed files are only staged under root, for run() to
+    commit (result.staged). With a sink that does not persist (memory, archive)
+    every file is written and nothing is recorded in the manifest.
+    """
+    result = CategoryResult(category)
+
+    start = time.perf_counter()
+    rendered = render_category(category)
+    result.render_sec = time.perf_counter() - start
+
+    # The registry decides what ships; anything else is reported, not written
+    scripts = {name: content for name, content in rendered.items() if name in category.registered}
+    result.unregistered = [name for name in rendered if name not in category.registered]
+    result.missing = [name for name in category.registered if name not in rendered]
+
+    start = time.perf_counter()
+    if sink is not None and not sink.persistent:
+        result.report = write_scripts(category.folder, scripts, root, None, guid_seeds, sink=sink)
+    else:
+        manifest = Manifest(root)
+        staging = generator_sinks.FileSystemSink(root)
+        try:
+            result.report = write_scripts(category.folder, scripts, root, manifest, guid_seeds, sink=staging)
+        except BaseException:
+            staging.discard()
+            raise
+        result.staged = staging.detach()
+        result.entries = manifest.entries_under(category.folder)
+    result.write_sec = time.perf_counter() - start
+    return result
+
+
+def run(categories, root=OUTPUT_ROOT, jobs=None, guid_seeds=None):
+    """Run categories in parallel, commit their staged files as one batch and fold every
+    worker's entries into one manifest.
+
+    guid_seeds defaults to the GUIDs of the checked-in scripts, so generated
+    .meta files keep every existing m_Script reference pointing at them.
+    """
+    if guid_seeds is None:
+        guid_seeds = unity_meta.checked_in_guids(categories, SCRIPTS_DIR)
+    if jobs == 1 or len(categories) <= 1:
+        results = [run_category(category, root, guid_seeds) for category in categories]
+    else:
+        count = len(categories)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run_category, categories, [root] * count, [guid_seeds] * count))
+
+    # One fsync per changed file and per directory they land in, for the whole run
+    with generator_sinks.FileSystemSink(root) as sink:
+        for result in results:
+            sink.adopt(result.staged)
+    manifest = Manifest(root)
+    for result in results:
+        manifest.merge_folder(result.folder, result.entries)
+    manifest.save()
+    return results
+
+
+def export(categories, sink, guid_seeds=None):
+    """Write every category into one sink (e.g. an archive) in this process, then close it."""
+    if guid_seeds is None:
+        guid_seeds = unity_meta.checked_in_guids(categories, SCRIPTS_DIR)
+    with sink:
+        return [run_category(category, OUTPUT_ROOT, guid_seeds, sink) for category in categories]
+
+
+def print_summary(results, elapsed):
+    print(f"{'category':<22}{'folder':<12}{'render ms':>10}{'write ms':>10}{'written':>9}{'same':>6}{'stale':>7}")
+    for r in results:
+        print(f"{r.name:<22}{r.folder:<12}{r.render_sec * 1000:>10.1f}{r.write_sec * 1000:>10.1f}"
+              f"{len(r.report.rewritten):>9}{len(r.report.skipped):>6}{len(r.report.stale):>7}")
+    print(f"total {elapsed * 1000:.1f} ms")
+
+    for r in results:
+        for name in r.report.rewritten:
+            print(f"  ~ {r.folder}/{name}")
+        for name in r.report.stale:
+            print(f"  ! {r.folder}/{name} is no longer generated")
+        for name in r.unregistered:
+            print(f"  ? {r.folder}/{name} is generated but not in scripts_to_create (skipped)")
+        for name in r.missing:
+            print(f"  - {r.folder}/{name} is registered but no script generates it")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the FocusFounder Unity scripts")
+    parser.add_argument("--out", default=OUTPUT_ROOT, help="output root (default: %(default)s)")
+    parser.add_argument("--category", action="append", default=[],
+                        help="registry category or folder to run (repeatable, default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: cores)")
+    parser.add_argument("--drift", action="store_true",
+                        help="write nothing; print a JSON drift report against the checked-in scripts")
+    parser.add_argument("--diff", action="store_true", help="with --drift, include unified diffs")
+    parser.add_argument("--validate", action="store_true",
+                        help="check the rendered C# and the baked curves first and write nothing if any fails")
+    parser.add_argument("--asmdef", action="store_true",
+                        help="write .asmdef/.asmref files per layer (refused if the layers form a cycle)")
+    parser.add_argument("--bake-curves", action="store_true",
+                        help="bake the AnimationCurves of Assets/Data into BakedCurve tables (see curve_bake.py)")
+    args = parser.parse_args(argv)
+
+    if args.bake_curves:
+        curve_bake.print_results(curve_bake.bake_assets())
+    if args.bake_curves or args.validate:
+        # The game ignores a table whose curve was edited after baking, so a stale one is a content bug
+        stale = curve_bake.stale_tables()
+        for path, field in stale:
+            print(f"{os.path.relpath(path)}:{field}: baked table does not match the curve (run curve_bake.py)")
+        if stale:
+            return 1
+
+    categories, unmatched = discover()
+    if args.validate:
+        # Every category, so duplicate types and usings are checked across all of them
+        problems = csharp_validator.validate(csharp_validator.generated_files(categories), args.jobs)
+        if problems:
+            print(csharp_validator.format_problems(problems))
+            return 1
+    if args.category:
+        wanted = set(args.category)
+        categories = [c for c in categories if c.name in wanted or c.folder in wanted]
+        if not categories:
+            parser.error(f"no category matches {', '.join(args.category)}")
+
+    if args.drift:
+        report = generator_drift.check(categories=categories, with_diff=args.diff)
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return 0 if report["clean"] else 1
+
+    start = time.perf_counter()
+    sink = generator_sinks.make_sink(args.out)
+    if sink.persistent:
+        results = run(categories, args.out, args.jobs)
+    else:
+        results = export(categories, sink)
+    print_summary(results, time.perf_counter() - start)
+    if isinstance(sink, generator_sinks.MemorySink):
+        print(f"{len(sink.files)} files, {sum(len(text.encode('utf-8')) for text in sink.files.values())} bytes "
+              f"rendered in memory")
+    for name in unmatched:
+        print(f"  - registry category {name!r} has no generator script")
+
+    if args.asmdef and not sink.persistent:
+        print("--asmdef needs a directory output; skipped")
+    elif args.asmdef:
+        layout = asmdef_layout.Layout(csharp_validator.generated_files())
+        print(layout.summary())
+        try:
+            for report in asmdef_layout.write_layout(layout, args.out):
+                print(report)
+        except asmdef_layout.LayoutError as exc:
+            print(f"refusing to emit this layout:\n{exc}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# Benchmarks for the Unity script generator.
+# Times each category's render, validate and write phases on synthetic
+# scale-ups of its registry (every entry copied 10x, 100x, 1000x, each copy in
+# its own namespace so the copies stay valid C#), records bytes/s and files/s
+# to a JSON history, and fails when a phase is slower than the recent history
+# of the same machine by more than its threshold and its own noise.
+#
+# Most cells hold their C# as string literals, so rendering a copy means
+# re-importing the category's cells (from their .pyc) and rendering every
+# entry of the fresh registry; templated entries render for real. Writes go
+# through a FileSystemSink without the commit fsyncs into a scratch directory
+# on a memory filesystem (/dev/shm where there is one), since on a disk the
+# journal and writeback of earlier runs would be timed rather than the
+# generator.
+#
+# For stable numbers each phase runs once as warm-up, then `repeats` times
+# with the garbage collector off; the median is what gets recorded, with the
+# median absolute deviation (MAD) of the repeats. Every repeat is paired with
+# a fixed stdlib-only reference workload, and phases are compared in units of
+# that reference, so a machine that is slower for a while (other tenants,
+# throttling) slows both alike and is not taken for a regression. A phase only
+# regresses when it exceeds the baseline (the median of the last runs, once
+# there are three) by the threshold, by --sigmas robust standard deviations
+# (from the MAD across those runs and within them, at least the typical
+# spread of all phases) and by --min-delta-ms, so a noisy phase needs a
+# proportionally larger slowdown to fail. What looks slower is measured again
+# with more repeats before it counts.
+#
+#   python generator_bench.py                       # 10x 100x 1000x, all categories
+#   python generator_bench.py --scale 10 --category Services --threshold 0.3
+import argparse
+import gc
+import hashlib
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import csharp_validator
+from generator_manifest import Manifest, write_scripts
+from generator_registry import SCRIPTS_DIR, discover, load_category
+from generator_sinks import FileSystemSink
+
+HISTORY_PATH = os.path.join(SCRIPTS_DIR, ".generator_cache", "bench_history.json")
+SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+PHASES = ("render", "validate", "write")
+# Bumped whenever what a phase measures changes; older runs are not comparable
+METHOD = 3
+# MAD * 1.4826 estimates the standard deviation of normally distributed samples
+_MAD_TO_SIGMA = 1.4826
+
+
+def machine_key():
+    """Runs are only compared with earlier runs on the same machine and interpreter."""
+    return f"{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu/py{platform.python_version()}"
+
+
+def mad(values):
+    """Median absolute deviation from the median."""
+    center = statistics.median(values)
+    return statistics.median(abs(value - center) for value in values)
+
+
+_REFERENCE_TEXT = "namespace FocusFounder.Bench { public sealed class Reference { private int value; } }\n" * 64
+
+
+def reference():
+    """A fixed hashing, splitting and dict workload that does not touch the generator."""
+    table = {}
+    for index in range(200):
+        digest = hashlib.blake2b(_REFERENCE_TEXT.encode("utf-8")).hexdigest()
+        table[digest[:8] + str(index)] = _REFERENCE_TEXT.split()
+    return len(table)
+
+
+def _timed(action, repeats):
+    """(median, MAD, reference median) seconds of action() over repeats runs after one warm-up,
+    gc off, each run followed by one run of reference()."""
+    action()
+    reference()
+    samples, references = [], []
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            action()
+            middle = time.perf_counter_ns()
+            reference()
+            samples.append((middle - start) / 1e9)
+            references.append((time.perf_counter_ns() - middle) / 1e9)
+    finally:
+        if enabled:
+            gc.enable()
+    return statistics.median(samples), mad(samples), statistics.median(references)
+
+
+def scaled_files(rendered, scale):
+    """name -> source for scale copies of every entry, each copy in its own namespace."""
+    files = {}
+    for copy in range(scale):
+        for name, content in rendered.items():
+            stem, ext = os.path.splitext(name)
+            files[f"{stem}_{copy}{ext}"] = content.replace("namespace FocusFounder.",
+                                                           f"namespace FocusFounder.Bench{copy}.")
+    return files
+
+
+def bench_category(category, scale, repeats, jobs=1, scratch=SCRATCH_DIR):
+    """{"files", "bytes", phase: {"seconds", "mad", "reference", "bytes_per_sec", "files_per_sec"}} for one
+    category at one scale; writes go to a temporary directory under scratch (default: the system's)."""
+    registry = load_category(category)
+    names = [name for name in registry if name in category.registered]
+    modules = [os.path.splitext(os.path.basename(path))[0] for path in category.sources]
+    files = scaled_files({name: registry[name] for name in names}, scale)
+    size = sum(len(content.encode("utf-8")) for content in files.values())
+    labels = {f"{category.folder}/{name}": content for name, content in files.items()}
+
+    def render():
+        for _ in range(scale):
+            for module in modules:
+                sys.modules.pop(module, None)
+            fresh = load_category(category)
+            for name in names:
+                fresh[name]
+
+    def validate():
+        csharp_validator.validate(labels, jobs, cache_path=None)
+
+    scratch = tempfile.mkdtemp(prefix="generator_bench_", dir=scratch)
+    roots = []
+
+    def write():
+        # A fresh root every time, so each run writes every file
+        root = os.path.join(scratch, str(len(roots)))
+        roots.append(root)
+        sink = FileSystemSink(root, durable=False)
+        write_scripts(category.folder, files, root, Manifest(root), sink=sink)
+        sink.commit()
+
+    try:
+        timings = {"render": _timed(render, repeats), "validate": _timed(validate, repeats),
+                   "write": _timed(write, repeats)}
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    result = {"files": len(files), "bytes": size}
+    for phase, (elapsed, spread, calibration) in timings.items():
+        result[phase] = {"seconds": round(elapsed, 6), "mad": round(spread, 6), "reference": round(calibration, 6),
+                         "bytes_per_sec": round(size / elapsed) if elapsed else None,
+                         "files_per_sec": round(len(files) / elapsed, 1) if elapsed else None}
+    return result
+
+
+def load_history(path=HISTORY_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_history(history, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def regressions(results, history, threshold, min_delta=0.001, window=5, sigmas=4.0, min_runs=3):
+    """(category, scale, phase, seconds, baseline, allowed) for every phase slower than baseline + allowed.
+
+    The baseline is the median of the last `window` runs on this machine (and
+    METHOD) that measured the same category, scale and phase, each in units of
+    its run's reference() time; phases with fewer than min_runs such runs are
+    not judged yet. The allowed slowdown is the largest of threshold *
+    baseline, sigmas robust standard deviations of the difference and
+    min_delta seconds, the timer noise of sub-millisecond phases. The spread is
+    the MAD of those runs' medians, or of their repeats if larger, but at least
+    the median relative spread of all phases judged (a handful of runs can
+    agree by chance), combined with this run's own MAD. baseline and allowed
+    are reported in seconds at this run's reference time.
+    """
+    key = machine_key()
+    previous = [run for run in history if run.get("machine") == key and run.get("method", 1) == METHOD][-window:]
+    judged = []
+    for category, scales in results.items():
+        for scale, phases in scales.items():
+            for phase in PHASES:
+                numbers = phases[phase]
+                past = [run["results"][category][scale][phase] for run in previous
+                        if phase in run["results"].get(category, {}).get(scale, {})]
+                if len(past) < min_runs:
+                    continue
+                # Scale every run to this run's reference time
+                scaled = [(entry["seconds"] * numbers["reference"] / entry["reference"],
+                           entry["mad"] * numbers["reference"] / entry["reference"]) for entry in past]
+                baseline = statistics.median(seconds for seconds, _ in scaled)
+                spread = max(mad([seconds for seconds, _ in scaled]), statistics.median(spread for _, spread in scaled))
+                judged.append((category, scale, phase, numbers, baseline, spread))
+    if not judged:
+        return []
+    noise = statistics.median(spread / baseline for *_, baseline, spread in judged if baseline)
+    found = []
+    for category, scale, phase, numbers, baseline, spread in judged:
+        spread = math.hypot(max(spread, noise * baseline), numbers["mad"])
+        allowed = max(threshold * baseline, sigmas * _MAD_TO_SIGMA * spread, min_delta)
+        if numbers["seconds"] - baseline > allowed:
+            found.append((category, scale, phase, numbers["seconds"], baseline, allowed))
+    return found
+
+
+def print_results(results):
+    print(f"{'category':<12}{'scale':>6}{'files':>7}  " + "".join(f"{phase + ' ms':>12}{'MB/s':>8}" for phase in PHASES))
+    for category, scales in results.items():
+        for scale, phases in scales.items():
+            row = f"{category:<12}{scale:>6}{phases['files']:>7}  "
+            for phase in PHASES:
+                numbers = phases[phase]
+                rate = (numbers["bytes_per_sec"] or 0) / 1e6
+                row += f"{numbers['seconds'] * 1000:>12.2f}{rate:>8.1f}"
+            print(row)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generator phases at synthetic scale")
+    parser.add_argument("--scale", type=int, action="append", default=[],
+                        help="copies of every entry (repeatable, default: 10 100 1000)")
+    parser.add_argument("--category", action="append", default=[],
+                        help="registry category or folder to run (repeatable, default: all)")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per phase (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown against the history median (default: %(default)s = 25%%)")
+    parser.add_argument("--sigmas", type=float, default=4.0,
+                        help="allowed slowdown in robust standard deviations of the baseline (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="ignore slowdowns smaller than this many ms (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="validator workers (default: 1, which keeps timings stable)")
+    parser.add_argument("--history", default=HISTORY_PATH, help="JSON history file (default: %(default)s)")
+    parser.add_argument("--scratch", default=SCRATCH_DIR,
+                        help="directory the write phase writes under (default: %(default)s, else the system temp)")
+    parser.add_argument("--no-record", action="store_true", help="compare, but do not append this run")
+    args = parser.parse_args(argv)
+
+    categories, _ = discover()
+    if args.category:
+        wanted = set(args.category)
+        categories = [c for c in categories if c.name in wanted or c.folder in wanted]
+        if not categories:
+            parser.error(f"no category matches {', '.join(args.category)}")
+
+    results = {}
+    for category in categories:
+        for scale in args.scale or [10, 100, 1000]:
+            results.setdefault(category.folder, {})[str(scale)] = bench_category(category, scale, args.repeats,
+                                                                                 args.jobs, args.scratch)
+
+    history = load_history(args.history)
+    slower = regressions(results, history, args.threshold, args.min_delta_ms / 1000, sigmas=args.sigmas)
+    if slower:
+        # The machine itself can slow down for the length of a phase: measure what looks slower
+        # again, with more repeats, and keep whichever measurement of each phase was faster
+        folders = {category.folder: category for category in categories}
+        for folder, scale in sorted({(folder, scale) for folder, scale, *_ in slower}):
+            again = bench_category(folders[folder], int(scale), 2 * args.repeats + 1, args.jobs, args.scratch)
+            for phase in PHASES:
+                first = results[folder][scale][phase]
+                if again[phase]["seconds"] / again[phase]["reference"] < first["seconds"] / first["reference"]:
+                    results[folder][scale][phase] = again[phase]
+        slower = regressions(results, history, args.threshold, args.min_delta_ms / 1000, sigmas=args.sigmas)
+    print_results(results)
+    if not args.no_record:
+        history.append({"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "machine": machine_key(),
+                        "method": METHOD, "repeats": args.repeats, "results": results})
+        save_history(history, args.history)
+
+    for category, scale, phase, seconds, baseline, allowed in slower:
+        print(f"REGRESSION {category} x{scale} {phase}: {seconds * 1000:.2f} ms "
+              f"vs {baseline * 1000:.2f} ms median ({seconds / baseline - 1:+.0%}, "
+              f"{allowed * 1000:.2f} ms allowed)")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
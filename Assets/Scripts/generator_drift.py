@@ -0,0 +1,124 @@
+# Drift check between what the generator would write and the checked-in
+# sources under Assets/Scripts. Nothing is written; the report says which
+# generated files still match, which were edited by hand, and which exist on
+# only one side, so regeneration can be gated instead of clobbering edits.
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+
+from generator_registry import SCRIPTS_DIR, discover, render_category
+
+# Generator folders whose files live somewhere else in the project
+FOLDER_OVERRIDES = {
+    "Management": "Core",
+}
+
+
+def _normalize(text):
+    # git (text=auto) and Unity may change BOM / line endings; neither is drift
+    return text.lstrip("\ufeff").replace("\r\n", "\n")
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def index_checked_in(repo_dir=SCRIPTS_DIR):
+    """relative path -> absolute path of every .cs under repo_dir."""
+    index = {}
+    for dirpath, dirnames, filenames in os.walk(repo_dir):
+        # Unity skips hidden and ~ folders; so do we
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and not d.endswith("~")]
+        for filename in filenames:
+            if filename.endswith(".cs"):
+                path = os.path.join(dirpath, filename)
+                index[os.path.relpath(path, repo_dir).replace(os.sep, "/")] = path
+    return index
+
+
+def index_by_name(index):
+    by_name = {}
+    for rel_path in index:
+        by_name.setdefault(rel_path.rsplit("/", 1)[-1], []).append(rel_path)
+    return by_name
+
+
+def locate(folder, name, index, by_name=None):
+    """Checked-in path for a generated folder/name, or None."""
+    rel_path = f"{FOLDER_OVERRIDES.get(folder, folder)}/{name}"
+    if rel_path in index:
+        return rel_path
+    # Fall back to a unique file name anywhere in the tree
+    matches = (by_name if by_name is not None else index_by_name(index)).get(name, [])
+    return matches[0] if len(matches) == 1 else None
+
+
+def check(repo_dir=SCRIPTS_DIR, categories=None, with_diff=False):
+    """Machine-readable drift report for every generated file."""
+    if categories is None:
+        categories, _ = discover()
+    index = index_checked_in(repo_dir)
+    by_name = index_by_name(index)
+    matched = set()
+    files = []
+
+    for category in categories:
+        for name, content in render_category(category).items():
+            generated = _normalize(content)
+            entry = {
+                "category": category.name,
+                "generated": f"{category.folder}/{name}",
+                "checked_in": None,
+                "status": "missing",
+                "generated_hash": _digest(generated),
+            }
+            rel_path = locate(category.folder, name, index, by_name)
+            if rel_path is not None:
+                matched.add(rel_path)
+                with open(index[rel_path], encoding="utf-8", newline="") as f:
+                    existing = _normalize(f.read())
+                entry["checked_in"] = rel_path
+                entry["checked_in_hash"] = _digest(existing)
+                if entry["checked_in_hash"] == entry["generated_hash"]:
+                    entry["status"] = "identical"
+                else:
+                    entry["status"] = "modified"
+                    entry["whitespace_only"] = generated.split() == existing.split()
+                    if with_diff:
+                        entry["diff"] = "".join(difflib.unified_diff(
+                            generated.splitlines(True), existing.splitlines(True),
+                            f"generated/{entry['generated']}", f"checked_in/{rel_path}"))
+            files.append(entry)
+
+    untracked = sorted(path for path in index if path not in matched)
+    summary = {status: 0 for status in ("identical", "modified", "missing")}
+    for entry in files:
+        summary[entry["status"]] += 1
+    summary["untracked"] = len(untracked)
+
+    return {
+        "repo": os.path.relpath(repo_dir),
+        "clean": summary["modified"] == 0 and summary["missing"] == 0,
+        "summary": summary,
+        "files": files,
+        "untracked": untracked,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare generator output with the checked-in scripts")
+    parser.add_argument("--repo", default=SCRIPTS_DIR, help="checked-in scripts root (default: this folder)")
+    parser.add_argument("--diff", action="store_true", help="include unified diffs for modified files")
+    args = parser.parse_args(argv)
+
+    report = check(args.repo, with_diff=args.diff)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0 if report["clean"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+# Incremental writer for the generated Unity scripts.
+# Every generated file is recorded in a manifest (path -> hash of the generated
+# text plus the generator version). A file is only rewritten when that hash
+# changes, so Unity only reimports what actually changed. Scripts are written
+# together with their .meta so their GUIDs never change either.
+import hashlib
+import json
+import os
+
+import unity_meta
+
+GENERATOR_VERSION = "1"
+# Output goes beside Assets/ in the Unity project, wherever the tools are run
+# from: inside Assets/ Unity would compile it next to the checked-in scripts
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+OUTPUT_FOLDER = "Unity_Scripts"
+OUTPUT_ROOT = os.path.join(PROJECT_DIR, OUTPUT_FOLDER)
+# Dot-prefixed so Unity never imports it as an asset
+MANIFEST_NAME = ".generator_manifest.json"
+
+
+def content_hash(content, version=GENERATOR_VERSION):
+    """Hash of the generated text, salted with the generator version."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Path -> hash record of everything the generator has written under root."""
+
+    def __init__(self, root=OUTPUT_ROOT, version=GENERATOR_VERSION):
+        self.root = root
+        self.version = version
+        self.path = os.path.join(root, MANIFEST_NAME)
+        self.entries = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # A different generator version invalidates every recorded hash anyway
+        if data.get("version") == self.version:
+            self.entries = data.get("files", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "files": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def is_current(self, rel_path, digest):
+        """True when rel_path on disk still holds the content hashed as digest."""
+        try:
+            st = os.stat(os.path.join(self.root, rel_path))
+        except OSError:
+            return False
+        entry = self.entries.get(rel_path)
+        if entry is not None and st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+            return entry["hash"] == digest
+        # Unrecorded or touched since the last run (checkout, copy, hand edit):
+        # fall back to hashing what is actually on disk
+        with open(os.path.join(self.root, rel_path), encoding="utf-8", newline="") as f:
+            on_disk = f.read()
+        if content_hash(on_disk, self.version) != digest:
+            return False
+        self.record(rel_path, digest, st)
+        return True
+
+    def record(self, rel_path, digest, st=None):
+        if st is None:
+            st = os.stat(os.path.join(self.root, rel_path))
+        self.entries[rel_path] = {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self._dirty = True
+
+    def forget(self, rel_path):
+        if self.entries.pop(rel_path, None) is not None:
+            self._dirty = True
+
+    def paths_under(self, folder):
+        prefix = folder.rstrip("/") + "/"
+        return [path for path in self.entries if path.startswith(prefix)]
+
+    def entries_under(self, folder):
+        return {path: self.entries[path] for path in self.paths_under(folder)}
+
+    def merge_folder(self, folder, entries):
+        """Replace everything recorded under folder (e.g. with a worker's result)."""
+        for path in self.paths_under(folder):
+            if path not in entries:
+                del self.entries[path]
+        self.entries.update(entries)
+        self._dirty = True
+
+
+class WriteReport:
+    """What a write pass did to each file of a category."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.skipped = []
+        self.rewritten = []
+        self.stale = []
+
+    def to_dict(self):
+        return {
+            "folder": self.folder,
+            "skipped": self.skipped,
+            "rewritten": self.rewritten,
+            "stale": self.stale,
+        }
+
+    def __str__(self):
+        lines = [
+            f"{self.folder}: {len(self.rewritten)} rewritten, "
+            f"{len(self.skipped)} unchanged, {len(self.stale)} stale"
+        ]
+        lines += [f"  ~ {name}" for name in self.rewritten]
+        lines += [f"  ! {name} (no longer generated)" for name in self.stale]
+        return "\n".join(lines)
+
+
+def _write_if_changed(rel_path, content, sink, manifest):
+    if manifest is None:
+        sink.write(rel_path, content)
+        return True
+    digest = content_hash(content, manifest.version)
+    if manifest.is_current(rel_path, digest):
+        return False
+    # Recorded once the sink has moved the file into place (or, detached, from the staged file)
+    sink.write(rel_path, content, lambda st=None: manifest.record(rel_path, digest, st))
+    return True
+
+
+def write_scripts(folder, scripts, root=OUTPUT_ROOT, manifest=None, guid_seeds=None, with_meta=True,
+                  complete=True, sink=None):
+    """Write scripts (name -> C# source) to root/folder, skipping unchanged files.
+
+    Each script gets a .meta with a stable GUID (see unity_meta); guid_seeds maps
+    folder/name to a GUID to use when the output has no .meta yet. When scripts
+    is the folder's complete output, files recorded for the folder that it no
+    longer produces are reported as stale (but left on disk); pass
+    complete=False when writing just a subset.
+
+    sink (see generator_sinks) defaults to the filesystem under root, committed
+    as one batch before returning. A caller-supplied sink is left for the caller
+    to commit; sinks that do not persist (memory, archives) get every file and
+    no manifest.
+    """
+    own_sink = sink is None
+    if own_sink:
+        from generator_sinks import FileSystemSink
+        sink = FileSystemSink(root)
+    own_manifest = manifest is None and sink.persistent
+    if own_manifest:
+        manifest = Manifest(root)
+    elif not sink.persistent:
+        manifest = None
+    guid_seeds = guid_seeds or {}
+
+    report = WriteReport(folder)
+    generated = set()
+    for name, content in scripts.items():
+        rel_path = f"{folder}/{name}"
+        generated.add(rel_path)
+        changed = _write_if_changed(rel_path, content, sink, manifest)
+        if with_meta:
+            guid = unity_meta.guid_for(sink.existing_path(rel_path), content, guid_seeds.get(rel_path), rel_path)
+            generated.add(rel_path + ".meta")
+            changed |= _write_if_changed(rel_path + ".meta", unity_meta.meta_text(guid), sink, manifest)
+        (report.rewritten if changed else report.skipped).append(name)
+
+    if complete and manifest is not None:
+        for rel_path in sorted(manifest.paths_under(folder)):
+            # Other generated assets (e.g. .asmdef files) are not this pass's to judge
+            if rel_path not in generated and rel_path.endswith((".cs", ".cs.meta")):
+                report.stale.append(rel_path[len(folder) + 1:])
+
+    if own_sink:
+        sink.commit()
+    if own_manifest:
+        manifest.save()
+    return report
@@ -0,0 +1,148 @@
+# Discovery of the generator categories.
+# script.py's scripts_to_create is the registry of what should exist; the
+# script_N.py cells are scanned (without importing them) to find which registry
+# each one fills, which cell creates it and which cells only extend it. Cells
+# are only imported when a category is actually loaded.
+import ast
+import glob
+import importlib
+import os
+import re
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Registry category -> output folder under Unity_Scripts/
+CATEGORY_FOLDERS = {
+    "Core Infrastructure": "Core",
+    "Focus System": "Focus",
+    "Domain Models": "Domain",
+    "ScriptableObjects": "Data",
+    "Services": "Services",
+    "Strategies": "Strategies",
+    "Animation System": "Animation",
+    "UI System": "UI",
+    "Game Management": "Management",
+}
+
+
+class Category:
+    """One registry category and the generator cells that produce it."""
+
+    def __init__(self, name, folder, variable, sources, registered):
+        self.name = name
+        self.folder = folder
+        self.variable = variable
+        # Creating cell first, then the cells that extend its dict, in order
+        self.sources = sources
+        self.registered = registered
+
+    def __repr__(self):
+        return f"Category({self.name!r}, {self.variable}, {[os.path.basename(s) for s in self.sources]})"
+
+
+def _import(module_name, scripts_dir=SCRIPTS_DIR):
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return importlib.import_module(module_name)
+
+
+def load_registry(scripts_dir=SCRIPTS_DIR):
+    """scripts_to_create from script.py."""
+    return _import("script", scripts_dir).scripts_to_create
+
+
+def _cell_number(path):
+    match = re.search(r"script_(\d+)\.py$", path)
+    return int(match.group(1)) if match else 0
+
+
+def _creates_registry(value):
+    if isinstance(value, ast.Dict):
+        return not value.keys
+    return isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == "LazyRegistry"
+
+
+def scan_cell(path):
+    """(registries created, {registry: [entry names assigned]}) for one script_N.py."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    created = []
+    assigned = {}
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and _creates_registry(node.value):
+                created.append(target.id)
+            elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) \
+                    and isinstance(target.slice, ast.Constant):
+                assigned.setdefault(target.value.id, []).append(target.slice.value)
+    return created, assigned
+
+
+def discover(scripts_dir=SCRIPTS_DIR, registry=None):
+    """Categories in registry order, plus registry categories nothing generates."""
+    if registry is None:
+        registry = load_registry(scripts_dir)
+
+    owners = {}
+    contributors = {}
+    entries = {}
+    cells = sorted(glob.glob(os.path.join(scripts_dir, "script_*.py")), key=_cell_number)
+    for path in cells:
+        created, assigned = scan_cell(path)
+        for variable in created:
+            owners[variable] = path
+        for variable, names in assigned.items():
+            entries.setdefault(variable, []).extend(names)
+            if variable not in created:
+                contributors.setdefault(variable, []).append(path)
+
+    for variable, paths in contributors.items():
+        if variable not in owners:
+            raise LookupError(f"{os.path.basename(paths[0])} extends {variable}, which no script creates")
+
+    categories = []
+    unmatched = []
+    for name, registered in registry.items():
+        overlap = {variable: len(set(names) & set(registered)) for variable, names in entries.items()}
+        variable = max(overlap, key=overlap.get, default=None)
+        if variable is None or overlap[variable] == 0:
+            unmatched.append(name)
+            continue
+        sources = [owners[variable]] + contributors.get(variable, [])
+        folder = CATEGORY_FOLDERS.get(name, variable.replace("_scripts", "").capitalize())
+        categories.append(Category(name, folder, variable, sources, list(registered)))
+    return categories, unmatched
+
+
+def _module_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def load_category(category):
+    """The category's LazyRegistry, with every extending cell applied.
+
+    Only the category's own cells are imported (the extending cells import the
+    creating one themselves); nothing is rendered yet.
+    """
+    scripts_dir = os.path.dirname(category.sources[0])
+    registry = getattr(_import(_module_name(category.sources[0]), scripts_dir), category.variable)
+    for path in category.sources[1:]:
+        _import(_module_name(path), scripts_dir)
+    return registry
+
+
+def render_category(category):
+    """name -> C# source for every entry of the category."""
+    return dict(load_category(category).items())
+
+
+def find_category(name_or_folder, scripts_dir=SCRIPTS_DIR):
+    """Category by registry name or output folder, e.g. "Services"."""
+    categories, _ = discover(scripts_dir)
+    for category in categories:
+        if name_or_folder in (category.name, category.folder):
+            return category
+    raise KeyError(name_or_folder)
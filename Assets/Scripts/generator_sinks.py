@@ -0,0 +1,224 @@
+# Output targets for the generator.
+# write_scripts hands every file to a sink instead of opening files itself:
+#
+#   FileSystemSink  the real tree under a root: each file is staged as a temp
+#                   file, and commit() fsyncs the staged files, renames them
+#                   into place and then fsyncs each directory they landed in
+#                   once, so Unity never sees a half-written script and only
+#                   the generator's own files are flushed. generate.py stages
+#                   in its workers and commits the whole run once (detach/adopt)
+#   MemorySink      a dict, for tests and tooling that only need the text
+#   ArchiveSink     a streaming .zip or .tar.gz code drop with fixed timestamps
+#                   and permissions, so the same output gives the same bytes
+#
+# Only the filesystem sink persists between runs, so only it uses the manifest
+# to skip unchanged files.
+import gzip
+import io
+import os
+import tarfile
+import zipfile
+
+from generator_manifest import OUTPUT_FOLDER
+
+# 1980-01-01, the earliest timestamp a zip entry can carry
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+_ARCHIVE_SUFFIXES = (".zip", ".tar.gz", ".tgz")
+
+
+def _fsync(path, flags=os.O_RDWR):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class MemorySink:
+    """rel_path -> text, nothing touches the disk."""
+
+    persistent = False
+
+    def __init__(self):
+        self.files = {}
+
+    def existing_path(self, rel_path):
+        return None
+
+    def write(self, rel_path, content, on_commit=None):
+        self.files[rel_path] = content
+        if on_commit is not None:
+            on_commit()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ArchiveSink:
+    """Streams files into a .zip or .tar.gz; the archive appears (atomically) on close."""
+
+    persistent = False
+
+    def __init__(self, path, prefix=OUTPUT_FOLDER):
+        if not path.endswith(_ARCHIVE_SUFFIXES):
+            raise ValueError(f"{path}: expected one of {', '.join(_ARCHIVE_SUFFIXES)}")
+        self.path = path
+        self.prefix = prefix.strip("/")
+        self.names = set()
+        self._tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_path, "wb")
+        if path.endswith(".zip"):
+            self._zip = zipfile.ZipFile(self._file, "w", zipfile.ZIP_DEFLATED)
+            self._tar = self._gzip = None
+        else:
+            self._zip = None
+            self._gzip = gzip.GzipFile(filename="", fileobj=self._file, mode="wb", mtime=0)
+            self._tar = tarfile.open(fileobj=self._gzip, mode="w", format=tarfile.PAX_FORMAT)
+
+    def existing_path(self, rel_path):
+        return None
+
+    def write(self, rel_path, content, on_commit=None):
+        name = f"{self.prefix}/{rel_path}" if self.prefix else rel_path
+        if name in self.names:
+            # Entries are streamed out as they come, so there is no overwriting one
+            raise ValueError(f"{name} was already written to {self.path}")
+        self.names.add(name)
+        data = content.encode("utf-8")
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, _ZIP_EPOCH)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o644
+            info.mtime = 0
+            self._tar.addfile(info, io.BytesIO(data))
+        if on_commit is not None:
+            on_commit()
+
+    def commit(self):
+        pass
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._zip is not None:
+            self._zip.close()
+        else:
+            self._tar.close()
+            self._gzip.close()
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is not None and self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self._tmp_path)
+            return
+        self.close()
+
+
+class FileSystemSink:
+    """Atomic writes under root, made durable per committed batch."""
+
+    persistent = True
+
+    def __init__(self, root, durable=True):
+        self.root = root
+        self.durable = durable
+        self._pending = []  # (temp path, final path, on_commit)
+        self._dirs = set()
+
+    def existing_path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def write(self, rel_path, content, on_commit=None):
+        path = os.path.join(self.root, rel_path)
+        directory = os.path.dirname(path)
+        if directory not in self._dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._dirs.add(directory)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        self._pending.append((tmp_path, path, on_commit))
+
+    def detach(self):
+        """Hand the staged files over uncommitted, as [(temp path, final path)], for another
+        sink to adopt and commit (a worker staging for its parent).
+
+        on_commit runs now with the staged file's os.stat, which a rename keeps, so what it
+        records about the file holds once the file is in place.
+        """
+        pending, self._pending = self._pending, []
+        for tmp_path, _, on_commit in pending:
+            if on_commit is not None:
+                on_commit(os.stat(tmp_path))
+        return [(tmp_path, path) for tmp_path, path, _ in pending]
+
+    def adopt(self, staged):
+        """Commit files another sink staged and detached along with this sink's own."""
+        self._pending.extend((tmp_path, path, None) for tmp_path, path in staged)
+
+    def commit(self):
+        """Make the staged files durable, move them into place, then make the renames durable."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if self.durable:
+            for tmp_path, _, _ in pending:
+                _fsync(tmp_path)
+        for tmp_path, path, on_commit in pending:
+            os.replace(tmp_path, path)
+            if on_commit is not None:
+                on_commit()
+        # A directory can only be opened (and fsynced) on POSIX
+        if self.durable and hasattr(os, "O_DIRECTORY"):
+            for directory in sorted({os.path.dirname(path) for _, path, _ in pending}):
+                _fsync(directory, os.O_RDONLY | os.O_DIRECTORY)
+
+    def discard(self):
+        for tmp_path, _, _ in self._pending:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        self._pending = []
+
+    def close(self):
+        self.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is not None:
+            self.discard()
+        else:
+            self.close()
+
+
+def make_sink(target, durable=True):
+    """Sink for a command-line target: "memory", an archive path, or a directory."""
+    if target == "memory":
+        return MemorySink()
+    if target.endswith(_ARCHIVE_SUFFIXES):
+        return ArchiveSink(target)
+    return FileSystemSink(target, durable)
@@ -0,0 +1,297 @@
+# Watch mode for the Unity script generator.
+# Tracks the generator cells (inotify on Linux, stat polling elsewhere), and on
+# a save re-renders only the entries whose source text changed: editing
+# BaseProductivityStrategy.cs in script_6.py re-renders and rewrites just that
+# file. Bursts of saves are debounced into one pass and every write is atomic.
+# Entries deleted from a cell have their generated file, .meta and manifest
+# rows removed. A cell that fails to load is reported and retried on its next
+# save; the watcher keeps running.
+#
+#   python generator_watch.py [--out DIR] [--debounce 0.2] [--poll]
+import argparse
+import ast
+import ctypes
+import ctypes.util
+import glob
+import hashlib
+import importlib
+import os
+import select
+import struct
+import sys
+import time
+
+import generate
+import unity_meta
+from generator_manifest import OUTPUT_ROOT, Manifest, write_scripts
+from generator_registry import SCRIPTS_DIR, discover, load_category
+
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_generator_file(name):
+    return name.endswith(".py") and (name == "script.py" or name.startswith("script_"))
+
+
+class PollingWatcher:
+    """Portable fallback: compares mtimes of the generator files."""
+
+    def __init__(self, directory, interval=0.1):
+        self.directory = directory
+        self.interval = interval
+        self._mtimes = self._snapshot()
+
+    def _snapshot(self):
+        mtimes = {}
+        for path in glob.glob(os.path.join(self.directory, "script*.py")):
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+
+    def poll(self, timeout):
+        """Changed paths, waiting up to timeout seconds (None: forever) for one."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            changed = {path for path, mtime in current.items() if self._mtimes.get(path) != mtime}
+            self._mtimes = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify on the scripts folder, through libc."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Editors either write in place or write a temp file and rename it over
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+
+    def poll(self, timeout):
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                offset += length
+                if _is_generator_file(name):
+                    changed.add(os.path.join(self.directory, name))
+
+    def close(self):
+        os.close(self._fd)
+
+
+def make_watcher(directory, polling=False):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory)
+
+
+def _digest(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _entry_name(node):
+    """Registry entry a top-level statement defines, or None."""
+    if isinstance(node, ast.Assign):
+        for target in node.targets:
+            if isinstance(target, ast.Subscript) and isinstance(target.slice, ast.Constant):
+                return target.slice.value
+    elif isinstance(node, ast.FunctionDef):
+        for decorator in node.decorator_list:
+            if isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute) \
+                    and decorator.func.attr == "register" and decorator.args \
+                    and isinstance(decorator.args[0], ast.Constant):
+                return decorator.args[0].value
+    return None
+
+
+def entry_fingerprints(path):
+    """entry name -> hash of the source text that produces it.
+
+    Code outside the entry definitions (spec lists, partials, imports) is
+    folded into every entry of the cell, so editing it re-renders them all.
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    lines = source.splitlines()
+    spans = {}
+    for node in ast.parse(source, path).body:
+        name = _entry_name(node)
+        if name is not None:
+            start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+            spans[name] = (start, node.end_lineno)
+
+    in_entry = set()
+    for start, end in spans.values():
+        in_entry.update(range(start, end + 1))
+    shared = _digest(*(line for number, line in enumerate(lines, 1)
+                       if number not in in_entry and line.strip() and not line.lstrip().startswith("#")))
+    return {name: _digest(shared, "\n".join(lines[start - 1:end])) for name, (start, end) in spans.items()}
+
+
+def category_fingerprints(category):
+    fingerprints = {}
+    for path in category.sources:
+        fingerprints.update(entry_fingerprints(path))
+    return fingerprints
+
+
+def reload_category(category):
+    """Re-execute the category's cells, creating cell first, and return its registry."""
+    for path in category.sources:
+        module = sys.modules.get(os.path.splitext(os.path.basename(path))[0])
+        if module is not None:
+            importlib.reload(module)
+    return load_category(category)
+
+
+class Watcher:
+    """Regenerates the touched entries of each category when its cells change."""
+
+    def __init__(self, root=OUTPUT_ROOT, debounce=0.2, polling=False):
+        self.root = root
+        self.debounce = debounce
+        self.watcher = make_watcher(SCRIPTS_DIR, polling)
+        self.full_pass()
+
+    def full_pass(self):
+        if "script" in sys.modules:
+            importlib.reload(sys.modules["script"])
+        self.categories, _ = discover()
+        self.guid_seeds = unity_meta.checked_in_guids(self.categories, SCRIPTS_DIR)
+        for category in self.categories:
+            reload_category(category)
+        generate.run(self.categories, self.root, jobs=1, guid_seeds=self.guid_seeds)
+        self.fingerprints = {category.name: category_fingerprints(category) for category in self.categories}
+
+    def handle(self, changed_paths):
+        """Regenerate what changed_paths affect; returns (category, written names) pairs."""
+        if any(os.path.basename(path) == "script.py" for path in changed_paths):
+            # The registry itself changed: rediscover everything
+            self.full_pass()
+            return [("registry", ["*"])]
+
+        manifest = Manifest(self.root)
+        results = []
+        try:
+            for category in self.categories:
+                if not any(path in changed_paths for path in category.sources):
+                    continue
+                fingerprints = category_fingerprints(category)
+                previous = self.fingerprints.get(category.name, {})
+                touched = [name for name, fp in fingerprints.items()
+                           if previous.get(name) != fp and name in category.registered]
+                dropped = sorted(name for name in previous if name not in fingerprints and name in category.registered)
+                written = []
+                if touched:
+                    registry = reload_category(category)
+                    # Only the touched entries are rendered; the rest stay lazy
+                    scripts = {name: registry[name] for name in touched if name in registry}
+                    report = write_scripts(category.folder, scripts, self.root, manifest, self.guid_seeds,
+                                           complete=False)
+                    written = report.rewritten
+                removed = self.remove_outputs(category.folder, dropped, manifest)
+                # Recorded only now: after a failed reload or render the entries still differ from the
+                # stored fingerprints, so the save that fixes the cell regenerates them
+                self.fingerprints[category.name] = fingerprints
+                if touched or removed:
+                    results.append((category.name, written + [f"{name} (removed)" for name in removed]))
+        finally:
+            manifest.save()
+        return results
+
+    def remove_outputs(self, folder, names, manifest):
+        """Delete the generated files (and .meta) of entries no cell defines any more; returns the names."""
+        removed = []
+        for name in names:
+            rel_paths = [path for path in (f"{folder}/{name}", f"{folder}/{name}.meta") if path in manifest.entries]
+            for rel_path in rel_paths:
+                try:
+                    os.remove(os.path.join(self.root, rel_path))
+                except FileNotFoundError:
+                    pass
+                manifest.forget(rel_path)
+            if rel_paths:
+                removed.append(name)
+        return removed
+
+    def run(self):
+        print(f"watching {SCRIPTS_DIR} ({type(self.watcher).__name__}), writing to {self.root}")
+        try:
+            while True:
+                changed = self.watcher.poll(None)
+                started = time.perf_counter()
+                # Debounce: keep collecting until the burst of saves goes quiet
+                while True:
+                    more = self.watcher.poll(self.debounce)
+                    if not more:
+                        break
+                    changed |= more
+                if not changed:
+                    continue
+                started_render = time.perf_counter()
+                try:
+                    results = self.handle(changed)
+                except Exception as exc:
+                    # A half-saved cell can fail in any way; keep watching for the save that fixes it
+                    print(f"! {exc.__class__.__name__}: {exc} (waiting for the next save)")
+                    continue
+                elapsed = (time.perf_counter() - started_render) * 1000
+                waited = (started_render - started) * 1000
+                for name, written in results:
+                    print(f"{name}: {', '.join(written) or 'no change'}")
+                if not results:
+                    print("no generated entry changed")
+                print(f"  regenerated in {elapsed:.1f} ms (after {waited:.0f} ms debounce)")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.watcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate Unity scripts as the generator cells change")
+    parser.add_argument("--out", default=OUTPUT_ROOT, help="output root (default: %(default)s)")
+    parser.add_argument("--debounce", type=float, default=0.2, help="quiet period in seconds (default: %(default)s)")
+    parser.add_argument("--poll", action="store_true", help="use stat polling instead of inotify")
+    args = parser.parse_args(argv)
+    Watcher(args.out, args.debounce, args.poll).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+# Headless simulator of the employee/task tick loop.
+# Mirrors Domain/Employee.cs and Domain/TaskInstance.cs step for step, in
+# float32 and in the same operation order as the C#:
+#
+#   Tick(dt):  if working: task.Advance(dt * Stats.productivity)
+#                  productivity = base * (1 + (level - 1) * 0.1) * (morale / 100)
+#                  Advance: remaining = max(0, remaining - amount)
+#                  complete (remaining <= 0): state = Celebrating, GainExperience(10)
+#              morale = min(100, morale + dt * 2) while below 100
+#   GainExperience(xp): experience += xp; one level-up at most, when
+#              experience >= level * 100, keeping the remainder
+#
+# Employees are struct-of-arrays NumPy columns, so one step over a million
+# employees is a handful of vectorized passes. Nothing in the C# hands out new
+# work (TaskService.GetNextTask is never called from a tick), so the optional
+# auto-assign step gives every employee without a task a fresh instance of its
+# last task definition, as TaskService's auto-requeue would.
+#
+#   python headless_sim.py --employees 1000000 --steps 600 --auto-assign
+#   python headless_sim.py --check              # vectorized vs scalar reference
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+# EmployeeState
+IDLE, WORKING, CELEBRATING, BREAK = 0, 1, 2, 3
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data")
+
+_F = np.float32
+_LEVEL_STEP = _F(0.1)
+_HUNDRED = _F(100.0)
+_MORALE_RATE = _F(2.0)
+_TASK_XP = _F(10.0)
+_SCALAR_FIELD = re.compile(r"^  (\w+): (.*)$", re.M)
+
+
+def read_asset_fields(path):
+    """Top-level scalar fields of a ScriptableObject .asset (nested blocks are skipped)."""
+    with open(path, encoding="utf-8") as f:
+        return {key: value.strip() for key, value in _SCALAR_FIELD.findall(f.read())}
+
+
+def load_task_durations(data_dir=DATA_DIR):
+    """name -> baseDuration for every TaskDefinitionSO asset under data_dir/Tasks."""
+    durations = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "Tasks", "*.asset"))):
+        fields = read_asset_fields(path)
+        if "baseDuration" in fields:
+            durations[fields.get("m_Name") or os.path.basename(path)] = float(fields["baseDuration"])
+    return durations
+
+
+class EmployeeColumns:
+    """Every employee's Employee/TaskInstance state as parallel NumPy columns."""
+
+    def __init__(self, count, base_productivity=1.0, morale=100.0):
+        self.count = count
+        self.level = np.ones(count, _F)
+        self.morale = np.full(count, morale, _F)
+        self.experience = np.zeros(count, _F)
+        # Archetype.baseStats.productivity (EmployeeArchetypeSO default: 1)
+        self.base_productivity = np.full(count, base_productivity, _F)
+        self.state = np.full(count, IDLE, np.uint8)
+        # CurrentTask != null, and the task's fields when it is
+        self.has_task = np.zeros(count, bool)
+        self.task_definition = np.zeros(count, np.int32)
+        self.remaining = np.zeros(count, _F)
+        self.total_duration = np.zeros(count, _F)
+        self.completed = np.zeros(count, np.int64)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Columns over existing arrays (name -> array, one row per employee), e.g. shared memory."""
+        columns = cls.__new__(cls)
+        columns.count = len(next(iter(arrays.values())))
+        for name, array in arrays.items():
+            setattr(columns, name, array)
+        return columns
+
+    def arrays(self):
+        """name -> column."""
+        return {name: value for name, value in vars(self).items() if isinstance(value, np.ndarray)}
+
+
+class HeadlessSim:
+    """Vectorized Employee.Tick over EmployeeColumns."""
+
+    def __init__(self, employees, task_durations):
+        self.employees = employees
+        # Task definition index -> TaskDefinitionSO.baseDuration
+        self.task_durations = np.asarray(task_durations, _F)
+        count = employees.count
+        self._a = np.empty(count, _F)
+        self._b = np.empty(count, _F)
+        self._working = np.empty(count, bool)
+        self._mask = np.empty(count, bool)
+        self.time = 0.0
+
+    def assign(self, mask, definition):
+        """Employee.AssignTask(new TaskInstance(definition)) for every employee in mask."""
+        e = self.employees
+        e.task_definition[mask] = definition
+        duration = self.task_durations[e.task_definition[mask]]
+        e.total_duration[mask] = duration
+        e.remaining[mask] = duration
+        e.has_task[mask] = True
+        e.state[mask] = WORKING
+
+    def auto_assign(self):
+        """Give every employee without a task a new instance of its last definition."""
+        e = self.employees
+        free = ~e.has_task
+        if free.any():
+            self.assign(free, e.task_definition[free])
+
+    def step(self, dt, auto_assign=False):
+        """One Employee.Tick(dt) for every employee; returns how many tasks completed."""
+        e = self.employees
+        dt = _F(dt)
+        a, b, working, mask = self._a, self._b, self._working, self._mask
+
+        np.equal(e.state, WORKING, out=working)
+        working &= e.has_task
+
+        # Stats.productivity = base * (1 + (level - 1) * 0.1) * (morale / 100)
+        np.subtract(e.level, _F(1.0), out=a)
+        a *= _LEVEL_STEP
+        a += _F(1.0)
+        np.multiply(e.base_productivity, a, out=a)
+        np.divide(e.morale, _HUNDRED, out=b)
+        a *= b
+        # TaskInstance.Advance(dt * productivity)
+        np.multiply(dt, a, out=a)
+        np.subtract(e.remaining, a, out=a)
+        np.maximum(a, _F(0.0), out=a)
+        np.copyto(e.remaining, a, where=working)
+
+        # CompleteTask(): Celebrating, GainExperience(10)
+        np.less_equal(e.remaining, _F(0.0), out=mask)
+        mask &= working
+        completed = int(np.count_nonzero(mask))
+        if completed:
+            e.has_task[mask] = False
+            e.state[mask] = CELEBRATING
+            e.completed += mask
+            np.add(e.experience, _TASK_XP, out=e.experience, where=mask)
+            np.multiply(e.level, _HUNDRED, out=b)
+            np.greater_equal(e.experience, b, out=working)
+            working &= mask
+            np.subtract(e.experience, b, out=e.experience, where=working)
+            np.add(e.level, _F(1.0), out=e.level, where=working)
+
+        # Morale recovers at 2/s up to 100
+        np.multiply(dt, _MORALE_RATE, out=b)
+        np.add(e.morale, b, out=b)
+        np.minimum(b, _HUNDRED, out=b)
+        np.less(e.morale, _HUNDRED, out=mask)
+        np.copyto(e.morale, b, where=mask)
+
+        if auto_assign:
+            self.auto_assign()
+        self.time += float(dt)
+        return completed
+
+    def run(self, steps, dt, auto_assign=False):
+        return sum(self.step(dt, auto_assign) for _ in range(steps))
+
+
+class ScalarEmployee:
+    """Line-by-line transcription of Employee.Tick, kept as the reference the columns are checked against."""
+
+    def __init__(self, base_productivity=1.0, morale=100.0):
+        self.level = _F(1.0)
+        self.morale = _F(morale)
+        self.experience = _F(0.0)
+        self.base_productivity = _F(base_productivity)
+        self.state = IDLE
+        self.remaining = None
+        self.definition = 0
+        self.completed = 0
+
+    def assign(self, definition, duration):
+        self.definition = definition
+        self.remaining = _F(duration)
+        self.state = WORKING
+
+    def productivity(self):
+        level_multiplier = _F(1.0) + (self.level - _F(1.0)) * _LEVEL_STEP
+        morale_multiplier = self.morale / _HUNDRED
+        return self.base_productivity * level_multiplier * morale_multiplier
+
+    def tick(self, dt):
+        dt = _F(dt)
+        if self.remaining is not None and self.state == WORKING:
+            amount = dt * self.productivity()
+            if self.remaining > _F(0.0):
+                self.remaining = max(_F(0.0), self.remaining - amount)
+            if self.remaining <= _F(0.0):
+                self.remaining = None
+                self.state = CELEBRATING
+                self.completed += 1
+                self.gain_experience(_TASK_XP)
+        if self.morale < _HUNDRED:
+            self.morale = min(_HUNDRED, self.morale + dt * _MORALE_RATE)
+
+    def gain_experience(self, amount):
+        self.experience = self.experience + amount
+        next_level_xp = self.level * _HUNDRED
+        if self.experience >= next_level_xp:
+            self.level = self.level + _F(1.0)
+            self.experience = self.experience - next_level_xp
+
+
+def check(count=200, steps=3000, dt=0.1, seed=1):
+    """Compare the vectorized step with ScalarEmployee; returns the number of mismatching employees."""
+    rng = np.random.default_rng(seed)
+    durations = rng.uniform(0.5, 40.0, 4).astype(_F)
+    columns = EmployeeColumns(count)
+    columns.base_productivity[:] = rng.uniform(0.5, 3.0, count)
+    columns.morale[:] = rng.uniform(0.0, 100.0, count)
+    sim = HeadlessSim(columns, durations)
+    definitions = rng.integers(0, len(durations), count)
+    for definition in range(len(durations)):
+        sim.assign(definitions == definition, definition)
+
+    reference = []
+    for i in range(count):
+        employee = ScalarEmployee(columns.base_productivity[i], columns.morale[i])
+        employee.assign(int(definitions[i]), durations[definitions[i]])
+        reference.append(employee)
+
+    for _ in range(steps):
+        sim.step(dt, auto_assign=True)
+        for employee in reference:
+            employee.tick(dt)
+            if employee.remaining is None:
+                employee.assign(employee.definition, durations[employee.definition])
+
+    mismatches = 0
+    for i, employee in enumerate(reference):
+        if (columns.level[i], columns.experience[i], columns.morale[i], columns.completed[i],
+                columns.remaining[i]) != (employee.level, employee.experience, employee.morale,
+                                          employee.completed, employee.remaining):
+            mismatches += 1
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless employee/task simulation")
+    parser.add_argument("--employees", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=0.1, help="seconds per step (default: %(default)s)")
+    parser.add_argument("--auto-assign", action="store_true",
+                        help="hand every free employee a new instance of its last task")
+    parser.add_argument("--morale", type=float, default=100.0, help="starting morale (default: %(default)s)")
+    parser.add_argument("--check", action="store_true", help="verify against the scalar reference and exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        mismatches = check()
+        print("vectorized step matches the scalar reference" if not mismatches
+              else f"{mismatches} employees diverge from the scalar reference")
+        return 1 if mismatches else 0
+
+    durations = load_task_durations() or {"default": 30.0}
+    sim = HeadlessSim(EmployeeColumns(args.employees, morale=args.morale), list(durations.values()))
+    sim.assign(np.ones(args.employees, bool), 0)
+
+    start = time.perf_counter()
+    completed = sim.run(args.steps, args.dt, args.auto_assign)
+    elapsed = time.perf_counter() - start
+    e = sim.employees
+    print(f"{args.employees} employees x {args.steps} steps ({sim.time:.0f} s simulated) in {elapsed:.2f} s: "
+          f"{args.employees * args.steps / elapsed / 1e6:.1f} M employee-steps/s")
+    print(f"tasks completed {completed}, mean level {float(e.level.mean()):.3f}, "
+          f"max level {float(e.level.max()):.0f}, mean morale {float(e.morale.mean()):.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# Name -> render function registry used by every generator category.
+# Importing a script_N.py only registers how to produce each file; nothing is
+# rendered or written until an entry is actually read, so tooling can inspect
+# e.g. service_scripts["TaskService.cs"] without paying for the rest.
+from collections.abc import MutableMapping
+
+
+class LazyRegistry(MutableMapping):
+    """Mapping of file name -> generated C# source, rendered on first access.
+
+    Assigning a string stores it as-is; assigning a callable (or decorating one
+    with register) stores a render function that runs once, when first read.
+    """
+
+    def __init__(self):
+        self._renderers = {}
+        self._rendered = {}
+
+    def register(self, name):
+        def decorator(render):
+            self[name] = render
+            return render
+        return decorator
+
+    def renderer(self, name):
+        return self._renderers[name]
+
+    def is_rendered(self, name):
+        return name in self._rendered
+
+    def invalidate(self, name=None):
+        """Forget rendered output (all of it, or one entry) so it renders again."""
+        if name is None:
+            self._rendered.clear()
+        else:
+            self._rendered.pop(name, None)
+
+    def __getitem__(self, name):
+        try:
+            return self._rendered[name]
+        except KeyError:
+            pass
+        content = self._renderers[name]()
+        self._rendered[name] = content
+        return content
+
+    def __setitem__(self, name, value):
+        if callable(value):
+            self._renderers[name] = value
+            self._rendered.pop(name, None)
+        else:
+            self._renderers[name] = lambda: value
+            self._rendered[name] = value
+
+    def __delitem__(self, name):
+        del self._renderers[name]
+        self._rendered.pop(name, None)
+
+    def __iter__(self):
+        return iter(self._renderers)
+
+    def __len__(self):
+        return len(self._renderers)
+
+    def __contains__(self, name):
+        return name in self._renderers
+
+    def __repr__(self):
+        return f"LazyRegistry({list(self._renderers)})"
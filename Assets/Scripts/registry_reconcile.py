@@ -0,0 +1,267 @@
+# Reconciles script.py's registry with what the generator cells produce and
+# with the checked-in scripts, in one pass: every registered name is looked up
+# in its category's LazyRegistry (nothing is rendered) and in the on-disk
+# index, and every on-disk type declaration is collected with the validator's
+# tokenizer. Registered files that no cell produces can then be stubbed in bulk
+# into one generator cell (script_N.py, created or extended), following the
+# existing patterns: ScriptableObjects with CreateAssetMenu, service interfaces,
+# and MonoBehaviour services implementing ISaveable with an Initialize(...),
+# like the generated EconomyService: no Singleton<T> (checked-in Core only) and
+# no SaveService registration, so the generated tree compiles on its own.
+# Stubs whose type is already declared on disk (SaveService lives in
+# EmployeeService.cs) are skipped.
+#
+#   python registry_reconcile.py                # report
+#   python registry_reconcile.py --write-stubs  # add stubs for the gaps to the stub cell
+import argparse
+import ast
+import glob
+import os
+import re
+import sys
+import time
+
+from csharp_validator import analyze
+from generator_drift import index_by_name, index_checked_in, locate
+from generator_registry import SCRIPTS_DIR, discover, load_category, load_registry
+
+STUB_MARKER = "# Stubs for registered scripts that no other cell generates (registry_reconcile.py)"
+NAMESPACE_OVERRIDES = {"Management": "FocusFounder.Core"}
+
+
+def _words(name):
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", name)
+
+
+def namespace_for(folder):
+    return NAMESPACE_OVERRIDES.get(folder, f"FocusFounder.{folder}")
+
+
+def declared_on_disk(repo_dir=SCRIPTS_DIR):
+    """type name -> checked-in file declaring it, for every top-level type on disk."""
+    declared = {}
+    for rel_path, path in sorted(index_checked_in(repo_dir).items()):
+        with open(path, encoding="utf-8-sig") as f:
+            for _, name, _, _, _ in analyze(f.read())["types"]:
+                if "." not in name:
+                    declared.setdefault(name, rel_path)
+    return declared
+
+
+class Entry:
+    """One registered file and where it exists."""
+
+    def __init__(self, category, folder, name, generated, checked_in, declared_in):
+        self.category = category
+        self.folder = folder
+        self.name = name
+        self.generated = generated
+        self.checked_in = checked_in
+        # File on disk that declares the type this entry is named after
+        self.declared_in = declared_in
+
+    @property
+    def type_name(self):
+        return os.path.splitext(self.name)[0]
+
+    @property
+    def status(self):
+        if self.generated:
+            return "ok" if self.checked_in else "not checked in"
+        if self.checked_in:
+            return "checked in only"
+        if self.declared_in:
+            return "declared elsewhere"
+        return "missing"
+
+
+def reconcile(scripts_dir=SCRIPTS_DIR):
+    """(categories, entries, unregistered (folder, name) pairs, unmatched registry categories)."""
+    registry = load_registry(scripts_dir)
+    categories, unmatched = discover(scripts_dir, registry)
+    index = index_checked_in(scripts_dir)
+    by_name = index_by_name(index)
+    declared = declared_on_disk(scripts_dir)
+
+    entries = []
+    unregistered = []
+    for category in categories:
+        # Keys only; the LazyRegistry renders nothing here
+        produced = set(load_category(category))
+        for name in category.registered:
+            entries.append(Entry(category.name, category.folder, name, name in produced,
+                                 locate(category.folder, name, index, by_name),
+                                 declared.get(os.path.splitext(name)[0])))
+        unregistered += [(category.folder, name) for name in sorted(produced - set(category.registered))]
+    return categories, entries, unregistered, unmatched
+
+
+def stub_source(folder, name):
+    """Compile-ready C# skeleton for a registered file, in the repo's patterns."""
+    type_name = os.path.splitext(name)[0]
+    namespace = namespace_for(folder)
+    if type_name.endswith("SO"):
+        base = type_name[:-2]
+        short = base[:-len("Definition")] if base.endswith("Definition") else base
+        return f'''using UnityEngine;
+
+namespace {namespace}
+{{
+    [CreateAssetMenu(fileName = "{short}_", menuName = "Focus Founder/{_words(base)}")]
+    public class {type_name} : ScriptableObject
+    {{
+        [Header("Identity")]
+        public string id;
+        public string displayName;
+        public string description;
+    }}
+}}'''
+    if re.match(r"I[A-Z]", type_name):
+        return f'''namespace {namespace}
+{{
+    /// <summary>
+    /// {_words(type_name[1:])} contract (stub)
+    /// </summary>
+    public interface {type_name}
+    {{
+    }}
+}}'''
+    if type_name.endswith("Service"):
+        key = type_name[:-len("Service")]
+        return f'''using UnityEngine;
+
+namespace {namespace}
+{{
+    using Core;
+
+    /// <summary>
+    /// {_words(type_name)} (stub)
+    /// </summary>
+    public class {type_name} : MonoBehaviour, I{type_name}, ISaveable
+    {{
+        public string SaveKey => "{key}";
+
+        public object CaptureState()
+        {{
+            return null;
+        }}
+
+        public void RestoreState(object state)
+        {{
+        }}
+    }}
+}}'''
+    return f'''namespace {namespace}
+{{
+    public class {type_name}
+    {{
+    }}
+}}'''
+
+
+def find_stub_cell(scripts_dir=SCRIPTS_DIR):
+    """Path of the stub cell: the existing one, else the next free script_N.py."""
+    cells = glob.glob(os.path.join(scripts_dir, "script_*.py"))
+    for path in cells:
+        with open(path, encoding="utf-8") as f:
+            if f.readline().rstrip("\n") == STUB_MARKER:
+                return path
+    numbers = [int(m.group(1)) for m in (re.search(r"script_(\d+)\.py$", p) for p in cells) if m]
+    return os.path.join(scripts_dir, f"script_{max(numbers, default=0) + 1}.py")
+
+
+def _existing_stubs(path):
+    """name -> (registry variable, assignment source) already in the stub cell."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    stubs = {}
+    for node in ast.parse(source, path).body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Subscript):
+            target = node.targets[0]
+            stubs[target.slice.value] = (target.value.id, ast.get_source_segment(source, node))
+    return stubs
+
+
+def stub_cell_source(stubs, categories):
+    """Text of the stub cell for stubs: name -> (registry variable, assignment source)."""
+    by_variable = {category.variable: category for category in categories}
+    variables = []
+    for variable, _ in stubs.values():
+        if variable not in variables:
+            variables.append(variable)
+    lines = [STUB_MARKER, "# Replace each stub with a real implementation in its category's cell."]
+    for variable in variables:
+        owner = os.path.splitext(os.path.basename(by_variable[variable].sources[0]))[0]
+        lines.append(f"from {owner} import {variable}")
+    for name, (_, assignment) in stubs.items():
+        lines += ["", f"# {name}", assignment]
+    lines += ["", 'if __name__ == "__main__":', "    from generator_manifest import write_scripts"]
+    for variable in variables:
+        lines.append(f'    print(write_scripts("{by_variable[variable].folder}", {variable}))')
+    return "\n".join(lines) + "\n"
+
+
+def write_stubs(categories, entries, scripts_dir=SCRIPTS_DIR):
+    """Add stubs for every missing entry to the stub cell; returns (cell path, added, skipped)."""
+    path = find_stub_cell(scripts_dir)
+    stubs = _existing_stubs(path)
+    by_name = {category.name: category for category in categories}
+    added = []
+    skipped = []
+    for entry in entries:
+        if entry.generated or entry.name in stubs:
+            continue
+        if entry.declared_in:
+            skipped.append((entry, f"{entry.type_name} is declared in {entry.declared_in}"))
+            continue
+        variable = by_name[entry.category].variable
+        content = stub_source(entry.folder, entry.name)
+        stubs[entry.name] = (variable, f'{variable}["{entry.name}"] = \'\'\'{content}\'\'\'')
+        added.append(entry)
+    if added:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(stub_cell_source(stubs, categories))
+    return path, added, skipped
+
+
+def print_report(entries, unregistered, unmatched):
+    width = max(len(f"{e.folder}/{e.name}") for e in entries)
+    for entry in entries:
+        where = entry.checked_in or entry.declared_in or ""
+        print(f"{entry.folder + '/' + entry.name:<{width}}  {entry.status:<18}  {where}")
+    for folder, name in unregistered:
+        print(f"{folder + '/' + name:<{width}}  {'not registered':<18}")
+    for name in unmatched:
+        print(f"registry category {name!r} has no generator cell")
+    counts = {}
+    for entry in entries:
+        counts[entry.status] = counts.get(entry.status, 0) + 1
+    print(", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff the script registry against the cells and the checked-in scripts")
+    parser.add_argument("--write-stubs", action="store_true",
+                        help="add compile-ready stubs for missing entries to the stub cell")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    categories, entries, unregistered, unmatched = reconcile()
+    print_report(entries, unregistered, unmatched)
+    print(f"reconciled in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if args.write_stubs:
+        path, added, skipped = write_stubs(categories, entries)
+        for entry, reason in skipped:
+            print(f"  skipped {entry.folder}/{entry.name}: {reason}")
+        for entry in added:
+            print(f"  + {entry.folder}/{entry.name}")
+        if added:
+            print(f"wrote {len(added)} stubs to {os.path.basename(path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
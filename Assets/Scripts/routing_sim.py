@@ -0,0 +1,321 @@
+# Office throughput under the TaskRouter policies (fifo, priority,
+# skill-aware), simulated event by event.
+#
+# Routing mirrors Services/TaskRouter.cs. Queued tasks sit in one heap per
+# requirement bucket (category, minEmployeeLevel, requiredSkills). An idle
+# employee peeks the head of every bucket it is eligible for and pops the
+# best one:
+#   fifo         the oldest head
+#   priority     the head with the most reward per second at its minimum level
+#   skill-aware  priority times the archetype's categoryMultiplier
+# An employee is eligible when its level reaches minEmployeeLevel, the
+# category is among its archetype's allowedTaskCategories (all when empty),
+# and every required skill is the archetype's id or an allowed category.
+#
+# Employees follow the headless rules at full morale: a task takes
+# baseDuration / (base * (1 + (level - 1) * 0.1)) seconds, and a level-up
+# comes every 10 * level tasks. A completed task earns what
+# BaseYieldStrategy.ComputeYield pays (balance_sweep.task_reward). The category multiplier only weighs skill-aware
+# routing's choice: ComputeYield does not read it, so a specialist earns no
+# more than anyone else on the same task. Completion requeues the same
+# definition, as TaskService.CompleteTask does; with --arrivals a Poisson
+# stream of new tasks replaces that requeueing.
+#
+# Content comes from the TaskDefinitionSO and EmployeeArchetypeSO assets, or a
+# seeded synthetic office (--synthetic) while there are too few of them.
+#
+#   python routing_sim.py --synthetic --employees 12 --hours 8
+#   python routing_sim.py --synthetic --backlog 1 --arrivals 600 --policy fifo skill-aware
+import argparse
+import glob
+import heapq
+import os
+import re
+import sys
+
+import numpy as np
+
+from balance_sweep import load_definitions, task_reward
+from generator_registry import SCRIPTS_DIR
+from headless_sim import DATA_DIR, read_asset_fields
+from unity_meta import read_guid
+
+POLICIES = ("fifo", "priority", "skill-aware")
+CATEGORIES = ("Development", "Marketing", "Operations", "Sales", "Support", "Research")
+LEVEL_STEP = 0.1
+TASKS_PER_LEVEL = 10  # level * 100 XP at 10 XP per task
+_LIST_FIELD = r"^  {name}:(?: \[\])?\n((?:  - .*\n)*)"
+_BASE_STATS = re.compile(r"^  baseStats:\n((?:    \w+: .*\n)+)", re.M)
+
+
+def _list_field(text, name):
+    match = re.search(_LIST_FIELD.format(name=name), text, re.M)
+    return re.findall(r"^  - (.+)$", match.group(1), re.M) if match else []
+
+
+def load_routing_definitions(data_dir=DATA_DIR):
+    """load_definitions() plus each task's category, minEmployeeLevel and requiredSkills."""
+    definitions = {d["name"]: d for d in load_definitions(data_dir)}
+    for path in sorted(glob.glob(os.path.join(data_dir, "Tasks", "*.asset"))):
+        fields = read_asset_fields(path)
+        definition = definitions.get(fields.get("m_Name") or os.path.basename(path))
+        if definition is None:
+            continue
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        definition["category"] = int(fields.get("category", 0))
+        definition["min_level"] = float(fields.get("minEmployeeLevel", 1))
+        definition["skills"] = tuple(_list_field(text, "requiredSkills"))
+    return list(definitions.values())
+
+
+def load_archetypes(data_dir=DATA_DIR, scripts_dir=SCRIPTS_DIR):
+    """Every EmployeeArchetypeSO asset under data_dir."""
+    guid = read_guid(os.path.join(scripts_dir, "Data", "EmployeeArchetypeSO.cs.meta"))
+    archetypes = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "**", "*.asset"), recursive=True)):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if not guid or f"guid: {guid}" not in text:
+            continue
+        fields = read_asset_fields(path)
+        stats = dict(re.findall(r"(\w+): (\S+)", _BASE_STATS.search(text).group(1))) \
+            if _BASE_STATS.search(text) else {}
+        archetypes.append({
+            "id": fields.get("id") or fields.get("m_Name", "").lower().replace(" ", "_"),
+            "productivity": float(stats.get("productivity", 1)),
+            "quality": float(stats.get("quality", 1)),
+            "allowed": _list_field(text, "allowedTaskCategories"),
+            "multipliers": [float(value) for value in _list_field(text, "categoryMultipliers")],
+        })
+    return archetypes
+
+
+def synthetic_office(seed=0):
+    """(definitions, archetypes): three tiers of tasks per category and a few specialists."""
+    rng = np.random.default_rng(seed)
+    definitions = []
+    for category, name in enumerate(CATEGORIES):
+        for tier, min_level in enumerate((1.0, 3.0, 6.0)):
+            reward = [rng.uniform(2, 6) * (1 + tier), rng.uniform(0, 1) * tier, 0.0]
+            if name == "Research":
+                reward = reward[1:2] + reward[:1] + [0.0]
+            definitions.append({
+                "name": f"{name}_{tier + 1}",
+                "base_duration": float(rng.uniform(20, 60) * (1 + 0.5 * tier)),
+                "variation": 0.2,
+                "reward": reward,
+                "difficulty": [(1.0, 1.0), (10.0, 1.0 + 0.1 * tier)],
+                "category": category,
+                "min_level": min_level,
+                "skills": (name,) if tier == 2 else (),
+            })
+    archetypes = [
+        {"id": "developer", "productivity": 1.0, "quality": 1.0, "allowed": ["Development", "Research"],
+         "multipliers": [1.5, 1.1]},
+        {"id": "marketer", "productivity": 1.0, "quality": 1.0, "allowed": ["Marketing", "Sales"],
+         "multipliers": [1.4, 1.2]},
+        {"id": "operator", "productivity": 1.1, "quality": 1.0, "allowed": ["Operations", "Support"],
+         "multipliers": [1.3, 1.0]},
+        {"id": "generalist", "productivity": 0.9, "quality": 1.0, "allowed": [], "multipliers": []},
+    ]
+    return definitions, archetypes
+
+
+def _affinity(archetype):
+    """Category multipliers by TaskCategory, 0 where the archetype may not work (TaskRouter.GetAffinity)."""
+    if not archetype["allowed"]:
+        return [1.0] * len(CATEGORIES)
+    affinity = [0.0] * len(CATEGORIES)
+    lower = [c.lower() for c in CATEGORIES]
+    for i, name in enumerate(archetype["allowed"]):
+        if name.lower() in lower:
+            multipliers = archetype["multipliers"]
+            affinity[lower.index(name.lower())] = multipliers[i] if i < len(multipliers) else 1.0
+    return affinity
+
+
+def _has_skills(archetype, skills):
+    known = {archetype["id"].lower()} | {c.lower() for c in archetype["allowed"]}
+    return all(skill.lower() in known for skill in skills)
+
+
+def _difficulty(definition, level):
+    return float(np.interp(level, *zip(*definition["difficulty"])))
+
+
+def reward_rate(definition):
+    """TaskRouter.RewardRate: reward per second of baseDuration at the task's minimum level."""
+    level = max(1.0, definition["min_level"])
+    return sum(definition["reward"]) * _difficulty(definition, level) / max(1.0, definition["base_duration"])
+
+
+class Router:
+    """Services/TaskRouter.cs: a heap per requirement bucket, peek every eligible head, pop the best."""
+
+    def __init__(self, policy, definitions, archetypes):
+        self.policy = policy
+        self.sequence = 0
+        self.count = 0
+        self.buckets = []
+        bucket_of = {}
+        self.bucket = []
+        for definition in definitions:
+            key = (definition["category"], definition["min_level"], definition["skills"])
+            if key not in bucket_of:
+                bucket_of[key] = len(self.buckets)
+                self.buckets.append([])
+            self.bucket.append(bucket_of[key])
+        keys = sorted(bucket_of, key=bucket_of.get)
+        self.min_level = [key[1] for key in keys]
+        self.values = [reward_rate(d) for d in definitions]
+        # multiplier[archetype][bucket], 0 where the archetype may not work
+        self.multiplier = []
+        for archetype in archetypes:
+            affinity = _affinity(archetype)
+            self.multiplier.append([affinity[category] if _has_skills(archetype, skills) else 0.0
+                                    for category, _, skills in keys])
+
+    def push(self, definition, queued_at):
+        key = self.sequence if self.policy == "fifo" else -self.values[definition]
+        heapq.heappush(self.buckets[self.bucket[definition]], (key, self.sequence, definition, queued_at))
+        self.sequence += 1
+        self.count += 1
+
+    def pop(self, archetype, level):
+        """(definition, queued at) of the task the employee takes, or None."""
+        best, best_score, best_sequence = None, 0.0, 0
+        multipliers = self.multiplier[archetype]
+        for b, heap in enumerate(self.buckets):
+            multiplier = multipliers[b]
+            if not heap or multiplier <= 0.0 or level < self.min_level[b]:
+                continue
+            _, sequence, definition, _ = heap[0]
+            if self.policy == "fifo":
+                score = -sequence
+            elif self.policy == "skill-aware":
+                score = self.values[definition] * multiplier
+            else:
+                score = self.values[definition]
+            if best is None or score > best_score or (score == best_score and sequence < best_sequence):
+                best, best_score, best_sequence = b, score, sequence
+        if best is None:
+            return None
+        _, _, definition, queued_at = heapq.heappop(self.buckets[best])
+        self.count -= 1
+        return definition, queued_at
+
+
+def simulate(policy, definitions, archetypes, employees, hours, backlog=2, arrivals=0.0, seed=0):
+    """Run one office for hours; returns the summary dict of the run."""
+    rng = np.random.default_rng(seed)
+    router = Router(policy, definitions, archetypes)
+    horizon = hours * 3600.0
+    archetype_of = [i % len(archetypes) for i in range(employees)]
+    level = [1.0] * employees
+    done = [0] * employees
+    earned = np.zeros(3)
+    waits, tasks, busy_seconds = [], 0, 0.0
+    events = []  # (time, order, kind, who)
+    order = 0
+
+    for _ in range(backlog):
+        for d in range(len(definitions)):
+            router.push(d, 0.0)
+    if arrivals > 0:
+        events.append((rng.exponential(3600.0 / arrivals), order, "arrive", -1))
+        order += 1
+
+    idle = []
+
+    def start(who, now):
+        nonlocal order
+        picked = router.pop(archetype_of[who], level[who])
+        if picked is None:
+            idle.append(who)
+            return
+        definition, queued_at = picked
+        waits.append(now - queued_at)
+        rate = archetypes[archetype_of[who]]["productivity"] * (1.0 + (level[who] - 1.0) * LEVEL_STEP)
+        heapq.heappush(events, (now + definitions[definition]["base_duration"] / rate, order, "complete",
+                                (who, definition, now)))
+        order += 1
+
+    for who in range(employees):
+        start(who, 0.0)
+
+    while events and events[0][0] <= horizon:
+        now, _, kind, payload = heapq.heappop(events)
+        if kind == "arrive":
+            router.push(int(rng.integers(len(definitions))), now)
+            heapq.heappush(events, (now + rng.exponential(3600.0 / arrivals), order, "arrive", -1))
+            order += 1
+        else:
+            who, definition, started = payload
+            earned += task_reward(definitions[definition], level[who], archetypes[archetype_of[who]]["quality"])
+            tasks += 1
+            busy_seconds += now - started
+            done[who] += 1
+            if done[who] >= TASKS_PER_LEVEL * level[who]:
+                done[who] = 0
+                level[who] += 1.0
+            if arrivals <= 0:
+                router.push(definition, now)
+            start(who, now)
+        # New work may suit employees that found nothing eligible
+        waiting, idle[:] = idle[:], []
+        for who in waiting:
+            start(who, now)
+
+    # Tasks still in progress at the horizon count towards busy time
+    busy_seconds += sum(horizon - payload[2] for _, _, kind, payload in events if kind == "complete")
+    waits = np.asarray(waits) if waits else np.zeros(1)
+    return {
+        "policy": policy,
+        "tasks_per_hour": tasks / hours,
+        "per_hour": (earned / hours).tolist(),
+        "mean_wait": float(waits.mean()),
+        "p95_wait": float(np.percentile(waits, 95)),
+        "utilisation": busy_seconds / (horizon * employees),
+        "backlog": router.count,
+        "mean_level": float(np.mean(level)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare office throughput under the task routing policies")
+    parser.add_argument("--policy", nargs="+", choices=POLICIES, default=list(POLICIES))
+    parser.add_argument("--synthetic", action="store_true", help="use a seeded synthetic office")
+    parser.add_argument("--employees", type=int, default=8)
+    parser.add_argument("--hours", type=float, default=8.0)
+    parser.add_argument("--backlog", type=int, default=2, help="queued tasks per definition at the start")
+    parser.add_argument("--arrivals", type=float, default=0.0,
+                        help="new tasks per hour instead of requeueing on completion (default: requeue)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        definitions, archetypes = synthetic_office(args.seed)
+    else:
+        definitions, archetypes = load_routing_definitions(), load_archetypes()
+        if not archetypes:
+            archetypes = [{"id": "default", "productivity": 1.0, "quality": 1.0, "allowed": [], "multipliers": []}]
+        if not definitions:
+            parser.error("no TaskDefinitionSO assets under Assets/Data/Tasks; try --synthetic")
+
+    print(f"{len(definitions)} task definitions, {len(archetypes)} archetypes, {args.employees} employees, "
+          f"{args.hours:g} h")
+    print(f"{'policy':<12} {'tasks/h':>9} {'cash/h':>10} {'research/h':>11} {'rep/h':>8} "
+          f"{'wait':>8} {'p95 wait':>9} {'busy':>6} {'backlog':>8} {'level':>6}")
+    for policy in args.policy:
+        r = simulate(policy, definitions, archetypes, args.employees, args.hours, args.backlog, args.arrivals,
+                     args.seed)
+        cash, research, reputation = r["per_hour"]
+        print(f"{policy:<12} {r['tasks_per_hour']:>9.1f} {cash:>10.1f} {research:>11.1f} {reputation:>8.2f} "
+              f"{r['mean_wait']:>7.0f}s {r['p95_wait']:>8.0f}s {r['utilisation']:>6.1%} {r['backlog']:>8} "
+              f"{r['mean_level']:>6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
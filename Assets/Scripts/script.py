@@ -27,6 +27,7 @@ scripts_to_create = {
     "ScriptableObjects": [
         "EmployeeArchetypeSO.cs",
         "TaskDefinitionSO.cs",
+        "BakedCurve.cs",
         "OfficeDefinitionSO.cs",
         "UpgradeDefinitionSO.cs",
         "ProjectDefinitionSO.cs",
@@ -43,6 +44,7 @@ scripts_to_create = {
         "OfficeService.cs",
         "ITaskService.cs",
         "TaskService.cs",
+        "TaskRouter.cs",
         "IUpgradeService.cs",
         "UpgradeService.cs",
         "ICustomizationService.cs",
@@ -79,10 +81,11 @@ scripts_to_create = {
     ]
 }
 
-total_scripts = sum(len(scripts) for scripts in scripts_to_create.values())
-print(f"Total scripts to create: {total_scripts}")
+if __name__ == "__main__":
+    total_scripts = sum(len(scripts) for scripts in scripts_to_create.values())
+    print(f"Total scripts to create: {total_scripts}")
 
-for category, scripts in scripts_to_create.items():
-    print(f"\n{category}: {len(scripts)} scripts")
-    for script in scripts:
-        print(f"  - {script}")
\ No newline at end of file
+    for category, scripts in scripts_to_create.items():
+        print(f"\n{category}: {len(scripts)} scripts")
+        for script in scripts:
+            print(f"  - {script}")
\ No newline at end of file
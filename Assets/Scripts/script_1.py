@@ -2,7 +2,9 @@
 # I'll create all scripts as individual files
 
 # 1. Core Infrastructure Scripts
-core_scripts = {}
+from lazy_registry import LazyRegistry
+
+core_scripts = LazyRegistry()
 
 # IEvent.cs
 core_scripts["IEvent.cs"] = '''namespace FocusFounder.Core
@@ -101,7 +103,11 @@ core_scripts["ISimulationClock.cs"] = '''namespace FocusFounder.Core
     public interface ISimulationClock : ITimeProvider
     {
         bool Running { get; }
+        bool FixedStep { get; }
         void SetRunning(bool running);
+
+        // Once per frame: how many simulation steps to run now, each stepDeltaTime long
+        int ConsumeSteps(out float stepDeltaTime);
     }
 }'''
 
@@ -113,15 +119,26 @@ namespace FocusFounder.Core
     /// <summary>
     /// Central clock that controls all simulation timing
     /// Only advances when the game is focused and running
+    /// In fixed-step mode frame time is banked and spent in whole steps of fixedDeltaTime
     /// </summary>
     public sealed class SimulationClock : MonoBehaviour, ISimulationClock
     {
+        [Header("Timestep")]
+        [Tooltip("Advance the simulation in whole steps of Fixed Delta Time so results do not depend on frame rate")]
+        [SerializeField] private bool fixedStep = true;
+        [SerializeField] private float fixedDeltaTime = 0.05f;
+        [Tooltip("Most steps run in one frame; time owed beyond one more frame of catch-up is dropped")]
+        [SerializeField] private int maxStepsPerFrame = 8;
+
         private bool _running = true;
         private IFocusService _focusService;
+        private double _accumulator;
 
         public bool Running => _running;
         public float DeltaTime => _running && _focusService?.IsFocused == true ? Time.deltaTime : 0f;
         public double NowRealtime => Time.realtimeSinceStartupAsDouble;
+        public bool FixedStep => fixedStep;
+        public double DroppedTime { get; private set; }   // simulated seconds lost to the catch-up cap
 
         public void Initialize(IFocusService focusService)
         {
@@ -132,6 +149,39 @@ namespace FocusFounder.Core
         {
             _running = running;
         }
+
+        public int ConsumeSteps(out float stepDeltaTime)
+        {
+            var deltaTime = DeltaTime;
+            if (!fixedStep)
+            {
+                stepDeltaTime = deltaTime;
+                return deltaTime > 0f ? 1 : 0;
+            }
+
+            stepDeltaTime = fixedDeltaTime;
+            _accumulator += deltaTime;
+            var steps = (int)(_accumulator / fixedDeltaTime);
+            if (steps > maxStepsPerFrame)
+            {
+                // Catch up over the next frame at most instead of chasing a long hitch
+                var budget = 2.0 * maxStepsPerFrame * fixedDeltaTime;
+                if (_accumulator > budget)
+                {
+                    DroppedTime += _accumulator - budget;
+                    _accumulator = budget;
+                }
+                steps = maxStepsPerFrame;
+            }
+            _accumulator -= steps * (double)fixedDeltaTime;
+            return steps;
+        }
+
+        private void OnValidate()
+        {
+            fixedDeltaTime = Mathf.Max(0.001f, fixedDeltaTime);
+            maxStepsPerFrame = Mathf.Max(1, maxStepsPerFrame);
+        }
     }
 }'''
 
@@ -149,14 +199,12 @@ core_scripts["ISaveable.cs"] = '''namespace FocusFounder.Core
     }
 }'''
 
-# Print first batch
-print("Core Infrastructure Scripts Created:")
-for name, content in core_scripts.items():
-    print(f"- {name}")
-    
-# Save to files
-import os
-os.makedirs("Unity_Scripts/Core", exist_ok=True)
-for name, content in core_scripts.items():
-    with open(f"Unity_Scripts/Core/{name}", "w") as f:
-        f.write(content)
\ No newline at end of file
+if __name__ == "__main__":
+    # Print first batch
+    print("Core Infrastructure Scripts Created:")
+    for name, content in core_scripts.items():
+        print(f"- {name}")
+
+    # Save to files
+    from generator_manifest import write_scripts
+    print(write_scripts("Core", core_scripts))
\ No newline at end of file
@@ -1,5 +1,7 @@
 # 8. UI System (MVVM-like pattern)
-ui_scripts = {}
+from lazy_registry import LazyRegistry
+
+ui_scripts = LazyRegistry()
 
 # ObservableProperty.cs
 ui_scripts["ObservableProperty.cs"] = '''using System;
@@ -435,13 +437,11 @@ namespace FocusFounder.UI
     }
 }'''
 
-# Save UI scripts
-import os
-os.makedirs("Unity_Scripts/UI", exist_ok=True)
-for name, content in ui_scripts.items():
-    with open(f"Unity_Scripts/UI/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save UI scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("UI", ui_scripts))
 
-print("UI System Scripts Created:")
-for name in ui_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("UI System Scripts Created:")
+    for name in ui_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
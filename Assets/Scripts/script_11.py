@@ -1,5 +1,7 @@
 # 9. Game Management and Service Locator
-management_scripts = {}
+from lazy_registry import LazyRegistry
+
+management_scripts = LazyRegistry()
 
 # ServiceLocator.cs
 management_scripts["ServiceLocator.cs"] = '''using System;
@@ -311,13 +313,15 @@ namespace FocusFounder.Core
         {
             if (!_gameInitialized) return;
 
-            // Tick all services that need regular updates
-            var deltaTime = Services.Get<ITimeProvider>()?.DeltaTime ?? 0f;
-            
-            if (deltaTime > 0f) // Only tick when focused
+            // Tick all services that need regular updates, one fixed step at a time in fixed-step mode
+            var clock = Services.Get<ISimulationClock>();
+            if (clock == null) return;
+            var steps = clock.ConsumeSteps(out var stepDeltaTime);
+
+            for (int i = 0; i < steps; i++) // No steps while unfocused
             {
-                Services.Get<IEmployeeService>()?.TickAllEmployees(deltaTime);
-                Services.Get<IOfficeService>()?.TickAllOffices(deltaTime);
+                Services.Get<IEmployeeService>()?.TickAllEmployees(stepDeltaTime);
+                Services.Get<IOfficeService>()?.TickAllOffices(stepDeltaTime);
             }
         }
 
@@ -352,13 +356,11 @@ namespace FocusFounder.Core
     }
 }'''
 
-# Save Management scripts
-import os
-os.makedirs("Unity_Scripts/Management", exist_ok=True)
-for name, content in management_scripts.items():
-    with open(f"Unity_Scripts/Management/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save Management scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Management", management_scripts))
 
-print("Game Management Scripts Created:")
-for name in management_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("Game Management Scripts Created:")
+    for name in management_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
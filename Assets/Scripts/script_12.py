@@ -0,0 +1,213 @@
+# Stubs for registered scripts that no other cell generates (registry_reconcile.py)
+# Replace each stub with a real implementation in its category's cell.
+from script_5 import so_scripts
+from script_7 import service_scripts
+
+# ProjectDefinitionSO.cs
+so_scripts["ProjectDefinitionSO.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Data
+{
+    [CreateAssetMenu(fileName = "Project_", menuName = "Focus Founder/Project Definition")]
+    public class ProjectDefinitionSO : ScriptableObject
+    {
+        [Header("Identity")]
+        public string id;
+        public string displayName;
+        public string description;
+    }
+}'''
+
+# ThemeDefinitionSO.cs
+so_scripts["ThemeDefinitionSO.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Data
+{
+    [CreateAssetMenu(fileName = "Theme_", menuName = "Focus Founder/Theme Definition")]
+    public class ThemeDefinitionSO : ScriptableObject
+    {
+        [Header("Identity")]
+        public string id;
+        public string displayName;
+        public string description;
+    }
+}'''
+
+# CurveSetSO.cs
+so_scripts["CurveSetSO.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Data
+{
+    [CreateAssetMenu(fileName = "CurveSet_", menuName = "Focus Founder/Curve Set")]
+    public class CurveSetSO : ScriptableObject
+    {
+        [Header("Identity")]
+        public string id;
+        public string displayName;
+        public string description;
+    }
+}'''
+
+# AnimationSetSO.cs
+so_scripts["AnimationSetSO.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Data
+{
+    [CreateAssetMenu(fileName = "AnimationSet_", menuName = "Focus Founder/Animation Set")]
+    public class AnimationSetSO : ScriptableObject
+    {
+        [Header("Identity")]
+        public string id;
+        public string displayName;
+        public string description;
+    }
+}'''
+
+# IUpgradeService.cs
+service_scripts["IUpgradeService.cs"] = '''namespace FocusFounder.Services
+{
+    /// <summary>
+    /// Upgrade Service contract (stub)
+    /// </summary>
+    public interface IUpgradeService
+    {
+    }
+}'''
+
+# UpgradeService.cs
+service_scripts["UpgradeService.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Services
+{
+    using Core;
+
+    /// <summary>
+    /// Upgrade Service (stub)
+    /// </summary>
+    public class UpgradeService : MonoBehaviour, IUpgradeService, ISaveable
+    {
+        public string SaveKey => "Upgrade";
+
+        public object CaptureState()
+        {
+            return null;
+        }
+
+        public void RestoreState(object state)
+        {
+        }
+    }
+}'''
+
+# ICustomizationService.cs
+service_scripts["ICustomizationService.cs"] = '''namespace FocusFounder.Services
+{
+    /// <summary>
+    /// Customization Service contract (stub)
+    /// </summary>
+    public interface ICustomizationService
+    {
+    }
+}'''
+
+# CustomizationService.cs
+service_scripts["CustomizationService.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Services
+{
+    using Core;
+
+    /// <summary>
+    /// Customization Service (stub)
+    /// </summary>
+    public class CustomizationService : MonoBehaviour, ICustomizationService, ISaveable
+    {
+        public string SaveKey => "Customization";
+
+        public object CaptureState()
+        {
+            return null;
+        }
+
+        public void RestoreState(object state)
+        {
+        }
+    }
+}'''
+
+# IAnalyticsService.cs
+service_scripts["IAnalyticsService.cs"] = '''namespace FocusFounder.Services
+{
+    /// <summary>
+    /// Analytics Service contract (stub)
+    /// </summary>
+    public interface IAnalyticsService
+    {
+    }
+}'''
+
+# AnalyticsService.cs
+service_scripts["AnalyticsService.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Services
+{
+    using Core;
+
+    /// <summary>
+    /// Analytics Service (stub)
+    /// </summary>
+    public class AnalyticsService : MonoBehaviour, IAnalyticsService, ISaveable
+    {
+        public string SaveKey => "Analytics";
+
+        public object CaptureState()
+        {
+            return null;
+        }
+
+        public void RestoreState(object state)
+        {
+        }
+    }
+}'''
+
+# IContentService.cs
+service_scripts["IContentService.cs"] = '''namespace FocusFounder.Services
+{
+    /// <summary>
+    /// Content Service contract (stub)
+    /// </summary>
+    public interface IContentService
+    {
+    }
+}'''
+
+# ContentService.cs
+service_scripts["ContentService.cs"] = '''using UnityEngine;
+
+namespace FocusFounder.Services
+{
+    using Core;
+
+    /// <summary>
+    /// Content Service (stub)
+    /// </summary>
+    public class ContentService : MonoBehaviour, IContentService, ISaveable
+    {
+        public string SaveKey => "Content";
+
+        public object CaptureState()
+        {
+            return null;
+        }
+
+        public void RestoreState(object state)
+        {
+        }
+    }
+}'''
+
+if __name__ == "__main__":
+    from generator_manifest import write_scripts
+    print(write_scripts("Data", so_scripts))
+    print(write_scripts("Services", service_scripts))
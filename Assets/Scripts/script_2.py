@@ -1,47 +1,64 @@
 # 2. Focus System Scripts
-focus_scripts = {}
+from lazy_registry import LazyRegistry
 
-# FocusEvents.cs
-focus_scripts["FocusEvents.cs"] = '''using System;
+focus_scripts = LazyRegistry()
 
-namespace FocusFounder.Focus
-{
-    using Core;
-
-    /// <summary>
-    /// Event fired when app gains focus
-    /// </summary>
-    public readonly struct FocusGained : IEvent { }
-
-    /// <summary>
-    /// Event fired when app loses focus
-    /// </summary>
-    public readonly struct FocusLost : IEvent { }
-
-    /// <summary>
-    /// Event fired when a focus session starts (after debounce)
-    /// </summary>
-    public readonly struct SessionStarted : IEvent 
-    { 
-        public DateTimeOffset At { get; }
-        public SessionStarted(DateTimeOffset at) => At = at;
-    }
-
-    /// <summary>
-    /// Event fired when a focus session ends
+# FocusEvents.cs
+# One readonly struct per focus event, stamped out from focus_events
+from csharp_templates import register_partial, render
+
+focus_events = [
+    {"name": "FocusGained", "summary": "Event fired when app gains focus", "fields": []},
+    {"name": "FocusLost", "summary": "Event fired when app loses focus", "fields": []},
+    {"name": "SessionStarted", "summary": "Event fired when a focus session starts (after debounce)",
+     "fields": [("DateTimeOffset", "At")]},
+    {"name": "SessionEnded", "summary": "Event fired when a focus session ends",
+     "fields": [("DateTimeOffset", "At"), ("TimeSpan", "Duration")]},
+]
+
+register_partial("summary", '''    /// <summary>
+    /// {{ summary }}
     /// </summary>
-    public readonly struct SessionEnded : IEvent 
+''')
+
+register_partial("readonly_event", '''{% set summary = event["summary"] %}
+{% include "summary" %}
+{% if not event["fields"] %}
+    public readonly struct {{ event["name"] }} : IEvent { }
+{% else %}
+    public readonly struct {{ event["name"] }} : IEvent 
     { 
-        public DateTimeOffset At { get; }
-        public TimeSpan Duration { get; }
+{% for type, field in event["fields"] %}
+        public {{ type }} {{ field }} { get; }
+{% endfor %}
+{% if len(event["fields"]) == 1 %}
+{% set type, field = event["fields"][0] %}
+        public {{ event["name"] }}({{ type }} {{ camel(field) }}) => {{ field }} = {{ camel(field) }};
+{% else %}
         
-        public SessionEnded(DateTimeOffset at, TimeSpan duration)
+        public {{ event["name"] }}({{ ", ".join(f"{type} {camel(field)}" for type, field in event["fields"]) }})
         {
-            At = at;
-            Duration = duration;
+{% for type, field in event["fields"] %}
+            {{ field }} = {{ camel(field) }};
+{% endfor %}
         }
+{% endif %}
     }
-}'''
+{% endif %}
+''')
+
+@focus_scripts.register("FocusEvents.cs")
+def render_focus_events():
+    return render('''using System;
+
+namespace FocusFounder.Focus
+{
+    using Core;
+{% for event in events %}
+
+{% include "readonly_event" %}
+{% endfor %}
+}''', "FocusEvents.cs", events=focus_events)
 
 # IFocusService.cs
 focus_scripts["IFocusService.cs"] = '''using System;
@@ -182,13 +199,11 @@ namespace FocusFounder.Focus
     }
 }'''
 
-# Save Focus scripts
-import os
-os.makedirs("Unity_Scripts/Focus", exist_ok=True)
-for name, content in focus_scripts.items():
-    with open(f"Unity_Scripts/Focus/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save Focus scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Focus", focus_scripts))
 
-print("Focus System Scripts Created:")
-for name in focus_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("Focus System Scripts Created:")
+    for name in focus_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
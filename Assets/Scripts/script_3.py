@@ -1,5 +1,7 @@
 # 3. Domain Models
-domain_scripts = {}
+from lazy_registry import LazyRegistry
+
+domain_scripts = LazyRegistry()
 
 # RewardBundle.cs
 domain_scripts["RewardBundle.cs"] = '''using System;
@@ -303,13 +305,11 @@ namespace FocusFounder.Domain
     }
 }'''
 
-# Save Domain scripts
-import os
-os.makedirs("Unity_Scripts/Domain", exist_ok=True)
-for name, content in domain_scripts.items():
-    with open(f"Unity_Scripts/Domain/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save Domain scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Domain", domain_scripts))
 
-print("Domain Model Scripts Created:")
-for name in domain_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("Domain Model Scripts Created:")
+    for name in domain_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
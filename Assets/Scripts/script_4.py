@@ -1,4 +1,5 @@
 # Continue with main domain entities
+from script_3 import domain_scripts
 
 # TaskInstance.cs
 domain_scripts["TaskInstance.cs"] = '''using System;
@@ -343,11 +344,11 @@ namespace FocusFounder.Domain
     }
 }'''
 
-# Save the additional domain scripts
-for name, content in domain_scripts.items():
-    with open(f"Unity_Scripts/Domain/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save the additional domain scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Domain", domain_scripts))
 
-print("Additional Domain Scripts Created:")
-for name in ["TaskInstance.cs", "Employee.cs", "Office.cs"]:
-    print(f"- {name}")
\ No newline at end of file
+    print("Additional Domain Scripts Created:")
+    for name in ["TaskInstance.cs", "Employee.cs", "Office.cs"]:
+        print(f"- {name}")
\ No newline at end of file
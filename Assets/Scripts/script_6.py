@@ -1,5 +1,7 @@
 # 5. Strategy Interfaces and Implementations
-strategy_scripts = {}
+from lazy_registry import LazyRegistry
+
+strategy_scripts = LazyRegistry()
 
 # IProductivityStrategy.cs
 strategy_scripts["IProductivityStrategy.cs"] = '''namespace FocusFounder.Strategies
@@ -82,13 +84,19 @@ namespace FocusFounder.Strategies
         [Header("Quality Scaling")]
         [SerializeField] private float qualityMultiplier = 1f;
         [SerializeField] private AnimationCurve qualityCurve = AnimationCurve.Linear(0f, 0.5f, 100f, 1.5f);
+        [SerializeField, HideInInspector] private BakedCurve qualityCurveBaked;
+
+        private void OnValidate()
+        {
+            qualityCurveBaked.Invalidate();
+        }
 
         public RewardBundle ComputeYield(Employee employee, TaskInstance task, GlobalModifiers globalMods)
         {
             var baseReward = task.Definition.GetRewardForLevel(employee.Level);
             
             // Quality impact
-            var qualityMultiplier = qualityCurve.Evaluate(employee.Stats.quality);
+            var qualityMultiplier = qualityCurveBaked.Evaluate(qualityCurve, employee.Stats.quality);
             
             // Global revenue modifier
             var globalMultiplier = globalMods.RevenueMultiplier;
@@ -104,13 +112,11 @@ namespace FocusFounder.Strategies
     }
 }'''
 
-# Save Strategy scripts
-import os
-os.makedirs("Unity_Scripts/Strategies", exist_ok=True)
-for name, content in strategy_scripts.items():
-    with open(f"Unity_Scripts/Strategies/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save Strategy scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Strategies", strategy_scripts))
 
-print("Strategy Scripts Created:")
-for name in strategy_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("Strategy Scripts Created:")
+    for name in strategy_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
@@ -1,5 +1,7 @@
 # 6. Core Services
-service_scripts = {}
+from lazy_registry import LazyRegistry
+
+service_scripts = LazyRegistry()
 
 # IEconomyService.cs
 service_scripts["IEconomyService.cs"] = '''namespace FocusFounder.Services
@@ -121,7 +123,6 @@ namespace FocusFounder.Services
 
 # TaskService.cs  
 service_scripts["TaskService.cs"] = '''using System.Collections.Generic;
-using System.Linq;
 using UnityEngine;
 
 namespace FocusFounder.Services
@@ -137,8 +138,9 @@ namespace FocusFounder.Services
     public class TaskService : MonoBehaviour, ITaskService
     {
         [SerializeField] private BaseYieldStrategy defaultYieldStrategy;
+        [SerializeField] private TaskRoutingPolicy routingPolicy = TaskRoutingPolicy.SkillAware;
         
-        private Dictionary<string, Queue<TaskInstance>> _officeQueues = new();
+        private Dictionary<string, TaskRouter> _officeQueues = new();
         private IEconomyService _economyService;
         private IEventBus _eventBus;
 
@@ -157,7 +159,7 @@ namespace FocusFounder.Services
             var task = new TaskInstance(taskDef);
             
             if (!_officeQueues.ContainsKey(office.Id))
-                _officeQueues[office.Id] = new Queue<TaskInstance>();
+                _officeQueues[office.Id] = new TaskRouter(routingPolicy);
             
             _officeQueues[office.Id].Enqueue(task);
             OnTaskQueued?.Invoke(task);
@@ -168,12 +170,10 @@ namespace FocusFounder.Services
             if (!_officeQueues.ContainsKey(office.Id))
                 return null;
 
-            var queue = _officeQueues[office.Id];
-            if (queue.Count == 0)
+            var task = _officeQueues[office.Id].Dequeue(employee);
+            if (task == null)
                 return null;
 
-            // Simple FIFO for now - could implement priority/routing strategies
-            var task = queue.Dequeue();
             OnTaskStarted?.Invoke(employee, task);
             return task;
         }
@@ -214,13 +214,274 @@ namespace FocusFounder.Services
     }
 }'''
 
-# Save Service scripts
-import os
-os.makedirs("Unity_Scripts/Services", exist_ok=True)
-for name, content in service_scripts.items():
-    with open(f"Unity_Scripts/Services/{name}", "w") as f:
-        f.write(content)
+# TaskRouter.cs
+service_scripts["TaskRouter.cs"] = '''using System;
+using System.Collections.Generic;
+using UnityEngine;
+
+namespace FocusFounder.Services
+{
+    using Domain;
+    using Data;
+
+    public enum TaskRoutingPolicy
+    {
+        Fifo,       // Oldest task the employee may take
+        Priority,   // Most reward per second of work
+        SkillAware  // Priority weighted by the archetype's category multiplier
+    }
+
+    /// <summary>
+    /// One office's task queue, split into a heap per requirement bucket (category, minimum
+    /// level, required skills) so an idle employee is matched with a peek per bucket and one pop
+    /// </summary>
+    public class TaskRouter
+    {
+        private struct Entry
+        {
+            public TaskInstance task;
+            public long sequence;
+            public float value;
+        }
+
+        private sealed class Bucket
+        {
+            public TaskCategory category;
+            public float minLevel;
+            public string[] skills;
+            public readonly List<Entry> heap = new();
+        }
+
+        private readonly List<Bucket> _buckets = new();
+        private readonly Dictionary<string, Bucket> _bucketByKey = new();
+        private readonly Dictionary<EmployeeArchetypeSO, float[]> _affinities = new();
+        private long _sequence;
+
+        public TaskRoutingPolicy Policy { get; }
+        public int Count { get; private set; }
+
+        public TaskRouter(TaskRoutingPolicy policy)
+        {
+            Policy = policy;
+        }
+
+        public void Enqueue(TaskInstance task)
+        {
+            var definition = task.Definition;
+            var bucket = GetBucket(definition);
+            Push(bucket.heap, new Entry { task = task, sequence = _sequence++, value = RewardRate(definition) });
+            Count++;
+        }
+
+        public TaskInstance Dequeue(Employee employee)
+        {
+            var affinity = GetAffinity(employee.Archetype);
+            Bucket best = null;
+            var bestScore = 0.0;
+
+            foreach (var bucket in _buckets)
+            {
+                if (bucket.heap.Count == 0 || employee.Level < bucket.minLevel)
+                    continue;
+
+                var multiplier = affinity[(int)bucket.category];
+                if (multiplier <= 0f || !HasSkills(employee.Archetype, bucket.skills))
+                    continue;
+
+                var head = bucket.heap[0];
+                var score = Policy switch
+                {
+                    TaskRoutingPolicy.Fifo => -(double)head.sequence,
+                    TaskRoutingPolicy.SkillAware => head.value * multiplier,
+                    _ => head.value
+                };
+                if (best == null || score > bestScore || (score == bestScore && head.sequence < best.heap[0].sequence))
+                {
+                    best = bucket;
+                    bestScore = score;
+                }
+            }
+
+            if (best == null)
+                return null;
+
+            Count--;
+            return Pop(best.heap).task;
+        }
+
+        public List<TaskInstance> ToList()
+        {
+            var entries = new List<Entry>(Count);
+            foreach (var bucket in _buckets)
+                entries.AddRange(bucket.heap);
+            entries.Sort((a, b) => a.sequence.CompareTo(b.sequence));
+            return entries.ConvertAll(entry => entry.task);
+        }
+
+        public void Clear()
+        {
+            foreach (var bucket in _buckets)
+                bucket.heap.Clear();
+            Count = 0;
+        }
+
+        private Bucket GetBucket(TaskDefinitionSO definition)
+        {
+            var skills = definition.requiredSkills ?? Array.Empty<string>();
+            var key = $"{(int)definition.category}|{definition.minEmployeeLevel}|{string.Join(",", skills)}";
+            if (!_bucketByKey.TryGetValue(key, out var bucket))
+            {
+                bucket = new Bucket { category = definition.category, minLevel = definition.minEmployeeLevel, skills = skills };
+                _bucketByKey[key] = bucket;
+                _buckets.Add(bucket);
+            }
+            return bucket;
+        }
+
+        private static float RewardRate(TaskDefinitionSO definition)
+        {
+            var reward = definition.GetRewardForLevel(Mathf.Max(1f, definition.minEmployeeLevel));
+            return (reward.cash + reward.research + reward.reputation) / Mathf.Max(1f, definition.baseDuration);
+        }
+
+        // Category multipliers by TaskCategory; 0 where the archetype may not work
+        private float[] GetAffinity(EmployeeArchetypeSO archetype)
+        {
+            if (_affinities.TryGetValue(archetype, out var affinity))
+                return affinity;
+
+            var count = Enum.GetValues(typeof(TaskCategory)).Length;
+            affinity = new float[count];
+            var allowed = archetype.allowedTaskCategories;
+            if (allowed == null || allowed.Length == 0)
+            {
+                for (int i = 0; i < count; i++)
+                    affinity[i] = 1f;
+            }
+            else
+            {
+                var multipliers = archetype.categoryMultipliers;
+                for (int i = 0; i < allowed.Length; i++)
+                {
+                    if (Enum.TryParse<TaskCategory>(allowed[i], true, out var category))
+                        affinity[(int)category] = multipliers != null && i < multipliers.Length ? multipliers[i] : 1f;
+                }
+            }
+
+            _affinities[archetype] = affinity;
+            return affinity;
+        }
+
+        // Archetypes declare no skills of their own: a skill is met by the archetype's id or an allowed category
+        private static bool HasSkills(EmployeeArchetypeSO archetype, string[] skills)
+        {
+            foreach (var skill in skills)
+            {
+                if (string.Equals(skill, archetype.id, StringComparison.OrdinalIgnoreCase))
+                    continue;
+                if (archetype.allowedTaskCategories == null ||
+                    Array.FindIndex(archetype.allowedTaskCategories, c => string.Equals(c, skill, StringComparison.OrdinalIgnoreCase)) < 0)
+                    return false;
+            }
+            return true;
+        }
+
+        private bool Before(Entry a, Entry b)
+        {
+            if (Policy != TaskRoutingPolicy.Fifo && a.value != b.value)
+                return a.value > b.value;
+            return a.sequence < b.sequence;
+        }
+
+        private void Push(List<Entry> heap, Entry entry)
+        {
+            heap.Add(entry);
+            var i = heap.Count - 1;
+            while (i > 0)
+            {
+                var parent = (i - 1) / 2;
+                if (!Before(heap[i], heap[parent]))
+                    break;
+                (heap[i], heap[parent]) = (heap[parent], heap[i]);
+                i = parent;
+            }
+        }
+
+        private Entry Pop(List<Entry> heap)
+        {
+            var top = heap[0];
+            var last = heap.Count - 1;
+            heap[0] = heap[last];
+            heap.RemoveAt(last);
+
+            var i = 0;
+            while (true)
+            {
+                var left = 2 * i + 1;
+                if (left >= heap.Count)
+                    break;
+                var child = left + 1 < heap.Count && Before(heap[left + 1], heap[left]) ? left + 1 : left;
+                if (!Before(heap[child], heap[i]))
+                    break;
+                (heap[i], heap[child]) = (heap[child], heap[i]);
+                i = child;
+            }
+            return top;
+        }
+    }
+}'''
+
+# ISaveService.cs
+service_scripts["ISaveService.cs"] = '''namespace FocusFounder.Services
+{
+    using Core;
+
+    /// <summary>
+    /// Collects ISaveable objects and captures their state on save
+    /// </summary>
+    public interface ISaveService
+    {
+        void RegisterSavableObjects(ISaveable saveable);
+        void UnregisterSavableObjects(ISaveable saveable);
+        void SaveAllSavableObjectDatas();
+    }
+}'''
+
+# SaveService.cs
+service_scripts["SaveService.cs"] = '''using System.Collections.Generic;
+using UnityEngine;
+
+namespace FocusFounder.Services
+{
+    using Core;
+
+    public class SaveService : MonoBehaviour, ISaveService
+    {
+        private readonly List<ISaveable> _saveables = new();
+
+        public void RegisterSavableObjects(ISaveable saveable)
+        {
+            if (!_saveables.Contains(saveable))
+                _saveables.Add(saveable);
+        }
+
+        public void UnregisterSavableObjects(ISaveable saveable)
+        {
+            _saveables.Remove(saveable);
+        }
+
+        public void SaveAllSavableObjectDatas()
+        {
+            _saveables.ForEach(saveable => saveable.CaptureState());
+        }
+    }
+}'''
+
+if __name__ == "__main__":
+    # Save Service scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Services", service_scripts))
 
-print("Service Scripts Created:")
-for name in service_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("Service Scripts Created:")
+    for name in service_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
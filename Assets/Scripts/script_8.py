@@ -1,4 +1,5 @@
 # Continue with more services
+from script_7 import service_scripts
 
 # IEmployeeService.cs
 service_scripts["IEmployeeService.cs"] = '''using System.Collections.Generic;
@@ -299,11 +300,11 @@ namespace FocusFounder.Services
     }
 }'''
 
-# Save additional service scripts
-for name, content in service_scripts.items():
-    with open(f"Unity_Scripts/Services/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save additional service scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Services", service_scripts))
 
-print("Additional Service Scripts Created:")
-for name in ["IEmployeeService.cs", "EmployeeService.cs", "IOfficeService.cs", "OfficeService.cs"]:
-    print(f"- {name}")
\ No newline at end of file
+    print("Additional Service Scripts Created:")
+    for name in ["IEmployeeService.cs", "EmployeeService.cs", "IOfficeService.cs", "OfficeService.cs"]:
+        print(f"- {name}")
\ No newline at end of file
@@ -1,5 +1,7 @@
 # 7. Animation System
-animation_scripts = {}
+from lazy_registry import LazyRegistry
+
+animation_scripts = LazyRegistry()
 
 # IAnimPlayable.cs
 animation_scripts["IAnimPlayable.cs"] = '''namespace FocusFounder.Animation
@@ -236,13 +238,11 @@ namespace FocusFounder.Animation
     }
 }'''
 
-# Save Animation scripts
-import os
-os.makedirs("Unity_Scripts/Animation", exist_ok=True)
-for name, content in animation_scripts.items():
-    with open(f"Unity_Scripts/Animation/{name}", "w") as f:
-        f.write(content)
+if __name__ == "__main__":
+    # Save Animation scripts
+    from generator_manifest import write_scripts
+    print(write_scripts("Animation", animation_scripts))
 
-print("Animation System Scripts Created:")
-for name in animation_scripts.keys():
-    print(f"- {name}")
\ No newline at end of file
+    print("Animation System Scripts Created:")
+    for name in animation_scripts.keys():
+        print(f"- {name}")
\ No newline at end of file
@@ -0,0 +1,270 @@
+# Headless company simulation sharded across processes by office.
+#
+# Offices (OfficeService._allOffices) only meet at EconomyService's balance:
+# every Employee.Tick reads its own row, and TickAllOffices does nothing yet.
+# So the employees are laid out office by office in headless_sim columns held
+# in shared memory, and each worker owns a contiguous run of offices (split to
+# even out employees) and steps its rows with HeadlessSim, requeueing
+# completed tasks as TaskService does. A tick's output from a shard is one
+# reward delta: the (cash, research, reputation) its completions earned, as
+# BaseYieldStrategy.ComputeYield pays them (balance_sweep.task_reward:
+# baseReward * difficultyMultiplier(level) * qualityCurve(Stats.quality), at
+# the default archetype's base quality and a global revenue multiplier of 1).
+# Workers write the deltas to a shared (batch ticks x shards x 3) array and the
+# reducer adds them into the balance tick by tick in shard order, so the
+# balance does not depend on which worker finishes first.
+#
+# Workers synchronise only at batch ends (--batch ticks), which is also where
+# anything that spends the balance would have to run. --check compares the
+# columns and balance with one unsharded HeadlessSim over the same company.
+#
+#   python sharded_sim.py --offices 400 --employees 300000 --ticks 600
+#   python sharded_sim.py --workers 1 2 4 8           # scaling, one run per worker count
+#   python sharded_sim.py --check
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from balance_sweep import load_definitions, task_reward
+from headless_sim import EmployeeColumns, HeadlessSim
+from routing_sim import synthetic_office
+
+REWARDS = ("cash", "research", "reputation")
+
+
+class Shard:
+    """HeadlessSim over one run of offices, plus what its completions earn."""
+
+    def __init__(self, columns, definitions, quality=1.0):
+        self.sim = HeadlessSim(columns, [d["base_duration"] for d in definitions])
+        self.definitions = definitions
+        # Archetype.baseStats.quality (EmployeeArchetypeSO default: 1)
+        self.quality = quality
+
+    def tick(self, dt):
+        """One Employee.Tick(dt) for every employee; returns the reward delta."""
+        sim = self.sim
+        delta = np.zeros(len(REWARDS))
+        if sim.step(dt):
+            done = np.flatnonzero(~sim.employees.has_task)
+            definition = sim.employees.task_definition[done]
+            for d in np.unique(definition):
+                level = sim.employees.level[done[definition == d]]
+                delta += task_reward(self.definitions[d], level, self.quality).sum(axis=0)
+            sim.auto_assign()
+        return delta
+
+
+def make_company(offices, employees, definitions, seed=0):
+    """(columns, office_offsets): employees sorted by office, office o being office_offsets[o]:[o + 1]."""
+    rng = np.random.default_rng(seed)
+    size = rng.lognormal(0.0, 0.8, offices)
+    counts = np.maximum(1, np.floor(size / size.sum() * employees)).astype(np.int64)
+    counts[np.argmax(counts)] += employees - counts.sum()
+    columns = EmployeeColumns(employees)
+    columns.base_productivity[:] = rng.uniform(0.5, 2.0, employees)
+    sim = HeadlessSim(columns, [d["base_duration"] for d in definitions])
+    definition = rng.integers(0, len(definitions), employees)
+    for d in range(len(definitions)):
+        sim.assign(definition == d, d)
+    return columns, np.concatenate(([0], np.cumsum(counts)))
+
+
+def partition(office_offsets, shards):
+    """Employee row bounds of shards contiguous office runs with about equal employees each."""
+    total = office_offsets[-1]
+    cuts = np.searchsorted(office_offsets, np.arange(1, shards) * total / shards)
+    bounds = np.unique(np.concatenate(([0], office_offsets[cuts], [total])))
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _worker(conn, blocks, bounds, index, definitions):
+    # The SharedMemory objects must outlive every array over their buffers
+    memory = [shared_memory.SharedMemory(name=shm_name) for shm_name, _, _ in blocks.values()]
+    arrays = {name: np.ndarray(shape, dtype, buffer=shm.buf)
+              for (name, (_, dtype, shape)), shm in zip(blocks.items(), memory)}
+    deltas = arrays.pop("_deltas")
+    lo, hi = bounds
+    shard = Shard(EmployeeColumns.from_arrays({name: array[lo:hi] for name, array in arrays.items()}), definitions)
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        ticks, dt = message
+        started = time.perf_counter()
+        for t in range(ticks):
+            deltas[t, index] = shard.tick(dt)
+        conn.send(time.perf_counter() - started)
+    conn.close()
+    del shard, arrays, deltas
+    for shm in memory:
+        shm.close()
+
+
+class ShardedSim:
+    """Columns moved into shared memory and stepped by one worker process per shard."""
+
+    def __init__(self, columns, office_offsets, definitions, workers, batch=50):
+        self.count = columns.count
+        self.batch = batch
+        self.bounds = partition(office_offsets, workers)
+        self.balance = np.zeros(len(REWARDS))
+        self.busy = np.zeros(len(self.bounds))
+        self._memory = []
+        blocks = {}
+        arrays = dict(columns.arrays(), _deltas=np.zeros((batch, len(self.bounds), len(REWARDS))))
+        for name, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            shared = np.ndarray(array.shape, array.dtype, buffer=shm.buf)
+            shared[...] = array
+            self._memory.append(shm)
+            blocks[name] = (shm.name, array.dtype.str, array.shape)
+            setattr(self, name, shared)
+        self._processes, self._pipes = [], []
+        for index, bounds in enumerate(self.bounds):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, args=(child, blocks, bounds, index, definitions),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self._processes.append(process)
+            self._pipes.append(parent)
+
+    def columns(self):
+        """The shared columns (valid until close())."""
+        return EmployeeColumns.from_arrays({name: getattr(self, name)
+                                            for name in EmployeeColumns(0).arrays()})
+
+    def run(self, ticks, dt):
+        """Advance every shard ticks steps; returns the balance after each tick."""
+        history = np.empty((ticks, len(REWARDS)))
+        done = 0
+        while done < ticks:
+            batch = min(self.batch, ticks - done)
+            for index, pipe in enumerate(self._pipes):
+                try:
+                    pipe.send((batch, dt))
+                except OSError:
+                    self._worker_died(index)
+            for index, pipe in enumerate(self._pipes):
+                try:
+                    self.busy[index] += pipe.recv()
+                except (EOFError, OSError):
+                    self._worker_died(index)
+            # Reduce: shard deltas in shard order, then tick by tick into the balance
+            per_tick = np.zeros((batch, len(REWARDS)))
+            for index in range(len(self._pipes)):
+                per_tick += self._deltas[:batch, index]
+            for t in range(batch):
+                self.balance += per_tick[t]
+                history[done + t] = self.balance
+            done += batch
+        return history
+
+    def _worker_died(self, index):
+        process = self._processes[index]
+        process.join(1.0)
+        lo, hi = self.bounds[index]
+        raise RuntimeError(f"worker for shard {index} (employees {lo}:{hi}) died "
+                           f"with exit code {process.exitcode}; the shared columns are incomplete")
+
+    def close(self):
+        """Stop the workers and free the shared memory, even if a worker has died."""
+        try:
+            for pipe in self._pipes:
+                try:
+                    pipe.send(None)
+                except OSError:
+                    pass  # Worker already gone
+                pipe.close()
+            for process in self._processes:
+                process.join(5.0)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        finally:
+            self._pipes, self._processes = [], []
+            for name in list(vars(self)):
+                if isinstance(getattr(self, name), np.ndarray) and name not in ("balance", "busy"):
+                    delattr(self, name)
+            for shm in self._memory:
+                shm.close()
+                shm.unlink()
+            self._memory = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def company_definitions(synthetic=False, seed=0):
+    definitions = [] if synthetic else load_definitions()
+    if len(definitions) < 2:
+        definitions, _ = synthetic_office(seed)
+    return definitions
+
+
+def check(offices=40, employees=20_000, ticks=300, dt=0.1, workers=4, seed=1):
+    """Sharded against unsharded; returns (columns equal, largest relative balance difference)."""
+    definitions = company_definitions(True, seed)
+    columns, offsets = make_company(offices, employees, definitions, seed)
+    single = Shard(EmployeeColumns.from_arrays({n: a.copy() for n, a in columns.arrays().items()}), definitions)
+    balance = np.zeros(len(REWARDS))
+    for _ in range(ticks):
+        balance += single.tick(dt)
+    with ShardedSim(columns, offsets, definitions, workers, batch=64) as sharded:
+        sharded.run(ticks, dt)
+        shared = sharded.columns().arrays()
+        equal = all(np.array_equal(shared[name], array) for name, array in single.sim.employees.arrays().items())
+        difference = float(np.max(np.abs(sharded.balance - balance) / np.maximum(np.abs(balance), 1e-12)))
+    return equal, difference
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the headless company simulation sharded by office")
+    parser.add_argument("--offices", type=int, default=400)
+    parser.add_argument("--employees", type=int, default=300_000)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--dt", type=float, default=0.1, help="seconds per tick (default: %(default)s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="worker processes; several values run once each (default: cores)")
+    parser.add_argument("--batch", type=int, default=50, help="ticks between reductions (default: %(default)s)")
+    parser.add_argument("--synthetic", action="store_true", help="use routing_sim's synthetic task definitions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="compare with an unsharded run and exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        equal, difference = check()
+        print(f"columns {'identical to' if equal else 'DIFFER from'} the unsharded run; "
+              f"balance within {difference:.1e} relative")
+        return 0 if equal and difference < 1e-9 else 1
+
+    definitions = company_definitions(args.synthetic, args.seed)
+    print(f"{args.offices} offices, {args.employees} employees, {len(definitions)} task definitions, "
+          f"{args.ticks} ticks of {args.dt:g} s on {os.cpu_count()} cores")
+    baseline = None
+    for workers in args.workers:
+        columns, offsets = make_company(args.offices, args.employees, definitions, args.seed)
+        with ShardedSim(columns, offsets, definitions, workers, args.batch) as sharded:
+            started = time.perf_counter()
+            sharded.run(args.ticks, args.dt)
+            elapsed = time.perf_counter() - started
+            rate = args.employees * args.ticks / elapsed / 1e6
+            baseline = baseline or (rate, len(sharded.bounds))
+            efficiency = sharded.busy.sum() / (elapsed * len(sharded.bounds))
+            print(f"{len(sharded.bounds)} shards: {elapsed:.2f} s, {rate:.1f} M employee-ticks/s "
+                  f"(x{rate / baseline[0]:.2f} of {baseline[1]}), workers busy {efficiency * 100:.0f}% of the run; "
+                  f"balance " + ", ".join(f"{name} {value:.0f}" for name, value in zip(REWARDS, sharded.balance)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+# Grid and random search over the productivity and yield strategy knobs.
+# BaseProductivityStrategy.ComputeRate and BaseYieldStrategy.ComputeYield are
+# transcribed as NumPy expressions over whole parameter arrays, so a million
+# combinations are a few dozen broadcasted passes (chunked to bound memory)
+# rather than a Python call per combination. Both read Employee.Stats, which
+# CalculateStats already scales by level (10% per level) and, for
+# productivity, by morale / 100; --productivity and --quality are the
+# archetype's baseStats.
+#
+# Each combination is scored against target pacing points by the worst
+# relative miss, in log space, over all targets:
+#
+#   task_seconds      baseDuration / ComputeRate at a level
+#   hours_to_level    time to reach a level (10 * level tasks per level)
+#   cash_per_hour     ComputeYield per task / task_seconds (also research_, reputation_)
+#
+# Metrics are cached under .generator_cache/strategy_search, one store per
+# evaluation context holding the target columns (metric, level) of every
+# parameter combination seen so far. A search that overlaps an earlier one,
+# say with an axis widened or a target value changed, only evaluates the
+# combinations or columns it has not seen, then scores everything from the
+# cached metrics. The tool also flags parameters that change nothing.
+# Today these are baseMoraleMultiplier, which is never read, and
+# qualityMultiplier, which ComputeYield shadows with a local variable.
+#
+#   python strategy_search.py --param levelScaling=0.02:0.3:100 --param focusBonus=0:0.5:100 \
+#       --param qualityCurveStart=0.2:1:100 --target hours_to_level:10=2 --target cash_per_hour:5=900 --reward 10 0 0
+#   python strategy_search.py --random 1000000 --param levelScaling=0.02:0.3 --target task_seconds:20=5
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from balance_sweep import LEVEL_STEP, load_definitions
+
+SEARCH_VERSION = "2"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".generator_cache", "strategy_search")
+
+# Serialized strategy fields and their defaults; the quality curve is the
+# default AnimationCurve.Linear(0, start, 100, end)
+PARAMETERS = {
+    "baseMoraleMultiplier": 1.0,
+    "levelScaling": 0.1,
+    "focusBonus": 0.2,
+    "qualityMultiplier": 1.0,
+    "qualityCurveStart": 0.5,
+    "qualityCurveEnd": 1.5,
+}
+METRICS = ("task_seconds", "hours_to_level", "cash_per_hour", "research_per_hour", "reputation_per_hour")
+TASKS_PER_LEVEL = 10
+_CHUNK = 1 << 16
+
+
+def compute_rate(values, level, context):
+    """BaseProductivityStrategy.ComputeRate: (combinations, levels) work per second."""
+    # baseMoraleMultiplier is serialized but never read
+    stats = context["productivity"] * (1.0 + (level[None, :] - 1.0) * LEVEL_STEP) * (context["morale"] / 100.0)
+    morale = 0.5 + (1.5 - 0.5) * min(max(context["morale"] / 100.0, 0.0), 1.0)  # Mathf.Lerp clamps t
+    level_multiplier = 1.0 + (level[None, :] - 1.0) * values["levelScaling"][:, None]
+    focus = 1.0 + values["focusBonus"][:, None]
+    return stats * morale * level_multiplier * context["office"] * context["global"] * focus
+
+
+def compute_yield(values, level, context):
+    """BaseYieldStrategy.ComputeYield: (combinations, levels, 3) cash/research/reputation per task."""
+    # The local qualityMultiplier shadows the serialized field, so only the curve counts
+    stats = context["quality"] * (1.0 + (level - 1.0) * LEVEL_STEP)
+    t = np.clip(stats / 100.0, 0.0, 1.0)  # the curve's keys are at 0 and 100, clamped outside
+    start, end = values["qualityCurveStart"][:, None], values["qualityCurveEnd"][:, None]
+    quality = start + (end - start) * t[None, :]
+    difficulty = np.interp(level, *zip(*context["difficulty"]))
+    base = np.asarray(context["reward"])[None, :] * difficulty[:, None]
+    return (quality * context["revenue"])[:, :, None] * base[None, :, :]
+
+
+def evaluate(values, context, max_level):
+    """metric -> (combinations, max_level) array for levels 1..max_level."""
+    level = np.arange(1, max_level + 1, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        seconds = context["duration"] / compute_rate(values, level, context)
+    per_level = TASKS_PER_LEVEL * level[None, :] * seconds
+    hours = np.zeros_like(seconds)
+    np.cumsum(per_level[:, :-1], axis=1, out=hours[:, 1:])
+    hours /= 3600.0
+    per_hour = compute_yield(values, level, context) * (3600.0 / seconds)[:, :, None]
+    return {"task_seconds": seconds, "hours_to_level": hours, "cash_per_hour": per_hour[:, :, 0],
+            "research_per_hour": per_hour[:, :, 1], "reputation_per_hour": per_hour[:, :, 2]}
+
+
+class Space:
+    """Parameter axes for a grid (every combination) or a seeded random sample."""
+
+    def __init__(self, axes, random=0, seed=0):
+        # name -> ("values", array) or ("range", lo, hi); unswept names use their default
+        self.axes = {name: axes.get(name, ("values", np.array([default]))) for name, default in PARAMETERS.items()}
+        self.random = random
+        self.seed = seed
+        self.shape = tuple(len(axis[1]) if axis[0] == "values" else 0 for axis in self.axes.values())
+        if not random and any(axis[0] == "range" for axis in self.axes.values()):
+            raise ValueError("lo:hi ranges need --random; use lo:hi:n for a grid axis")
+
+    @property
+    def size(self):
+        return self.random or math.prod(self.shape)
+
+    def key(self):
+        return {name: [axis[0], *(np.asarray(axis[1]).tolist() if axis[0] == "values" else axis[1:])]
+                for name, axis in self.axes.items()} | {"random": self.random, "seed": self.seed}
+
+    def values(self, start, stop):
+        """name -> array of the parameter values of combinations start..stop-1 (stop - start <= one chunk)."""
+        index = np.arange(start, stop)
+        if not self.random:
+            coords = np.unravel_index(index, self.shape)
+            return {name: np.asarray(axis[1], np.float64)[coord]
+                    for (name, axis), coord in zip(self.axes.items(), coords)}
+        out = {}
+        for n, (name, axis) in enumerate(self.axes.items()):
+            # One stream per (seed, parameter, chunk start), so any chunk can be rebuilt on its own
+            rng = np.random.default_rng([self.seed, n, start])
+            if axis[0] == "range":
+                out[name] = rng.uniform(axis[1], axis[2], stop - start)
+            else:
+                out[name] = np.asarray(axis[1], np.float64)[rng.integers(len(axis[1]), size=stop - start)]
+        return out
+
+    def values_at(self, indices):
+        """name -> array of the parameter values of arbitrary combinations."""
+        indices = np.asarray(indices)
+        out = {name: np.empty(len(indices)) for name in PARAMETERS}
+        # Random samples can only be rebuilt a whole chunk at a time
+        chunks = indices // _CHUNK
+        for chunk in np.unique(chunks):
+            start = int(chunk) * _CHUNK
+            values = self.values(start, min(start + _CHUNK, self.size))
+            mine = chunks == chunk
+            for name in PARAMETERS:
+                out[name][mine] = values[name][indices[mine] - start]
+        return out
+
+    def bounds(self, name):
+        axis = self.axes[name]
+        if axis[0] == "range":
+            return axis[1], axis[2]
+        return float(np.min(axis[1])), float(np.max(axis[1]))
+
+
+def score(metrics, targets):
+    """Worst |log(value / target)| over targets [(metric, level, target)] per combination."""
+    worst = np.zeros(len(metrics["task_seconds"]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for metric, level, target in targets:
+            miss = np.abs(np.log(metrics[metric][:, level - 1] / target))
+            worst = np.maximum(worst, np.where(np.isfinite(miss), miss, np.inf))
+    return worst
+
+
+class MetricCache:
+    """Metric columns (metric, level) per parameter combination, for one evaluation context.
+
+    Rows are combinations kept sorted by a hash of their parameter values,
+    so a search that overlaps an earlier one (another axis, a wider range,
+    other targets) only evaluates the combinations, or the columns, it has
+    not seen. Unknown cells are NaN.
+    """
+
+    def __init__(self, cache_dir, context):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(SEARCH_VERSION.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(context, sort_keys=True, default=float).encode("utf-8"))
+        self.path = os.path.join(cache_dir, digest.hexdigest())
+        self.params = np.empty((0, len(PARAMETERS)))
+        self.keys = self.hash(self.params)
+        self.columns = {}
+        self._added = []  # (params, {column: values}) of combinations not cached yet
+        self.changed = False
+        try:
+            keys = np.load(os.path.join(self.path, "keys.npy"))
+            params = np.load(os.path.join(self.path, "params.npy"))
+            with open(os.path.join(self.path, "columns.json"), encoding="utf-8") as f:
+                names = json.load(f)
+            columns = {tuple(name): np.load(os.path.join(self.path, f"{name[0]}_{name[1]}.npy")) for name in names}
+        except (OSError, ValueError):
+            keys, params, columns = self.keys, self.params, {}
+        if params.ndim == 2 and params.shape[1] == len(PARAMETERS) and len(keys) == len(params) \
+                and all(len(column) == len(params) for column in columns.values()):
+            self.keys, self.params, self.columns = keys, params, columns
+
+    @staticmethod
+    def hash(params):
+        """uint64 key per row of parameter values."""
+        bits = np.ascontiguousarray(params, np.float64).view(np.uint64)
+        key = np.full(len(bits), 0xCBF29CE484222325, np.uint64)
+        for column in bits.T:
+            key = (key ^ column) * np.uint64(0x100000001B3)
+            key ^= key >> np.uint64(29)
+        return key
+
+    def lookup(self, params):
+        """Row of each combination in the cache, or -1."""
+        if not len(self.keys):
+            return np.full(len(params), -1)
+        keys = self.hash(params)
+        # Sorted needles walk the keys in order, far faster than random probes
+        needles = np.argsort(keys)
+        rows = np.empty(len(keys), np.int64)
+        rows[needles] = np.minimum(np.searchsorted(self.keys, keys[needles]), len(self.keys) - 1)
+        # A hash collision is just a miss
+        found = np.all(self.params[rows] == params, axis=1)
+        return np.where(found, rows, -1)
+
+    def get(self, rows, column):
+        values = np.full(len(rows), np.nan, np.float32)
+        if column in self.columns:
+            known = rows >= 0
+            values[known] = self.columns[column][rows[known]]
+        return values
+
+    def put(self, rows, params, values):
+        """Record values ({column: array}) for combinations; rows < 0 are added on save()."""
+        new = rows < 0
+        for column, column_values in values.items():
+            if column not in self.columns:
+                self.columns[column] = np.full(len(self.params), np.nan, np.float32)
+            self.columns[column][rows[~new]] = column_values[~new]
+        if new.any():
+            self._added.append((params[new], {column: array[new] for column, array in values.items()}))
+        self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        if self._added:
+            added = np.concatenate([params for params, _ in self._added])
+            for column in self.columns:
+                parts = [values.get(column, np.full(len(params), np.nan, np.float32))
+                         for params, values in self._added]
+                self.columns[column] = np.concatenate([self.columns[column]] + parts)
+            self.params = np.concatenate((self.params, added))
+            self._added = []
+            keys = self.hash(self.params)
+            order = np.argsort(keys, kind="stable")
+            self.keys, self.params = keys[order], self.params[order]
+            self.columns = {column: values[order] for column, values in self.columns.items()}
+        os.makedirs(self.path, exist_ok=True)
+        arrays = {"keys": self.keys, "params": self.params}
+        arrays |= {f"{metric}_{level}": values for (metric, level), values in self.columns.items()}
+        for name, array in arrays.items():
+            tmp_path = os.path.join(self.path, f"{name}.{os.getpid()}.tmp.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(self.path, f"{name}.npy"))
+        tmp_path = os.path.join(self.path, f"columns.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(sorted(self.columns), f)
+        os.replace(tmp_path, os.path.join(self.path, "columns.json"))
+        self.changed = False
+
+
+def search(space, context, targets, cache_dir=CACHE_DIR):
+    """(float32 score of every combination in space, how many had to be evaluated)."""
+    cache = MetricCache(cache_dir, context) if cache_dir else None
+    columns = sorted({(metric, level) for metric, level, _ in targets})
+    max_level = max(level for _, level, _ in targets)
+    scores = np.empty(space.size, np.float32)
+    evaluated = 0
+    for start in range(0, space.size, _CHUNK):
+        stop = min(start + _CHUNK, space.size)
+        values = space.values(start, stop)
+        params = np.column_stack([values[name] for name in PARAMETERS])
+        rows = cache.lookup(params) if cache else np.full(stop - start, -1)
+        known = {column: cache.get(rows, column) if cache else np.full(stop - start, np.nan, np.float32)
+                 for column in columns}
+        missing = np.flatnonzero(np.any(np.isnan(np.column_stack(list(known.values()))), axis=1))
+        if len(missing):
+            metrics = evaluate({name: array[missing] for name, array in values.items()}, context, max_level)
+            fresh = {(metric, level): metrics[metric][:, level - 1].astype(np.float32) for metric, level in columns}
+            for column, column_values in fresh.items():
+                known[column][missing] = column_values
+            if cache:
+                cache.put(rows[missing], params[missing], fresh)
+            evaluated += len(missing)
+        # Scored from float32 metrics either way, so cached and fresh runs rank alike
+        table = {metric: np.full((stop - start, max_level), np.nan) for metric in METRICS}
+        for (metric, level), column_values in known.items():
+            table[metric][:, level - 1] = column_values
+        scores[start:stop] = score(table, targets)
+    if cache:
+        cache.save()
+    return scores, evaluated
+
+
+def inert_parameters(space, context, max_level, samples=256):
+    """Parameters whose low and high values give identical metrics on a sample of combinations."""
+    base = space.values(0, min(samples, space.size))
+    if not any(context["reward"]):
+        # An empty baseReward would hide every yield parameter
+        context = context | {"reward": [1.0, 1.0, 1.0]}
+    inert = []
+    for name, default in PARAMETERS.items():
+        lo, hi = space.bounds(name)
+        if lo == hi:
+            lo, hi = (default * 0.5, default * 2.0) if default else (0.0, 1.0)
+        low = evaluate(base | {name: np.full(len(base[name]), lo)}, context, max_level)
+        high = evaluate(base | {name: np.full(len(base[name]), hi)}, context, max_level)
+        if all(np.array_equal(low[metric], high[metric], equal_nan=True) for metric in METRICS):
+            inert.append(name)
+    return inert
+
+
+def best(scores, count):
+    """Indices of the count lowest scores, best first."""
+    count = min(count, len(scores))
+    top = np.argpartition(scores, count - 1)[:count]
+    return top[np.argsort(scores[top], kind="stable")]
+
+
+def parse_param(text):
+    """name=lo:hi:n (grid axis), name=lo:hi (random range) or name=v1,v2,... ."""
+    name, _, spec = text.partition("=")
+    if name not in PARAMETERS:
+        raise ValueError(f"unknown parameter {name!r} (one of {', '.join(PARAMETERS)})")
+    if ":" in spec:
+        parts = [float(part) for part in spec.split(":")]
+        if len(parts) == 3:
+            return name, ("values", np.linspace(parts[0], parts[1], int(parts[2])))
+        if len(parts) == 2:
+            return name, ("range", parts[0], parts[1])
+        raise ValueError(f"{text}: expected lo:hi:n or lo:hi")
+    return name, ("values", np.array([float(part) for part in spec.split(",")]))
+
+
+def parse_target(text):
+    """metric:level=value."""
+    where, _, value = text.partition("=")
+    metric, _, level = where.partition(":")
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {metric!r} (one of {', '.join(METRICS)})")
+    if int(level) < 1:
+        raise ValueError(f"{text}: levels start at 1")
+    return metric, int(level), float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search strategy parameters against target pacing")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=SPEC",
+                        help="lo:hi:n grid axis, lo:hi random range, or v1,v2,... (repeatable)")
+    parser.add_argument("--target", action="append", default=[], required=True, metavar="METRIC:LEVEL=VALUE",
+                        help=f"pacing point to hit, metric one of {', '.join(METRICS)} (repeatable)")
+    parser.add_argument("--random", type=int, default=0, help="sample this many combinations instead of the grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative miss that still counts as a hit (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--morale", type=float, default=100.0)
+    parser.add_argument("--quality", type=float, default=1.0,
+                        help="archetype baseStats.quality (default: %(default)s)")
+    parser.add_argument("--productivity", type=float, default=1.0, help="archetype baseStats.productivity")
+    parser.add_argument("--office", type=float, default=1.0, help="office productivity multiplier")
+    parser.add_argument("--global", dest="global_", type=float, default=1.0, help="global productivity multiplier")
+    parser.add_argument("--revenue", type=float, default=1.0, help="global revenue multiplier")
+    parser.add_argument("--reward", type=float, nargs=3, metavar=("CASH", "RESEARCH", "REPUTATION"),
+                        help="task baseReward (default: the first task definition asset's)")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    try:
+        space = Space(dict(parse_param(text) for text in args.param), args.random, args.seed)
+        targets = [parse_target(text) for text in args.target]
+    except ValueError as e:
+        parser.error(str(e))
+
+    definitions = load_definitions()
+    definition = definitions[0] if definitions else {"base_duration": 30.0, "reward": [0.0, 0.0, 0.0],
+                                                     "difficulty": [(1.0, 1.0), (10.0, 1.0)]}
+    context = {"morale": args.morale, "quality": args.quality, "productivity": args.productivity,
+               "office": args.office, "global": args.global_, "revenue": args.revenue,
+               "duration": definition["base_duration"], "reward": list(args.reward or definition["reward"]),
+               "difficulty": [list(key) for key in definition["difficulty"]]}
+
+    start = time.perf_counter()
+    scores, evaluated = search(space, context, targets, None if args.no_cache else CACHE_DIR)
+    elapsed = time.perf_counter() - start
+    hits = int(np.count_nonzero(scores <= math.log1p(args.tolerance)))
+    print(f"{space.size} combinations ({evaluated} evaluated, the rest from cache) in {elapsed * 1000:.0f} ms; "
+          f"{hits} within {args.tolerance:.0%} of every target")
+
+    swept = [name for name in PARAMETERS if space.bounds(name)[0] != space.bounds(name)[1]]
+    max_level = max(level for _, level, _ in targets)
+    top = best(scores, args.top)
+    values = space.values_at(top)
+    metrics = evaluate(values, context, max_level)
+    header = "".join(f"{name:>20}" for name in swept) + "".join(f"{m}:{l:>3}".rjust(24) for m, l, _ in targets)
+    print(f"{'miss':>8}" + header)
+    for row, index in enumerate(top):
+        line = f"{math.expm1(float(scores[index])):>8.1%}" + "".join(f"{values[name][row]:>20.4g}" for name in swept)
+        line += "".join(f"{metrics[m][row, l - 1]:>24.4g}" for m, l, _ in targets)
+        print(line)
+
+    inert = inert_parameters(space, context, max_level)
+    if inert:
+        print(f"no effect on ComputeRate/ComputeYield: {', '.join(inert)}")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+# Drift of Employee.Tick between frame-rate-driven and fixed-step integration
+# over long horizons, per device profile.
+#
+# Variable step is GameManager.Update ticking every employee with the frame's
+# Time.deltaTime; fixed step is SimulationClock.ConsumeSteps banking frame
+# time and spending it in whole steps of fixedDeltaTime, at most
+# maxStepsPerFrame a frame. Either way Unity has already clipped each
+# Time.deltaTime to Time.maximumDeltaTime (1/3 s), so a hitch loses time in
+# both modes.
+#
+# A frame profile is a target rate with log-normal jitter and Poisson hitches.
+# Every employee works the same task on repeat (TaskService's auto-requeue) at
+# morale 100, so only the step differs. Within a level a task is done on the
+# first tick whose simulated time is at least duration / productivity after
+# the tick that started it, and the rest of that tick is thrown away: that
+# overshoot, up to one step per task, is the integration error. Runs are
+# integrated task by task with searchsorted over the tick times rather than
+# tick by tick, so a day of 144 Hz frames takes seconds; --check confirms
+# it against headless_sim's tick loop. The exact count is fast_forward's.
+#
+#   python timestep_drift.py --hours 24
+#   python timestep_drift.py --hours 72 --step 0.1 --profiles phone-30 desktop-144
+#   python timestep_drift.py --check
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from fast_forward import FastForward
+from headless_sim import EmployeeColumns, HeadlessSim, load_task_durations
+
+MAX_DELTA_TIME = 1.0 / 3.0  # Time.maximumDeltaTime default
+FIXED_DELTA_TIME = 0.05  # SimulationClock.fixedDeltaTime
+MAX_STEPS_PER_FRAME = 8  # SimulationClock.maxStepsPerFrame
+WINDOW = 1 << 18
+
+# name -> (frames per second, jitter sigma, hitches per second, mean hitch seconds)
+PROFILES = {
+    "desktop-144": (144.0, 0.03, 0.01, 0.05),
+    "desktop-60": (60.0, 0.05, 0.02, 0.1),
+    "phone-30": (30.0, 0.1, 0.05, 0.25),
+    "phone-throttled": (20.0, 0.2, 0.1, 0.5),
+}
+
+
+def frame_deltas(profile, seconds, seed=0, max_delta=MAX_DELTA_TIME):
+    """Time.deltaTime for every frame of seconds of wall-clock time, in windows (float32, clipped)."""
+    fps, jitter, hitch_rate, hitch_sec = profile
+    rng = np.random.default_rng(seed)
+    wall = 0.0
+    while wall < seconds:
+        raw = rng.lognormal(-jitter * jitter / 2, jitter, WINDOW) / fps
+        hitch = rng.random(WINDOW) < hitch_rate / fps
+        raw[hitch] += rng.exponential(hitch_sec, int(hitch.sum()))
+        elapsed = np.cumsum(raw) + wall
+        end = int(np.searchsorted(elapsed, seconds, "right")) + 1
+        wall = float(elapsed[min(end, WINDOW) - 1])
+        yield np.minimum(raw[:end], max_delta).astype(np.float32)
+
+
+class FixedStepClock:
+    """SimulationClock.ConsumeSteps over whole windows of frames."""
+
+    def __init__(self, step=FIXED_DELTA_TIME, max_steps=MAX_STEPS_PER_FRAME):
+        self.step = float(np.float32(step))
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def consume(self, deltas):
+        """Steps run on each frame."""
+        steps = np.empty(len(deltas), np.int64)
+        i = 0
+        while i < len(deltas):
+            # Uncapped, the steps so far are floor(banked time / step); restart at each capped frame
+            banked = self.accumulator + np.cumsum(deltas[i:], dtype=np.float64)
+            total = np.floor(banked / self.step)
+            per_frame = np.diff(total, prepend=0.0).astype(np.int64)
+            over = np.flatnonzero(per_frame > self.max_steps)
+            end = over[0] if len(over) else len(per_frame)
+            steps[i:i + end] = per_frame[:end]
+            if end == len(per_frame):
+                self.accumulator = float(banked[-1] - total[-1] * self.step)
+                break
+            accumulator = float(banked[end] - (total[end - 1] if end else 0.0) * self.step)
+            budget = 2.0 * self.max_steps * self.step
+            if accumulator > budget:
+                self.dropped += accumulator - budget
+                accumulator = budget
+            steps[i + end] = self.max_steps
+            self.accumulator = accumulator - self.max_steps * self.step
+            i += end + 1
+        return steps
+
+
+def variable_ticks(windows):
+    """Simulated time at the end of every variable-step tick."""
+    now = 0.0
+    for deltas in windows:
+        ticks = now + np.cumsum(deltas, dtype=np.float64)
+        now = float(ticks[-1])
+        yield ticks
+
+
+def fixed_ticks(windows, clock):
+    """Simulated time at the end of every fixed step."""
+    done = 0
+    for deltas in windows:
+        count = int(clock.consume(deltas).sum())
+        yield (done + np.arange(1, count + 1)) * clock.step
+        done += count
+
+
+def integrate(ticks, base_productivity, duration):
+    """Completions and levels after the given tick times, one task at a time for every employee."""
+    base = np.asarray(base_productivity, np.float64)
+    level = np.ones(len(base))
+    experience = np.zeros(len(base))
+    completed = np.zeros(len(base), np.int64)
+    started = np.zeros(len(base))
+    now = 0.0
+    for window in ticks:
+        if not len(window):
+            continue
+        now = float(window[-1])
+        while True:
+            # The tick that finishes the current task, if it is in this window
+            need = duration / (base * (1.0 + (level - 1.0) * 0.1))
+            j = np.searchsorted(window, started + need)
+            done = np.flatnonzero(j < len(window))
+            if not len(done):
+                break
+            started[done] = window[j[done]]
+            completed[done] += 1
+            experience[done] += 10.0
+            threshold = level[done] * 100.0
+            up = experience[done] >= threshold
+            experience[done] -= np.where(up, threshold, 0.0)
+            level[done] += up
+    return {"completed": completed, "level": level, "time": now}
+
+
+def exact(base_productivity, duration, seconds):
+    """Continuous-time completions (fast_forward) after seconds at morale 100."""
+    n = len(base_productivity)
+    ff = FastForward(np.ones(n), np.full(n, 100.0), np.zeros(n), np.full(n, duration), base_productivity,
+                     np.full(n, duration))
+    ff.advance(seconds)
+    return ff.completed
+
+
+def check(seconds=600.0, employees=16, seed=1):
+    """Compare integrate() with headless_sim's tick loop; returns the number of employees that differ."""
+    duration = 30.0
+    base = np.linspace(0.5, 2.0, employees)
+    mismatches = 0
+    for profile in ("desktop-60", "phone-throttled"):
+        deltas = np.concatenate(list(frame_deltas(PROFILES[profile], seconds, seed)))
+        clock = FixedStepClock()
+        steps = np.repeat(np.float32(clock.step), clock.consume(deltas).sum())
+        for mode, dts in (("variable", deltas), ("fixed", steps)):
+            columns = EmployeeColumns(employees)
+            columns.base_productivity[:] = base
+            sim = HeadlessSim(columns, [duration])
+            sim.assign(np.ones(employees, bool), 0)
+            for dt in dts:
+                sim.step(dt, auto_assign=True)
+            ticks = variable_ticks([deltas]) if mode == "variable" else fixed_ticks([deltas], FixedStepClock())
+            result = integrate(ticks, base, duration)
+            # float32 remaining in the tick loop against float64 times here: a task ending exactly on
+            # a tick may finish a tick either side, and that one completion can carry a level-up
+            gap = result["completed"] - columns.completed
+            differ = (np.abs(gap) > 1) | ((gap == 0) & (result["level"] != columns.level))
+            mismatches += int(np.count_nonzero(differ))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure variable- vs fixed-step drift of Employee.Tick")
+    parser.add_argument("--hours", type=float, default=24.0, help="wall-clock hours per run (default: %(default)s)")
+    parser.add_argument("--employees", type=int, default=16,
+                        help="employees with base productivity spread over 0.5..2 (default: %(default)s)")
+    parser.add_argument("--step", type=float, default=FIXED_DELTA_TIME, help="fixedDeltaTime (default: %(default)s)")
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS_PER_FRAME,
+                        help="maxStepsPerFrame (default: %(default)s)")
+    parser.add_argument("--max-delta", type=float, default=MAX_DELTA_TIME,
+                        help="Time.maximumDeltaTime (default: %(default).3f)")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="verify the task-by-task integration and exit")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        mismatches = check()
+        print("task-by-task integration matches the tick loop" if not mismatches
+              else f"{mismatches} employee runs diverge from the tick loop")
+        return 1 if mismatches else 0
+
+    duration = next(iter((load_task_durations() or {"default": 30.0}).values()))
+    base = np.linspace(0.5, 2.0, args.employees)
+    seconds = args.hours * 3600.0
+    errors = {"variable": [], "fixed": []}
+    lost = []
+    print(f"{args.employees} employees on a {duration:g} s task, {args.hours:g} h wall clock, "
+          f"fixed step {args.step:g} s (at most {args.max_steps} a frame)")
+    print(f"{'profile':<16}{'mode':<10}{'sim h':>9}{'dropped s':>11}{'completions':>13}{'vs exact':>10}"
+          f"{'mean level':>12}{'run s':>7}")
+    for index, name in enumerate(args.profiles):
+        seed = [args.seed, index]
+        clock = FixedStepClock(args.step, args.max_steps)
+        runs = (("variable", variable_ticks(frame_deltas(PROFILES[name], seconds, seed, args.max_delta)), None),
+                ("fixed", fixed_ticks(frame_deltas(PROFILES[name], seconds, seed, args.max_delta), clock), clock))
+        for mode, ticks, run_clock in runs:
+            started = time.perf_counter()
+            result = integrate(ticks, base, duration)
+            elapsed = time.perf_counter() - started
+            completed = int(result["completed"].sum())
+            reference = int(exact(base, duration, result["time"]).sum())
+            errors[mode].append((completed / reference - 1) * 100)
+            dropped = run_clock.dropped if run_clock else 0.0
+            if mode == "variable":
+                lost.append(1 - result["time"] / seconds)
+            print(f"{name:<16}{mode:<10}{result['time'] / 3600:>9.3f}{dropped:>11.1f}{completed:>13}"
+                  f"{(completed / reference - 1) * 100:>+9.3f}%{result['level'].mean():>12.2f}{elapsed:>7.1f}")
+    # Integration error is the frame-rate dependence; clipped time is lost whatever the step
+    for mode, values in errors.items():
+        print(f"{mode} step: error against exact {min(values):+.3f}% to {max(values):+.3f}% across profiles")
+    print(f"simulated time lost to Time.maximumDeltaTime: up to {max(lost) * 100:.2f}% in either mode")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Stable .meta files for generated C# scripts.
+# Unity keys every serialized m_Script reference (e.g. the guid in
+# Assets/Data/Tasks/Task_.asset) on the script's .meta GUID. Emitting the .meta
+# ourselves, with a GUID that is reused when one already exists and otherwise
+# derived from namespace + type name, keeps those references intact across a
+# wipe-and-regenerate and saves Unity from inventing new ones on import.
+import hashlib
+import os
+import re
+
+from generator_drift import index_by_name, index_checked_in, locate
+
+_NAMESPACE = re.compile(r"^\s*namespace\s+([\w.]+)", re.M)
+_TYPE = re.compile(
+    r"^[ \t]*(?:\[[^\]]*\][ \t]*)*(?:(?:public|internal|private|protected|static|sealed|abstract|partial|readonly)\s+)*"
+    r"(?:class|struct|interface|enum|record)\s+(\w+)", re.M)
+_GUID = re.compile(r"^guid:\s*([0-9a-f]{32})\s*$", re.M)
+
+
+def primary_type(source, file_name=None):
+    """(namespace, type name) the script is known by.
+
+    Prefers the type named after the file, as Unity does for MonoBehaviours and
+    ScriptableObjects; otherwise the first declared type.
+    """
+    match = _NAMESPACE.search(source)
+    namespace = match.group(1) if match else ""
+    types = _TYPE.findall(source)
+    stem = os.path.splitext(os.path.basename(file_name))[0] if file_name else None
+    if stem in types:
+        return namespace, stem
+    return namespace, types[0] if types else stem
+
+
+def derive_guid(namespace, type_name):
+    """Deterministic 32-hex-digit GUID for a namespace-qualified type."""
+    qualified = f"{namespace}.{type_name}" if namespace else type_name
+    return hashlib.md5(qualified.encode("utf-8")).hexdigest()
+
+
+def read_guid(meta_path):
+    """GUID recorded in an existing .meta file, or None."""
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            match = _GUID.search(f.read())
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def meta_text(guid):
+    # Same minimal form Unity writes for the checked-in scripts
+    return f"fileFormatVersion: 2\nguid: {guid}"
+
+
+def guid_for(path, source, seed=None, file_name=None):
+    """GUID for the script at path: its own .meta, then seed, then derived.
+
+    path is None when the output has no existing copy to read (e.g. an archive).
+    """
+    existing = read_guid(path + ".meta") if path else None
+    return existing or seed or derive_guid(*primary_type(source, path or file_name))
+
+
+def checked_in_guids(categories, repo_dir):
+    """Generated folder/name -> GUID of the checked-in counterpart's .meta."""
+    index = index_checked_in(repo_dir)
+    by_name = index_by_name(index)
+    seeds = {}
+    for category in categories:
+        for name in category.registered:
+            rel_path = locate(category.folder, name, index, by_name)
+            guid = read_guid(index[rel_path] + ".meta") if rel_path else None
+            if guid:
+                seeds[f"{category.folder}/{name}"] = guid
+    return seeds
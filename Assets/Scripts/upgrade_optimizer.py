@@ -0,0 +1,543 @@
+# Purchase-order optimizer over the upgrade prerequisite DAG.
+# Answers "what is the fastest way to own upgrade X (at level k)", or to reach
+# a cash income, starting from an empty save.
+#
+# Content: every UpgradeDefinitionSO asset under Assets/Data (or a seeded
+# synthetic tree, --synthetic N). Each upgrade level's cost is
+# GetCostForLevel(level), with costScaling evaluated exactly. Levels are
+# bought in order, after every prerequisite and only at or above
+# requiredLevel.
+#
+# Economy: the headless simulation rules at a fixed employee level. Each
+# employee auto-requeues one task definition and earns
+# baseReward * difficultyMultiplier * qualityCurve(quality) per task, at
+# base * (1 + (level - 1) * 0.1) / duration tasks per second. Each upgrade
+# level multiplies productivity and revenue and scales task duration by
+# (1 - durationReduction), globally or, for Task upgrades with a targetId,
+# for that definition only. UpgradeService does not apply effects yet, so
+# this is the intended rule rather than a transcription.
+#
+# Search: a purchase is always made as soon as it is affordable, so an order
+# fixes the timeline.
+#   incumbent    a beam search over purchase counts (--beam; width 1 is the
+#                greedy order), ranking states by when the goal would finish
+#                if nothing else were bought first
+#   bound        spending S on levels the goal does not need must first be
+#                earned and raises income by at most the fractional-knapsack
+#                log gain of S; the wait minimized over S is admissible
+#   memo         per owned-level state, the (time, balance - rate * time)
+#                already reached; a path that is no earlier and no richer than
+#                one of those is dominated, because the state fixes all
+#                future income
+#   prune        levels the goal does not need that cost at least its whole
+#                remaining cost are never bought
+# A depth-first branch and bound then tries to beat or prove the incumbent
+# until --node-limit / --time-limit, or until --stall nodes go by without a
+# better plan. It reports whether the plan is proven optimal, or else the gap
+# to the root bound. Past a few dozen upgrades a proof is out of reach: the
+# depth-first search only shaves hundredths of a percent off the beam's plan
+# and gives up after --stall nodes, so a 300-upgrade tree answers in about
+# 2 s with the beam's plan and the gap (or no gap, for income goals, which
+# have no bound).
+#
+#   python upgrade_optimizer.py --goal hq_expansion:3 --employees 10 --reward 5 1 0.1
+#   python upgrade_optimizer.py --synthetic 300 --max-level 10 --goal-income 50000
+import argparse
+import glob
+import math
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from animation_curve import DEFAULT_CURVES, parse_curves
+from balance_sweep import load_definitions, task_reward
+from generator_registry import SCRIPTS_DIR
+from headless_sim import DATA_DIR, read_asset_fields
+from unity_meta import read_guid
+
+CURRENCIES = ("cash", "research", "reputation")
+TARGETS = ("Global", "Office", "Employee", "Task")
+LEVEL_STEP = 0.1
+_COST_BLOCK = re.compile(r"^  cost:\n((?:    \w+: .*\n)+)", re.M)
+_LIST_FIELD = r"^  {name}:(?: \[\])?\n((?:  - .*\n)*)"
+
+
+class Upgrade:
+    """One UpgradeDefinitionSO."""
+
+    def __init__(self, id, cost, productivity=1.0, revenue=1.0, duration_reduction=0.0, prerequisites=(),
+                 required_level=1.0, repeatable=False, max_level=1, cost_scaling=None, target="Global",
+                 target_id="", name=None):
+        self.id = id
+        self.name = name or id
+        self.cost = np.asarray(cost, np.float64)
+        # OnValidate's clamps
+        self.productivity = max(0.1, productivity)
+        self.revenue = max(0.1, revenue)
+        self.duration_reduction = min(max(duration_reduction, 0.0), 1.0)
+        self.prerequisites = list(prerequisites)
+        self.required_level = required_level
+        self.repeatable = repeatable
+        self.max_level = max(1, max_level) if repeatable else 1
+        self.cost_scaling = cost_scaling or DEFAULT_CURVES["UpgradeDefinitionSO.costScaling"]
+        self.target = target
+        self.target_id = target_id
+
+    def cost_for_level(self, level):
+        """GetCostForLevel."""
+        if not self.repeatable or level <= 1:
+            return self.cost
+        return self.cost * self.cost_scaling.evaluate(level)
+
+
+def _upgrade_script_guid(scripts_dir=SCRIPTS_DIR):
+    return read_guid(os.path.join(scripts_dir, "Data", "UpgradeDefinitionSO.cs.meta"))
+
+
+def load_upgrades(data_dir=DATA_DIR, scripts_dir=SCRIPTS_DIR):
+    """Every UpgradeDefinitionSO asset under data_dir."""
+    guid = _upgrade_script_guid(scripts_dir)
+    upgrades = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "**", "*.asset"), recursive=True)):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if not guid or f"guid: {guid}" not in text:
+            continue
+        fields = read_asset_fields(path)
+        cost = dict.fromkeys(CURRENCIES, 0.0)
+        block = _COST_BLOCK.search(text)
+        if block:
+            for key, value in re.findall(r"(\w+): (\S+)", block.group(1)):
+                if key in cost:
+                    cost[key] = float(value)
+        prerequisites = re.search(_LIST_FIELD.format(name="prerequisiteUpgrades"), text, re.M)
+        target = int(fields.get("target", 0))
+        upgrades.append(Upgrade(
+            id=fields.get("id") or fields.get("m_Name", "").lower().replace(" ", "_"),
+            name=fields.get("displayName") or fields.get("m_Name"),
+            cost=[cost[c] for c in CURRENCIES],
+            productivity=float(fields.get("productivityMultiplier", 1)),
+            revenue=float(fields.get("revenueMultiplier", 1)),
+            duration_reduction=float(fields.get("durationReduction", 0)),
+            prerequisites=re.findall(r"^  - (.+)$", prerequisites.group(1), re.M) if prerequisites else [],
+            required_level=float(fields.get("requiredLevel", 1)),
+            repeatable=fields.get("isRepeatable") == "1",
+            max_level=int(fields.get("maxLevel", 1)),
+            cost_scaling=parse_curves(text).get("costScaling"),
+            target=TARGETS[target] if target < len(TARGETS) else "Global",
+            target_id=fields.get("targetId", ""),
+        ))
+    return upgrades
+
+
+def synthetic_upgrades(count, max_level=10, seed=0):
+    """A seeded random upgrade tree for sizing the search: layered prerequisites, mixed effects."""
+    rng = np.random.default_rng(seed)
+    upgrades = []
+    for i in range(count):
+        tier = i * 10 // count
+        earlier = [u.id for u in upgrades[:i]]
+        prerequisites = list(rng.choice(earlier, size=min(len(earlier), int(rng.integers(0, 3))), replace=False)) \
+            if earlier and tier else []
+        kind = rng.integers(4)
+        repeatable = bool(rng.random() < 0.5)
+        upgrades.append(Upgrade(
+            id=f"upgrade_{i}",
+            cost=[50.0 * 2.2 ** tier * rng.uniform(0.5, 1.5), 10.0 * tier * rng.uniform(0, 1), 0.0],
+            productivity=1.0 + (rng.uniform(0.02, 0.1) if kind == 0 else 0.0),
+            revenue=1.0 + (rng.uniform(0.02, 0.1) if kind == 1 else 0.0),
+            duration_reduction=rng.uniform(0.01, 0.05) if kind == 2 else 0.0,
+            prerequisites=prerequisites,
+            repeatable=repeatable,
+            max_level=int(rng.integers(2, max_level + 1)) if repeatable else 1,
+        ))
+    return upgrades
+
+
+class Problem:
+    """Upgrades as arrays, plus the base economy and the goal."""
+
+    def __init__(self, upgrades, base_income, definition_ids, goal=None, goal_level=1, goal_income=None,
+                 employee_level=1.0):
+        self.upgrades = upgrades
+        self.index = {u.id: i for i, u in enumerate(upgrades)}
+        missing = sorted({p for u in upgrades for p in u.prerequisites} - set(self.index))
+        if missing:
+            raise ValueError(f"unknown prerequisites: {', '.join(missing)}")
+        if goal is not None and goal not in self.index:
+            raise ValueError(f"no upgrade with id {goal!r}")
+        if goal is not None and not 1 <= goal_level <= upgrades[self.index[goal]].max_level:
+            raise ValueError(f"{goal} has levels 1 to {upgrades[self.index[goal]].max_level}, not {goal_level}")
+        count = len(upgrades)
+        self.max_level = np.array([u.max_level for u in upgrades])
+        self.available = np.array([u.required_level <= employee_level for u in upgrades])
+        self.prerequisites = [[self.index[p] for p in u.prerequisites] for u in upgrades]
+        # cost[u, k] = GetCostForLevel(k + 1)
+        self.cost = np.full((count, max(self.max_level, default=1), len(CURRENCIES)), np.inf)
+        for i, u in enumerate(upgrades):
+            for level in range(1, u.max_level + 1):
+                self.cost[i, level - 1] = u.cost_for_level(level)
+        # base_income[d]: currencies per second of the employees on definition d
+        self.base_income = np.asarray(base_income, np.float64)
+        # effect[u, d]: income factor per level of u on definition d
+        self.effect = np.ones((count, len(definition_ids)))
+        for i, u in enumerate(upgrades):
+            factor = u.productivity * u.revenue / (1.0 - min(u.duration_reduction, 0.99))
+            if u.target == "Task" and u.target_id:
+                self.effect[i, [d == u.target_id for d in definition_ids]] = factor
+            else:
+                self.effect[i] = factor
+        self.goal = self.index.get(goal)
+        self.goal_level = goal_level if goal is not None else 0
+        self.goal_income = goal_income
+        # Levels the goal needs: its own, and level 1 of everything it depends on
+        self.required = np.zeros(count, np.int64)
+        if self.goal is not None:
+            self.required[self.goal] = self.goal_level
+            stack = [self.goal]
+            while stack:
+                for p in self.prerequisites[stack.pop()]:
+                    if not self.required[p]:
+                        self.required[p] = 1
+                        stack.append(p)
+            if not self.available[self.required > 0].all():
+                raise ValueError("the goal depends on upgrades above the employee level")
+        # Upgrades the search considers: the goal's closure plus anything raising income
+        self.useful = (self.required > 0) | ((self.effect != 1.0).any(axis=1) & self.available)
+        self._log_effect = np.log(self.effect)
+        # Upper bound on the income factor of one level, whichever definition it targets
+        self._gain = np.maximum(self._log_effect.max(axis=1), 0.0)
+        self._goal_levels = np.arange(self.cost.shape[1]) < self.required[:, None]
+        self._level_index = np.arange(self.cost.shape[1])
+        edges = [(p, u) for u, prerequisites in enumerate(self.prerequisites) for p in prerequisites]
+        self._edge_from, self._edge_to = (np.array(side, np.int64) for side in zip(*edges)) if edges else \
+            (np.zeros(0, np.int64), np.zeros(0, np.int64))
+
+    def log_income(self, levels):
+        """Per-definition log income factor with the given owned levels."""
+        return levels @ self._log_effect
+
+    def income(self, levels):
+        """Currencies per second with the given owned levels."""
+        return np.exp(self.log_income(levels)) @ self.base_income
+
+    def remaining_cost(self, levels):
+        """Total cost of the levels the goal still needs."""
+        total = np.zeros(len(CURRENCIES))
+        for u in np.flatnonzero(self.required > levels):
+            total += self.cost[u, levels[u]:self.required[u]].sum(axis=0)
+        return total
+
+    def worthwhile(self, remaining):
+        """Mask of upgrade levels that can still shorten the path to the goal.
+
+        A level beyond what the goal needs that costs at least the goal's
+        remaining cost in every currency the goal still needs is never worth
+        buying: by the time it is affordable, so is the rest of the goal.
+        """
+        if self.goal is None:
+            return np.isfinite(self.cost[..., 0]) & self.useful[:, None]
+        needed = remaining > 0
+        cheaper = (self.cost[..., needed] < remaining[needed]).any(axis=-1) if needed.any() else False
+        return self._goal_levels | (cheaper & self.useful[:, None])
+
+    def time_bound(self, levels, balance, rate, remaining, worthwhile):
+        """Lower bound on the seconds until the goal's remaining cost is affordable.
+
+        Spending S of a currency on levels the goal does not need raises
+        income by at most exp(F(S)), F being the fractional-knapsack log gain
+        of those levels, and adds S to what must be earned. With balance b and
+        remaining cost R the wait is then at least
+        (integral of exp(-F) from b to S + R * exp(-F(S))) / rate, which is
+        monotone between knapsack breakpoints, so its minimum over S is taken
+        at a breakpoint or at b. Levels the goal needs count as free gain.
+        """
+        open_levels = worthwhile & (self._level_index >= levels[:, None])
+        owner, level = np.nonzero(open_levels)
+        gain = self._gain[owner]
+        needed = level < self.required[owner]
+        costs = self.cost[open_levels]
+        seconds = 0.0
+        for c in np.flatnonzero(remaining > balance):
+            if rate[c] <= 0:
+                return math.inf
+            b, total = balance[c], remaining[c]
+            cost = costs[:, c]
+            free = gain[needed | (cost <= 0)].sum()
+            paid = ~needed & (cost > 0) & (gain > 0)
+            slope = gain[paid] / cost[paid]
+            order = np.argsort(-slope)
+            slope = slope[order]
+            edges = np.concatenate(([0.0], np.cumsum(cost[paid][order])))
+            log_gain = np.concatenate(([0.0], np.cumsum(gain[paid][order])))
+            # exp(-F) integrated from b to each breakpoint at or above it
+            lo = np.maximum(edges[:-1], b)
+            width = np.maximum(edges[1:] - lo, 0.0)
+            start = log_gain[:-1] + slope * (lo - edges[:-1])
+            integral = np.concatenate(([0.0], np.cumsum(np.exp(-start) * -np.expm1(-slope * width) / slope)))
+            at_or_above = np.where(edges >= b, integral + total * np.exp(-log_gain), np.inf)
+            # Breakpoints below b: only b - S of the balance is left for the goal
+            below = np.where(edges < b, (total - b + edges) * np.exp(-log_gain), np.inf)
+            k = np.searchsorted(edges, b, side="right") - 1
+            f_b = log_gain[k] + (slope[k] * (b - edges[k]) if k < len(slope) else 0.0)
+            wait = min(at_or_above.min(), below.min(), (total - b) * math.exp(-f_b))
+            seconds = max(seconds, wait * math.exp(-free) / rate[c])
+        return seconds
+
+    def candidates(self, levels):
+        """Upgrades whose next level can be bought now."""
+        blocked = np.bincount(self._edge_to[levels[self._edge_from] == 0], minlength=len(levels)) > 0
+        return np.flatnonzero(self.useful & (levels < self.max_level) & ~(blocked & (levels == 0)))
+
+    def done(self, levels, rate):
+        if self.goal is not None:
+            return levels[self.goal] >= self.goal_level
+        return rate[0] * 3600.0 >= self.goal_income
+
+
+def _wait(need, rate):
+    """Seconds until every currency covers need at rate (inf if it never does), along the last axis."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seconds = np.where(need > 0, need / rate, 0.0)
+    seconds = np.where(np.isnan(seconds), np.inf, seconds)
+    return seconds.max(axis=-1)
+
+
+class _Search:
+    def __init__(self, problem, node_limit, time_limit, stall):
+        self.problem = problem
+        self.node_limit = node_limit
+        self.deadline = time.perf_counter() + time_limit
+        self.stall = stall
+        self.nodes = 0
+        self.improved_at = 0
+        self.exhausted = True
+        self.best_time = math.inf
+        self.best_plan = None
+        self.memo = {}
+
+    def bound(self, levels, clock, balance, rate):
+        if self.problem.goal is None:
+            return clock
+        remaining = self.problem.remaining_cost(levels)
+        worthwhile = self.problem.worthwhile(remaining)
+        return clock + self.problem.time_bound(levels, balance, rate, remaining, worthwhile)
+
+    def children(self, levels, clock, balance, rate):
+        """Feasible next purchases, best estimate first: arrays of u, time bought, balance after, rate after, estimate."""
+        problem = self.problem
+        remaining = problem.remaining_cost(levels)
+        options = problem.candidates(levels)
+        options = options[problem.worthwhile(remaining)[options, levels[options]]]
+        cost = problem.cost[options, levels[options]]
+        wait = _wait(cost - balance, rate)
+        keep = np.isfinite(wait)
+        options, cost, wait = options[keep], cost[keep], wait[keep]
+        bought = clock + wait
+        after = balance + rate * wait[:, None] - cost
+        new_rate = np.exp(problem.log_income(levels) + problem._log_effect[options]) @ problem.base_income
+        if problem.goal is not None:
+            counts = levels[options] < problem.required[options]
+            estimate = bought + _wait(remaining - cost * counts[:, None] - after, new_rate)
+        else:
+            # The cheapest path to the income target is unknown: favour income gained per second waited
+            estimate = -(new_rate[:, 0] - rate[0]) / (wait + 1.0)
+        order = np.argsort(estimate, kind="stable")
+        return options[order], bought[order], after[order], new_rate[order], estimate[order]
+
+    def beam(self, levels, balance, rate, width):
+        """Incumbent from a beam search: per purchase count, the best states by estimated finish.
+
+        Width 1 is the greedy order.
+        """
+        frontier = [(levels, 0.0, balance, rate, [])]
+        while frontier:
+            expanded = []
+            for parent, (levels, clock, balance, rate, _) in enumerate(frontier):
+                self.nodes += 1
+                options = self.children(levels, clock, balance, rate)
+                expanded.append((np.full(len(options[0]), parent),) + options)
+            parents, options, bought, after, new_rate, estimate = (np.concatenate(column) for column in
+                                                                   zip(*expanded))
+            pool, seen = [], set()
+            for i in np.argsort(estimate, kind="stable"):
+                if len(pool) == width:
+                    break
+                if bought[i] >= self.best_time - 1e-9:
+                    continue
+                levels, _, _, _, plan = frontier[parents[i]]
+                child = levels.copy()
+                child[options[i]] += 1
+                step = plan + [(int(options[i]), int(child[options[i]]), float(bought[i]))]
+                if self.problem.done(child, new_rate[i]):
+                    self.best_time, self.best_plan = float(bought[i]), step
+                    self.improved_at = self.nodes
+                    continue
+                key = child.tobytes()
+                if key not in seen:
+                    seen.add(key)
+                    pool.append((child, bought[i], after[i], new_rate[i], step))
+            frontier = pool
+            if time.perf_counter() > self.deadline:
+                self.exhausted = False
+                return
+
+    def dominated(self, levels, clock, balance, rate):
+        key = levels.tobytes()
+        value = balance - rate * clock
+        seen = self.memo.setdefault(key, [])
+        for old_clock, old_value in seen:
+            if old_clock <= clock + 1e-9 and (old_value >= value - 1e-9).all():
+                return True
+        seen[:] = [(c, v) for c, v in seen if not (clock <= c + 1e-9 and (value >= v - 1e-9).all())]
+        seen.append((clock, value))
+        return False
+
+    def run(self, levels, clock, balance, rate, plan):
+        self.nodes += 1
+        if self.nodes >= self.node_limit or self.nodes - self.improved_at >= self.stall \
+                or (self.nodes & 255 == 0 and time.perf_counter() > self.deadline):
+            self.exhausted = False
+            return
+        if self.problem.done(levels, rate):
+            if clock < self.best_time - 1e-9:
+                self.best_time, self.best_plan = float(clock), list(plan)
+                self.improved_at = self.nodes
+            return
+        if self.bound(levels, clock, balance, rate) >= self.best_time - 1e-9:
+            return
+        if self.dominated(levels, clock, balance, rate):
+            return
+        for u, bought, after, new_rate, _ in zip(*self.children(levels, clock, balance, rate)):
+            if not self.exhausted:
+                return
+            if bought >= self.best_time - 1e-9:
+                continue
+            levels[u] += 1
+            plan.append((int(u), int(levels[u]), float(bought)))
+            self.run(levels, bought, after, new_rate, plan)
+            plan.pop()
+            levels[u] -= 1
+
+
+class Result:
+    def __init__(self, plan, seconds, optimal, nodes, greedy_seconds, lower_bound, elapsed):
+        self.plan = plan  # [(upgrade index, level, time bought)]
+        self.seconds = seconds
+        self.optimal = optimal
+        self.nodes = nodes
+        self.greedy_seconds = greedy_seconds
+        self.lower_bound = lower_bound
+        self.elapsed = elapsed
+
+
+def optimize(problem, node_limit=200_000, time_limit=2.0, beam_width=32, stall=10_000):
+    """Fastest purchase order to the goal found within the limits."""
+    start = time.perf_counter()
+    search = _Search(problem, node_limit, time_limit, stall)
+    levels = np.zeros(len(problem.upgrades), np.int64)
+    balance = np.zeros(len(CURRENCIES))
+    rate = problem.income(levels)
+    search.beam(levels, balance, rate, 1)
+    greedy_seconds = search.best_time
+    if beam_width > 1:
+        search.beam(levels, balance, rate, beam_width)
+    lower_bound = search.bound(levels, 0.0, balance, rate)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10 * int(problem.max_level.sum()) + 1000))
+    try:
+        search.run(levels, 0.0, balance, rate, [])
+    finally:
+        sys.setrecursionlimit(limit)
+    return Result(search.best_plan, search.best_time, search.exhausted, search.nodes, greedy_seconds,
+                  lower_bound, time.perf_counter() - start)
+
+
+def base_income(definitions, employees, level=1.0, productivity=1.0, quality=1.0, revenue=1.0):
+    """Currencies per second per task definition, employees split evenly across definitions."""
+    rows = []
+    for i, definition in enumerate(definitions):
+        share = employees // len(definitions) + (1 if i < employees % len(definitions) else 0)
+        tasks_per_second = share * productivity * (1.0 + (level - 1.0) * LEVEL_STEP) / definition["base_duration"]
+        rows.append(task_reward(definition, level, quality, revenue) * tasks_per_second)
+    return np.array(rows)
+
+
+def _duration(seconds):
+    if not math.isfinite(seconds):
+        return "never"
+    hours, rest = divmod(seconds, 3600)
+    return f"{int(hours)}h{int(rest // 60):02d}m{rest % 60:04.1f}s"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the fastest upgrade purchase order to a goal")
+    goal = parser.add_mutually_exclusive_group(required=True)
+    goal.add_argument("--goal", help="upgrade id to own, optionally id:level")
+    goal.add_argument("--goal-income", type=float, help="cash per hour to reach")
+    parser.add_argument("--synthetic", type=int, help="use a seeded synthetic tree of this many upgrades")
+    parser.add_argument("--max-level", type=int, default=10, help="with --synthetic, levels per repeatable upgrade")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--employees", type=int, default=5)
+    parser.add_argument("--level", type=float, default=1.0, help="employee level for the economy (default: 1)")
+    parser.add_argument("--reward", type=float, nargs=3, metavar=("CASH", "RESEARCH", "REPUTATION"),
+                        help="override every task definition's baseReward")
+    parser.add_argument("--beam", type=int, default=32, help="beam width of the incumbent search (default: %(default)s)")
+    parser.add_argument("--node-limit", type=int, default=200_000)
+    parser.add_argument("--time-limit", type=float, default=2.0, help="seconds of search (default: %(default)s)")
+    parser.add_argument("--stall", type=int, default=10_000,
+                        help="stop after this many nodes without a better plan (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    upgrades = synthetic_upgrades(args.synthetic, args.max_level, args.seed) if args.synthetic else load_upgrades()
+    if not upgrades:
+        parser.error("no UpgradeDefinitionSO assets under Assets/Data; try --synthetic 300")
+    definitions = load_definitions() or [{"name": "default", "base_duration": 30.0, "reward": [0.0, 0.0, 0.0],
+                                         "difficulty": [(1.0, 1.0), (10.0, 1.0)]}]
+    if args.reward:
+        for definition in definitions:
+            definition["reward"] = list(args.reward)
+    elif args.synthetic:
+        for definition in definitions:
+            definition["reward"] = [5.0, 1.0, 0.1]
+    income = base_income(definitions, args.employees, args.level)
+
+    goal_id, goal_level = None, 1
+    if args.goal:
+        goal_id, _, level = args.goal.partition(":")
+        if not (level or "1").isdigit():
+            parser.error(f"--goal level must be a whole number, not {level!r}")
+        goal_level = int(level or 1)
+    try:
+        problem = Problem(upgrades, income, [d["name"] for d in definitions], goal_id, goal_level,
+                          args.goal_income, args.level)
+    except ValueError as e:
+        parser.error(str(e))
+
+    result = optimize(problem, args.node_limit, args.time_limit, args.beam, args.stall)
+    print(f"{len(upgrades)} upgrades, {int(problem.max_level.sum())} levels, "
+          f"{int(problem.useful.sum())} considered; searched {result.nodes} nodes in {result.elapsed:.2f} s")
+    if result.plan is None:
+        print("the goal cannot be reached")
+        return 1
+    for u, level, bought in result.plan:
+        upgrade = upgrades[u]
+        cost = problem.cost[u, level - 1]
+        spent = ", ".join(f"{value:g} {name}" for value, name in zip(cost, CURRENCIES) if value)
+        print(f"  {_duration(bought):>14}  {upgrade.name} -> level {level}  ({spent or 'free'})")
+    print(f"goal reached at {_duration(result.seconds)} (greedy order: {_duration(result.greedy_seconds)})")
+    if result.optimal:
+        print("optimal: the search was exhaustive")
+    elif result.lower_bound > 0:
+        gap = result.seconds / result.lower_bound - 1
+        print(f"search limit reached; at most {gap:.1%} above the optimum (bound {_duration(result.lower_bound)})")
+    else:
+        print("search limit reached; no lower bound for this goal, so the gap is unknown")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
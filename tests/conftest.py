@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The tools are flat modules beside the C# scripts, imported the way they import each other
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Assets", "Scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
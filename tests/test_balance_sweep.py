@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from balance_sweep import simulate_employee, simulate_replica, task_reward, task_seconds
+from fast_forward import FastForward
+
+DAY = 86400.0
+DEFINITION = {"base_duration": 30.0, "reward": [5.0, 1.0, 0.1], "difficulty": [(1.0, 1.0), (10.0, 2.0)]}
+
+
+def fast_forward(productivity, seconds, duration=30.0):
+    ff = FastForward([1.0], [100.0], [0.0], [duration], [productivity], [duration])
+    ff.advance(seconds)
+    return int(ff.completed[0]), float(ff.level[0])
+
+
+@pytest.mark.parametrize("productivity", [0.5, 1.0, 1.7])
+def test_continuous_time_matches_fast_forward(productivity):
+    checkpoints = [DAY, 7 * DAY]
+    tasks, level, _ = simulate_employee(DEFINITION, checkpoints, productivity, frame=0)
+    for at, got_tasks, got_level in zip(checkpoints, tasks, level):
+        assert (got_tasks, got_level) == fast_forward(productivity, at)
+
+
+@pytest.mark.parametrize("productivity", [0.5, 1.7])
+def test_whole_frames_trail_fast_forward_within_its_bound(productivity):
+    frame = 1 / 60
+    (tasks,), (level,), _ = simulate_employee(DEFINITION, [DAY], productivity, frame=frame)
+    exact, exact_level = fast_forward(productivity, DAY)
+    # Each task overshoots by under one frame, so the shortfall is at most frame / shortest task
+    shortest = task_seconds(DEFINITION, exact_level, productivity, frame=0)
+    assert exact * (1 - frame / shortest) - 1 <= tasks <= exact
+    assert exact_level - 1 <= level <= exact_level
+
+
+def test_day_one_of_three_employees_matches_fast_forward():
+    config = {"seed": 0, "days": [1], "play_hours": 24.0, "employees": 3, "frame": 0, "productivity": 1.0,
+              "quality": 1.0, "revenue": 1.0, "definitions": [DEFINITION]}
+    summary = simulate_replica(0, config)
+    exact, exact_level = fast_forward(1.0, DAY)
+    assert summary[0, 3] == 3 * exact
+    assert summary[0, 4] == exact_level
+
+
+def test_task_reward_applies_difficulty_and_the_quality_curve_at_stats_quality():
+    reward = task_reward(DEFINITION, [1.0, 10.0, 200.0], quality=50.0, revenue=2.0)
+    # Stats.quality 50, 95, 1045 -> qualityCurve 1.0, 1.45, 1.5 (clamped); difficulty 1, 2, 2
+    np.testing.assert_allclose(reward, np.outer([1.0 * 1.0, 2.0 * 1.45, 2.0 * 1.5], [10.0, 2.0, 0.2]))
+
+
+def test_reward_sums_task_reward_over_the_tasks_done():
+    (tasks,), (level,), (reward,) = simulate_employee(DEFINITION, [3600.0], 1.0, quality=20.0, revenue=0.5, frame=0)
+    # 10 * L tasks per finished level, then the tasks of the level in progress
+    levels = np.arange(1, int(level) + 1)
+    counts = 10.0 * levels
+    counts[-1] = tasks - counts[:-1].sum()
+    np.testing.assert_allclose(reward, counts @ task_reward(DEFINITION, levels, 20.0, 0.5))
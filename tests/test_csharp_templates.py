@@ -0,0 +1,125 @@
+import os
+import sys
+
+import pytest
+
+import csharp_templates
+from csharp_templates import TemplateSyntaxError, compile_template, render, translate
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Fresh in-memory cache, and the disk cache under tmp_path instead of .generator_cache/."""
+    monkeypatch.setattr(csharp_templates, "_compiled", {})
+    monkeypatch.setattr(csharp_templates, "PARTIALS", {})
+    monkeypatch.setattr(compile_template, "__defaults__", ("<template>", str(tmp_path)))
+    return tmp_path
+
+
+def cache_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".bin"))
+
+
+def test_expressions_and_helpers():
+    assert render("public {{ kind }} {{ name.upper() }};", kind="int", name="count") == "public int COUNT;"
+    assert render("{{ camel(name) }}", name="FocusEvent") == "focusEvent"
+
+
+def test_for_loop_variables():
+    source = "{% for x in items %}{{ loop.index }}:{{ x }}{% if not loop.last %}, {% endif %}{% endfor %}"
+    assert render(source, items=["a", "b", "c"]) == "1:a, 2:b, 3:c"
+    assert render("{% for x in items %}{{ x }}{% endfor %}", items=[]) == ""
+
+
+def test_nested_loops_restore_the_outer_loop():
+    source = ("{% for row in rows %}{% for x in row %}{{ x }}{% endfor %}"
+              "{% if loop.first %}!{% endif %};{% endfor %}")
+    assert render(source, rows=[[1, 2], [3]]) == "12!;3;"
+
+
+def test_conditionals_and_set():
+    source = ("{% set total = a + b %}{% if total > 10 %}big{% elif total > 5 %}medium"
+              "{% else %}small{% endif %} {{ total }}")
+    assert render(source, a=1, b=2) == "small 3"
+    assert render(source, a=4, b=3) == "medium 7"
+    assert render(source, a=9, b=3) == "big 12"
+
+
+def test_standalone_tag_lines_disappear():
+    source = "{\n    {% for f in fields %}\n    public int {{ f }};\n    {% endfor %}\n}\n"
+    assert render(source, fields=["a", "b"]) == "{\n    public int a;\n    public int b;\n}\n"
+
+
+def test_include_sees_but_cannot_rebind_variables():
+    csharp_templates.register_partial("field", "{% set name = 'changed' %}public int {{ name }};")
+    assert render("{% include \"field\" %} {{ name }}", name="value") == "public int changed; value"
+    with pytest.raises(KeyError):
+        render("{% include \"missing\" %}")
+
+
+@pytest.mark.parametrize("source, message", [
+    ("{% for x in %}{% endfor %}", "malformed for"),
+    ("{% if x %}", "unclosed if"),
+    ("{% endif %}", "unexpected endif"),
+    ("{% else %}", "else outside if"),
+    ("{% frobnicate %}", "unknown tag"),
+    ("{% include missing %}", "malformed include"),
+])
+def test_syntax_errors_name_the_problem(source, message):
+    with pytest.raises(TemplateSyntaxError, match=message):
+        translate(source, "Broken.cs")
+
+
+def test_invalid_expression_is_a_template_error():
+    with pytest.raises(TemplateSyntaxError, match="Broken.cs: invalid expression"):
+        compile_template("{{ 1 + }}", "Broken.cs")
+
+
+def test_compiled_code_is_reused_from_disk(isolated_cache, monkeypatch):
+    assert render("{{ x }}", "T.cs", x=1) == "1"
+    assert len(cache_files(isolated_cache)) == 1
+
+    # A new process: nothing in memory, and compiling again would fail
+    monkeypatch.setattr(csharp_templates, "_compiled", {})
+    monkeypatch.setattr(csharp_templates, "translate", lambda *args: pytest.fail("template was recompiled"))
+    assert render("{{ x }}", "T.cs", x=2) == "2"
+
+
+def test_edited_template_gets_its_own_entry(isolated_cache):
+    assert render("a{{ x }}", "T.cs", x=1) == "a1"
+    assert render("b{{ x }}", "T.cs", x=1) == "b1"
+    assert render("a{{ x }}", "Other.cs", x=1) == "a1"
+    assert len(cache_files(isolated_cache)) == 3
+
+
+def test_other_python_version_does_not_load_the_cached_code(isolated_cache, monkeypatch):
+    render("{{ x }}", "T.cs", x=1)
+    (written,) = cache_files(isolated_cache)
+
+    # marshal data is only valid for the interpreter that wrote it
+    monkeypatch.setattr(csharp_templates, "_compiled", {})
+    monkeypatch.setattr(sys.implementation, "cache_tag", "cpython-0")
+    assert render("{{ x }}", "T.cs", x=2) == "2"
+    assert written in cache_files(isolated_cache)
+    assert len(cache_files(isolated_cache)) == 2
+
+
+def test_engine_version_invalidates_the_cache(isolated_cache, monkeypatch):
+    render("{{ x }}", "T.cs", x=1)
+    monkeypatch.setattr(csharp_templates, "_compiled", {})
+    monkeypatch.setattr(csharp_templates, "ENGINE_VERSION", "test")
+    render("{{ x }}", "T.cs", x=1)
+    assert len(cache_files(isolated_cache)) == 2
+
+
+def test_corrupt_cache_file_is_recompiled(isolated_cache, monkeypatch):
+    render("{{ x }}", "T.cs", x=1)
+    (written,) = cache_files(isolated_cache)
+    with open(isolated_cache / written, "wb") as f:
+        f.write(b"\x00not marshal")
+    monkeypatch.setattr(csharp_templates, "_compiled", {})
+    assert render("{{ x }}", "T.cs", x=3) == "3"
+    # ... and the entry is rewritten with good code
+    monkeypatch.setattr(csharp_templates, "_compiled", {})
+    monkeypatch.setattr(csharp_templates, "translate", lambda *args: pytest.fail("template was recompiled"))
+    assert render("{{ x }}", "T.cs", x=4) == "4"
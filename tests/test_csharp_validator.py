@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from csharp_validator import CSharpSyntaxError, analyze, tokenize, validate
+
+
+def values(text):
+    return [value for _, value, _ in tokenize(text)]
+
+
+def test_comments_and_preprocessor_lines_vanish():
+    text = "// { not code\n#if UNITY_EDITOR\n/* } also\nnot code */ int x;\n#endif\n"
+    assert values(text) == ["int", "x", ";"]
+
+
+@pytest.mark.parametrize("literal", [
+    r'"a \" } {"',
+    '@"C:\\path "" }"',
+    '$"{{ literal }} {value}"',
+    '$"{(ready ? "yes" : "no")} {items[0]}"',
+    '@$"multi\nline {x}"',
+])
+def test_string_literals_collapse_to_one_token(literal):
+    tokens = tokenize(f"var s = {literal};")
+    assert [value for _, value, _ in tokens] == ["var", "s", "=", '""', ";"]
+    assert tokens[3][0] == "string"
+
+
+def test_char_literals_hold_braces():
+    assert values("c == '{' || c == '\\''") == ["c", "==", "'{'", "||", "c", "==", "'\\''"]
+
+
+def test_multi_character_operators():
+    assert values("a ??= b?.c => d != e && f::g") == ["a", "??=", "b", "?.", "c", "=>", "d", "!=", "e", "&&",
+                                                         "f", "::", "g"]
+
+
+def test_line_numbers_count_through_comments_and_verbatim_strings():
+    text = 'a\n/* one\ntwo */ b\nvar s = @"x\ny";\nc'
+    lines = {value: line for _, value, line in tokenize(text)}
+    assert (lines["a"], lines["b"], lines["var"], lines["c"]) == (1, 3, 4, 6)
+
+
+@pytest.mark.parametrize("text, message", [
+    ('var s = "open;\n', "newline in string literal"),
+    ('var s = @"open;', "unterminated string literal"),
+    ("/* open", "unterminated comment"),
+    ('var s = $"{x";', "unterminated"),
+    ('var s = $"{x)}";', "unbalanced"),
+])
+def test_malformed_literals_raise(text, message):
+    with pytest.raises(CSharpSyntaxError, match=message):
+        tokenize(text)
+
+
+def test_analyze_collects_namespaces_types_and_usings():
+    result = analyze("using UnityEngine;\nusing Alias = System.Text;\nnamespace FocusFounder.Core\n{\n"
+                     "    using Focus;\n    public sealed partial class Clock : MonoBehaviour\n    {\n"
+                     "        public struct Tick { }\n        public delegate void Changed(int value);\n"
+                     "    }\n    public enum Mode { A, B }\n}\n")
+    assert result["errors"] == []
+    assert result["namespaces"] == ["FocusFounder.Core"]
+    assert [[name, kind, partial] for _, name, kind, partial, _ in result["types"]] == [
+        ["Clock", "class", True], ["Clock.Tick", "struct", False], ["Clock.Changed", "delegate", False],
+        ["Mode", "enum", False]]
+    assert [[target, enclosing] for target, enclosing, _ in result["usings"]] == [
+        ["UnityEngine", ""], ["Focus", "FocusFounder.Core"]]
+
+
+def test_analyze_reports_where_a_bracket_was_left_open():
+    result = analyze("namespace A\n{\n    class B\n    {\n        void C() { if (x { }\n    }\n}\n")
+    first = result["errors"][0]
+    assert first["line"] == 5
+    assert first["message"] == "'(' is not closed before '}' on line 6"
+
+
+def test_analyze_needs_a_namespace_and_a_type():
+    messages = [error["message"] for error in analyze("int x;")["errors"]]
+    assert messages == ["no namespace declaration", "no type declaration"]
+
+
+def test_validate_checks_usings_and_duplicates_across_files(tmp_path):
+    files = {
+        "Core/A.cs": "namespace FocusFounder.Core { public class A { } }",
+        "Focus/B.cs": "using FocusFounder.Missing;\nnamespace FocusFounder.Focus { using Core; class A { } }",
+        "Data/C.cs": "namespace FocusFounder.Core { class A { } }",
+    }
+    problems = validate(files, jobs=1, cache_path=str(tmp_path / "validation.json"))
+    messages = {label: [error["message"] for error in errors] for label, errors in problems.items()}
+    # The relative `using Core;` resolves, and FocusFounder.Focus.A is a different type
+    assert messages == {
+        "Core/A.cs": ["type FocusFounder.Core.A is also declared in Data/C.cs"],
+        "Data/C.cs": ["type FocusFounder.Core.A is also declared in Core/A.cs"],
+        "Focus/B.cs": ["using FocusFounder.Missing: no such namespace"],
+    }
+
+
+def test_validation_cache_keeps_only_the_latest_run(tmp_path):
+    cache_path = tmp_path / "validation.json"
+    first = {"Core/A.cs": "namespace FocusFounder.Core { class A { } }"}
+    second = {"Core/A.cs": "namespace FocusFounder.Core { class A { int x; } }"}
+    validate(first, jobs=1, cache_path=str(cache_path))
+    validate(second, jobs=1, cache_path=str(cache_path))
+    with open(cache_path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 1
@@ -0,0 +1,39 @@
+import shutil
+
+import curve_bake
+import generate
+from animation_curve import parse_curves
+from curve_bake import bake_assets, read_baked, stale_tables
+from generator_registry import SCRIPTS_DIR
+from headless_sim import DATA_DIR
+
+
+def test_source_hash_is_fnv1a_over_the_float32_bits_of_the_keys():
+    # Task_.asset's AnimationCurve.Constant(1, 10, 1), as BakedCurve.Hash computes it in C#
+    with open(f"{DATA_DIR}/Tasks/Task_.asset", encoding="utf-8") as f:
+        curve = parse_curves(f.read())["difficultyMultiplier"]
+    assert curve.source_hash() == -510783235
+
+
+def test_editing_a_baked_curve_makes_its_table_stale(tmp_path):
+    data = tmp_path / "Data"
+    shutil.copytree(DATA_DIR, data)
+    asset = data / "Tasks" / "Task_.asset"
+    assert stale_tables(str(data)) == []
+    # A designer raises the level 10 multiplier in the inspector
+    text = asset.read_text(encoding="utf-8")
+    text = text.replace("      time: 10\n      value: 1\n", "      time: 10\n      value: 2\n")
+    asset.write_text(text, encoding="utf-8", newline="")
+    assert "difficultyMultiplier" not in read_baked(text)
+    assert stale_tables(str(data)) == [(str(asset), "difficultyMultiplier")]
+
+    bake_assets(str(data), scripts_dir=SCRIPTS_DIR)
+    assert stale_tables(str(data)) == []
+    assert read_baked(asset.read_text(encoding="utf-8"))["difficultyMultiplier"].evaluate(10.0) == 2.0
+
+
+def test_a_stale_table_fails_generate(monkeypatch, capsys):
+    monkeypatch.setattr(curve_bake, "bake_assets", lambda: [])
+    monkeypatch.setattr(curve_bake, "stale_tables", lambda: [(f"{DATA_DIR}/Tasks/Task_.asset", "difficultyMultiplier")])
+    assert generate.main(["--bake-curves", "--out", "memory"]) == 1
+    assert "Task_.asset:difficultyMultiplier: baked table does not match the curve" in capsys.readouterr().out
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from fast_forward import FastForward, compare
+from headless_sim import EmployeeColumns, HeadlessSim
+
+
+def test_steady_state_completions_and_level_up():
+    ff = FastForward([1.0], [100.0], [0.0], [30.0], [1.0], [30.0])
+    ff.advance(300.0)
+    assert (ff.completed[0], ff.level[0], ff.experience[0]) == (10, 2.0, 0.0)
+    # Level 2 works at 1.1, so the next task takes 30 / 1.1 s
+    ff.advance(30.0 / 1.1)
+    assert ff.completed[0] == 11
+
+
+def test_completion_inside_the_morale_ramp_solves_the_quadratic():
+    # At morale 50 the work done in t seconds is (50t + t^2) / 100: 6 units at t = 10
+    args = ([1.0], [50.0], [0.0], [6.0], [1.0], [6.0])
+    early, ff = FastForward(*args), FastForward(*args)
+    early.advance(9.99)
+    assert early.completed[0] == 0
+    ff.advance(10.0)
+    assert ff.completed[0] == 1
+    assert ff.morale[0] == pytest.approx(70.0)
+    assert ff.remaining[0] == 6.0
+
+
+def test_split_advances_match_one_advance():
+    rng = np.random.default_rng(0)
+    args = ([1.0] * 50, rng.uniform(0, 100, 50), [0.0] * 50, [20.0] * 50, rng.uniform(0.5, 2, 50), [20.0] * 50)
+    once, split = FastForward(*args), FastForward(*args)
+    once.advance(7200.0)
+    for _ in range(8):
+        split.advance(900.0)
+    assert np.abs(once.completed - split.completed).max() <= 1
+    np.testing.assert_array_equal(once.level, split.level)
+
+
+def test_round_trip_through_headless_columns():
+    columns = EmployeeColumns(3, morale=60.0)
+    sim = HeadlessSim(columns, [10.0])
+    sim.assign(np.ones(3, bool), 0)
+    ff = FastForward.from_columns(columns, [10.0])
+    ff.advance(600.0)
+    ff.to_columns(columns)
+    assert (columns.completed == ff.completed).all()
+    assert (columns.morale == 100.0).all() and columns.has_task.all()
+
+
+def test_fixed_step_loop_stays_within_the_tolerance():
+    lines, within = compare(count=300, hours=0.25)
+    assert within, "\n".join(lines)
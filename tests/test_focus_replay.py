@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from focus_replay import DAY, FOCUS, PAUSE, SECOND, UNFOCUS, ScalarFocusService, check, replay
+
+T0 = 1_700_000_000 * SECOND
+MIDNIGHT = (T0 // DAY + 1) * DAY
+
+
+def at(seconds):
+    return T0 + int(seconds * SECOND)
+
+
+def run(events, utc_offset=0.0):
+    """Replay one user's [(time, kind)] trace, checked against ScalarFocusService."""
+    times = [t for t, _ in events]
+    kinds = [kind for _, kind in events]
+    result = replay([0, len(events)], times, kinds, utc_offset=utc_offset, collect_events=True)
+    service = ScalarFocusService(utc_offset=utc_offset)
+    for t, kind in zip(times, kinds):
+        service.on_event(t, kind)
+    service.run_until(np.iinfo(np.int64).max, True)
+    started = result.session_started[1].tolist()
+    ended = list(zip(result.session_ended[1].tolist(), result.session_ended[2].tolist()))
+    assert started == [e[1] for e in service.events if e[0] == "SessionStarted"]
+    assert ended == [e[1:] for e in service.events if e[0] == "SessionEnded"]
+    return result, started, ended
+
+
+def test_pause_while_unfocused_leaves_the_debounce_running():
+    # LoseFocus ignores the pause (not focused yet), and the debounce still gains focus at T0 + 1 s
+    result, started, ended = run([(at(0), FOCUS), (at(0.5), PAUSE), (at(10), UNFOCUS)])
+    assert started == [T0 + SECOND]
+    assert ended == [(T0 + 10 * SECOND, 9 * SECOND)]
+    assert result.focus_gained[0] == 1
+
+
+def test_unfocus_while_unfocused_leaves_the_debounce_to_find_the_app_unfocused():
+    result, started, ended = run([(at(0), FOCUS), (at(0.5), UNFOCUS)])
+    assert (started, ended) == ([], [])
+    assert (result.focus_gained[0], result.focus_lost[0]) == (0, 0)
+
+
+def test_refocus_while_focused_publishes_session_started_again():
+    # The second debounce finds focus already held, so focusedAt stays T0 + 1 s
+    result, started, ended = run([(at(0), FOCUS), (at(10), FOCUS), (at(20), UNFOCUS)])
+    assert started == [T0 + SECOND, T0 + SECOND]
+    assert ended == [(T0 + 20 * SECOND, 19 * SECOND)]
+    assert result.focus_gained[0] == 1
+
+
+def test_callback_runs_before_a_debounce_wake_at_the_same_instant():
+    # Had the wake run first, focus would be gained and lost at T0 + 1 s
+    result, started, ended = run([(at(0), FOCUS), (at(1), UNFOCUS)])
+    assert (started, ended) == ([], [])
+    assert result.focus_gained[0] == 0
+
+
+def test_callback_runs_before_a_min_session_wake_at_the_same_instant():
+    # The session ends first, so the wake never publishes SessionStarted
+    result, started, ended = run([(at(0), FOCUS), (at(4), UNFOCUS)])
+    assert started == []
+    assert ended == [(T0 + 4 * SECOND, 3 * SECOND)]
+
+
+@pytest.mark.parametrize("utc_offset", [0.0, -8 * 3600.0])
+def test_session_across_midnight_counts_towards_the_day_it_started(utc_offset):
+    midnight = MIDNIGHT - int(utc_offset * SECOND)
+    result, _, ended = run([(midnight - 11 * SECOND, FOCUS), (midnight + 20 * SECOND, UNFOCUS),
+                            (midnight + 100 * SECOND, FOCUS), (midnight + 111 * SECOND, UNFOCUS)], utc_offset)
+    assert [duration for _, duration in ended] == [30 * SECOND, 10 * SECOND]
+    first = (midnight + int(utc_offset * SECOND)) // DAY - 1 - result.day0
+    assert result.daily[0, first:first + 2].tolist() == [30 * SECOND, 10 * SECOND]
+    assert result.credited[0] == 40 * SECOND
+
+
+@pytest.mark.parametrize("frame", [0.0, 1 / 60])
+def test_random_traces_match_the_scalar_service(frame):
+    assert check(users=300, events=40, seed=3, frame=frame) == 0
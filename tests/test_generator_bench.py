@@ -0,0 +1,51 @@
+import pytest
+
+import generator_bench
+from generator_bench import METHOD, machine_key, mad, regressions
+
+
+def phases(seconds, spread=0.0, reference=0.01):
+    return {phase: {"seconds": seconds, "mad": spread, "reference": reference} for phase in generator_bench.PHASES}
+
+
+def history(*runs):
+    return [{"machine": machine_key(), "method": METHOD, "results": {"Core": {"10": run}}} for run in runs]
+
+
+def test_mad_is_the_median_distance_from_the_median():
+    assert mad([1.0, 2.0, 3.0, 4.0, 100.0]) == 1.0
+    assert mad([5.0, 5.0]) == 0.0
+
+
+def test_nothing_is_judged_before_three_runs():
+    assert regressions({"Core": {"10": phases(1.0)}}, history(phases(0.1), phases(0.1)), 0.25) == []
+
+
+@pytest.mark.parametrize("seconds, slower", [(0.124, False), (0.126, True)])
+def test_a_quiet_phase_fails_past_the_threshold(seconds, slower):
+    past = history(phases(0.1), phases(0.1), phases(0.1))
+    found = regressions({"Core": {"10": phases(seconds)}}, past, 0.25)
+    assert bool(found) == slower
+    if found:
+        assert found[0][2:] == ("render", seconds, 0.1, pytest.approx(0.025))
+
+
+def test_a_noisy_phase_needs_a_larger_slowdown():
+    past = history(phases(0.09), phases(0.1), phases(0.11))
+    # sigma = 1.4826 * hypot(0.01 MAD across runs, 0) ~ 0.0148: 4 sigmas allow ~0.059 s
+    assert regressions({"Core": {"10": phases(0.15)}}, past, 0.25) == []
+    assert len(regressions({"Core": {"10": phases(0.17)}}, past, 0.25)) == 3
+
+
+def test_a_slower_machine_is_not_a_regression():
+    past = history(phases(0.1), phases(0.1), phases(0.1))
+    # Twice as long, but so is the reference workload
+    assert regressions({"Core": {"10": phases(0.2, reference=0.02)}}, past, 0.25) == []
+    assert regressions({"Core": {"10": phases(0.2)}}, past, 0.25)
+
+
+def test_runs_of_an_earlier_method_are_ignored():
+    past = history(phases(0.1), phases(0.1), phases(0.1))
+    for run in past:
+        run["method"] = METHOD - 1
+    assert regressions({"Core": {"10": phases(1.0)}}, past, 0.25) == []
@@ -0,0 +1,130 @@
+import json
+import os
+
+from generator_manifest import MANIFEST_NAME, Manifest, content_hash, write_scripts
+from generator_sinks import MemorySink
+
+SOURCE = "namespace FocusFounder.Core\n{\n    public class Clock { }\n}\n"
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def test_content_hash_is_salted_with_the_version():
+    assert content_hash("x") == content_hash("x")
+    assert content_hash("x") != content_hash("y")
+    assert content_hash("x", "1") != content_hash("x", "2")
+
+
+def test_recorded_file_is_current_until_it_changes(tmp_path):
+    write(tmp_path / "A.cs", SOURCE)
+    manifest = Manifest(str(tmp_path))
+    manifest.record("A.cs", content_hash(SOURCE))
+    assert manifest.is_current("A.cs", content_hash(SOURCE))
+    assert not manifest.is_current("A.cs", content_hash(SOURCE + "// edited\n"))
+    assert not manifest.is_current("Missing.cs", content_hash(SOURCE))
+
+
+def test_touched_file_falls_back_to_hashing_the_disk(tmp_path):
+    path = tmp_path / "A.cs"
+    write(path, SOURCE)
+    manifest = Manifest(str(tmp_path))
+    manifest.record("A.cs", content_hash(SOURCE))
+
+    # Same content, new mtime (a checkout): still current, and re-recorded
+    os.utime(path, ns=(1, 1))
+    assert manifest.is_current("A.cs", content_hash(SOURCE))
+    assert manifest.entries["A.cs"]["mtime_ns"] == 1
+
+    # A hand edit changes the size, so the recorded hash is not trusted
+    write(path, SOURCE + " ")
+    assert not manifest.is_current("A.cs", content_hash(SOURCE))
+
+
+def test_unrecorded_file_with_matching_content_is_adopted(tmp_path):
+    write(tmp_path / "A.cs", SOURCE)
+    manifest = Manifest(str(tmp_path))
+    assert manifest.is_current("A.cs", content_hash(SOURCE))
+    assert "A.cs" in manifest.entries
+
+
+def test_save_and_load_round_trip(tmp_path):
+    write(tmp_path / "A.cs", SOURCE)
+    manifest = Manifest(str(tmp_path))
+    manifest.record("A.cs", content_hash(SOURCE))
+    manifest.save()
+    assert Manifest(str(tmp_path)).entries == manifest.entries
+
+
+def test_other_generator_version_discards_the_entries(tmp_path):
+    write(tmp_path / "A.cs", SOURCE)
+    manifest = Manifest(str(tmp_path), version="1")
+    manifest.record("A.cs", content_hash(SOURCE, "1"))
+    manifest.save()
+    assert Manifest(str(tmp_path), version="2").entries == {}
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    write(tmp_path / MANIFEST_NAME, "{not json")
+    assert Manifest(str(tmp_path)).entries == {}
+
+
+def test_forget_and_merge_folder(tmp_path):
+    manifest = Manifest(str(tmp_path))
+    entry = {"hash": "h", "size": 1, "mtime_ns": 1}
+    manifest.entries = {"Core/A.cs": entry, "Core/B.cs": entry, "Data/C.cs": entry}
+    manifest.forget("Core/A.cs")
+    manifest.forget("Core/Unknown.cs")
+    assert sorted(manifest.entries) == ["Core/B.cs", "Data/C.cs"]
+
+    manifest.merge_folder("Core", {"Core/D.cs": entry})
+    assert sorted(manifest.entries) == ["Core/D.cs", "Data/C.cs"]
+    assert manifest.entries_under("Data") == {"Data/C.cs": entry}
+
+
+def test_write_scripts_only_rewrites_changed_files(tmp_path):
+    root = str(tmp_path)
+    report = write_scripts("Core", {"Clock.cs": SOURCE}, root)
+    assert report.rewritten == ["Clock.cs"]
+    assert os.path.exists(tmp_path / "Core" / "Clock.cs.meta")
+    with open(tmp_path / MANIFEST_NAME, encoding="utf-8") as f:
+        assert sorted(json.load(f)["files"]) == ["Core/Clock.cs", "Core/Clock.cs.meta"]
+
+    report = write_scripts("Core", {"Clock.cs": SOURCE}, root)
+    assert (report.rewritten, report.skipped) == ([], ["Clock.cs"])
+
+    edited = SOURCE.replace("{ }", "{ public int Ticks; }")
+    report = write_scripts("Core", {"Clock.cs": edited}, root)
+    assert report.rewritten == ["Clock.cs"]
+    with open(tmp_path / "Core" / "Clock.cs", encoding="utf-8") as f:
+        assert f.read() == edited
+
+
+def test_write_scripts_reports_files_no_longer_generated(tmp_path):
+    root = str(tmp_path)
+    write_scripts("Core", {"Clock.cs": SOURCE, "Old.cs": SOURCE.replace("Clock", "Old")}, root)
+    report = write_scripts("Core", {"Clock.cs": SOURCE}, root)
+    assert report.stale == ["Old.cs", "Old.cs.meta"]
+    # Reported, not deleted
+    assert os.path.exists(tmp_path / "Core" / "Old.cs")
+    assert write_scripts("Core", {"Clock.cs": SOURCE}, root, complete=False).stale == []
+
+
+def test_meta_guid_survives_a_rewrite(tmp_path):
+    root = str(tmp_path)
+    write_scripts("Core", {"Clock.cs": SOURCE}, root)
+    with open(tmp_path / "Core" / "Clock.cs.meta", encoding="utf-8") as f:
+        meta = f.read()
+    write_scripts("Core", {"Clock.cs": SOURCE.replace("{ }", "{ public int Ticks; }")}, root)
+    with open(tmp_path / "Core" / "Clock.cs.meta", encoding="utf-8") as f:
+        assert f.read() == meta
+
+
+def test_non_persistent_sink_gets_every_file_and_no_manifest(tmp_path):
+    sink = MemorySink()
+    report = write_scripts("Core", {"Clock.cs": SOURCE}, str(tmp_path), sink=sink)
+    assert report.rewritten == ["Clock.cs"]
+    assert sorted(sink.files) == ["Core/Clock.cs", "Core/Clock.cs.meta"]
+    assert not os.path.exists(tmp_path / MANIFEST_NAME)
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+import generate
+import generator_sinks
+from generator_registry import discover
+from generator_sinks import FileSystemSink
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    """Paths passed to fsync, in order."""
+    paths = []
+    real = generator_sinks._fsync
+    monkeypatch.setattr(generator_sinks, "_fsync", lambda path, *args: (paths.append(path), real(path, *args)))
+    return paths
+
+
+def test_commit_fsyncs_each_file_then_each_directory_once(tmp_path, synced):
+    committed = []
+    with FileSystemSink(str(tmp_path)) as sink:
+        sink.write("Core/A.cs", "a", lambda: committed.append("Core/A.cs"))
+        sink.write("Core/B.cs", "b")
+        sink.write("Data/C.cs", "c")
+        assert not os.path.exists(tmp_path / "Core" / "A.cs")
+    assert (tmp_path / "Data" / "C.cs").read_text() == "c"
+    assert committed == ["Core/A.cs"]
+    files, directories = synced[:3], synced[3:]
+    assert all(path.endswith(".tmp") for path in files)
+    assert directories == [str(tmp_path / "Core"), str(tmp_path / "Data")]
+
+
+def test_non_durable_commit_does_not_fsync(tmp_path, synced):
+    with FileSystemSink(str(tmp_path), durable=False) as sink:
+        sink.write("Core/A.cs", "a")
+    assert synced == []
+    assert (tmp_path / "Core" / "A.cs").read_text() == "a"
+
+
+def test_detached_files_are_committed_by_the_adopting_sink(tmp_path, synced):
+    worker = FileSystemSink(str(tmp_path))
+    stats = []
+    worker.write("Core/A.cs", "a", stats.append)
+    staged = worker.detach()
+    worker.commit()
+    assert synced == [] and not os.path.exists(tmp_path / "Core" / "A.cs")
+
+    with FileSystemSink(str(tmp_path)) as parent:
+        parent.adopt(staged)
+    # The stat handed over at detach time still describes the file in place
+    st = os.stat(tmp_path / "Core" / "A.cs")
+    assert (stats[0].st_size, stats[0].st_mtime_ns) == (st.st_size, st.st_mtime_ns)
+
+
+def test_failed_batch_leaves_no_temp_files(tmp_path):
+    with pytest.raises(RuntimeError):
+        with FileSystemSink(str(tmp_path)) as sink:
+            sink.write("Core/A.cs", "a")
+            raise RuntimeError
+    assert os.listdir(tmp_path / "Core") == []
+
+
+def test_generate_run_commits_once_for_every_category(tmp_path, synced):
+    categories, _ = discover()
+    results = generate.run(categories, str(tmp_path), jobs=1)
+    written = sum(2 * len(result.report.rewritten) for result in results)
+    directories = [path for path in synced if not path.endswith(".tmp")]
+    assert len(synced) - len(directories) == written
+    assert sorted(directories) == sorted({str(tmp_path / result.folder) for result in results})
+
+    # Nothing changed: nothing staged, nothing synced
+    synced.clear()
+    generate.run(categories, str(tmp_path), jobs=1)
+    assert synced == []
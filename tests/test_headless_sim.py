@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from headless_sim import CELEBRATING, WORKING, EmployeeColumns, HeadlessSim, ScalarEmployee, check, load_task_durations
+
+
+def one_employee(duration, base_productivity=1.0, morale=100.0):
+    columns = EmployeeColumns(1, base_productivity, morale)
+    sim = HeadlessSim(columns, [duration])
+    sim.assign(np.ones(1, bool), 0)
+    return columns, sim
+
+
+def test_task_completes_after_duration_over_productivity():
+    columns, sim = one_employee(2.0, base_productivity=2.0)
+    assert sim.run(3, 0.25) == 0
+    assert (columns.state[0], columns.remaining[0]) == (WORKING, 0.5)
+    assert sim.step(0.25) == 1
+    assert (columns.state[0], columns.has_task[0], columns.experience[0]) == (CELEBRATING, False, 10.0)
+    # A celebrating employee does no work until it is given a task
+    assert sim.run(4, 0.25) == 0
+
+
+def test_tenth_task_levels_up_and_speeds_up_the_next():
+    columns, sim = one_employee(1.0)
+    assert sim.run(40, 0.25, auto_assign=True) == 10
+    assert (columns.level[0], columns.experience[0]) == (2.0, 0.0)
+    # Stats.productivity is 1.1 at level 2
+    sim.step(0.25)
+    assert columns.remaining[0] == pytest.approx(1.0 - 0.275)
+
+
+def test_morale_scales_productivity_and_recovers_to_100():
+    columns, sim = one_employee(100.0, morale=50.0)
+    sim.step(0.5)
+    assert columns.remaining[0] == pytest.approx(100.0 - 0.25)
+    assert columns.morale[0] == 51.0
+    sim.run(100, 0.5)
+    assert columns.morale[0] == 100.0
+
+
+def test_columns_match_the_scalar_employee_bit_for_bit():
+    employee = ScalarEmployee(1.3, 40.0)
+    employee.assign(0, 7.0)
+    columns, sim = one_employee(7.0, 1.3, 40.0)
+    for _ in range(500):
+        sim.step(0.1, auto_assign=True)
+        employee.tick(0.1)
+        if employee.remaining is None:
+            employee.assign(0, 7.0)
+    assert (columns.level[0], columns.experience[0], columns.morale[0], columns.remaining[0],
+            columns.completed[0]) == (employee.level, employee.experience, employee.morale, employee.remaining,
+                                      employee.completed)
+
+
+def test_random_employees_match_the_scalar_reference():
+    assert check(count=50, steps=1500) == 0
+
+
+def test_task_durations_are_read_from_the_assets():
+    durations = load_task_durations()
+    assert durations and all(duration > 0 for duration in durations.values())
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from balance_sweep import task_reward
+from headless_sim import EmployeeColumns
+from sharded_sim import Shard, check, company_definitions, make_company, partition
+
+DEFINITION = {"base_duration": 1.0, "reward": [10.0, 2.0, 0.0], "difficulty": [(1.0, 1.0), (10.0, 2.0)]}
+
+
+def test_completions_earn_what_compute_yield_pays():
+    columns = EmployeeColumns(4)
+    shard = Shard(columns, [DEFINITION])
+    shard.sim.assign(np.ones(4, bool), 0)
+    delta = shard.tick(1.0)
+    # Level 1, base quality 1: qualityCurve(1) = 0.51 on the default Linear(0, 0.5, 100, 1.5)
+    np.testing.assert_allclose(delta, 4 * 0.51 * np.array([10.0, 2.0, 0.0]))
+    np.testing.assert_allclose(delta, task_reward(DEFINITION, np.ones(4)).sum(axis=0))
+
+
+def test_partition_keeps_offices_whole_and_evens_out_employees():
+    offsets = np.array([0, 25, 50, 75, 100])
+    assert partition(offsets, 2) == [(0, 50), (50, 100)]
+    # A shard ends at the first office boundary at or past its share
+    assert partition(offsets, 3) == [(0, 50), (50, 75), (75, 100)]
+    # More shards than offices leaves no empty shard
+    assert partition(offsets, 10) == [(0, 25), (25, 50), (50, 75), (75, 100)]
+
+
+def test_company_has_every_employee_in_some_office():
+    columns, offsets = make_company(12, 500, company_definitions(True), seed=2)
+    assert offsets[0] == 0 and offsets[-1] == columns.count == 500
+    assert (np.diff(offsets) >= 1).all() and columns.has_task.all()
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_sharded_run_matches_the_unsharded_one(workers):
+    equal, difference = check(offices=12, employees=3000, ticks=200, workers=workers)
+    assert equal
+    assert difference < 1e-9
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from strategy_search import PARAMETERS, compute_rate, compute_yield, evaluate
+
+CONTEXT = {"morale": 80.0, "quality": 20.0, "productivity": 1.3, "office": 1.1, "global": 0.9, "revenue": 1.2,
+           "duration": 30.0, "reward": [5.0, 2.0, 0.5], "difficulty": [[1.0, 1.0], [10.0, 2.0]]}
+
+
+def lerp(a, b, t):
+    return a + (b - a) * min(max(t, 0.0), 1.0)
+
+
+def stats(context, level):
+    """Employee.CalculateStats: (productivity, quality)."""
+    level_multiplier = 1.0 + (level - 1.0) * 0.1
+    return (context["productivity"] * level_multiplier * context["morale"] / 100.0,
+            context["quality"] * level_multiplier)
+
+
+def scalar_rate(params, level, context):
+    """BaseProductivityStrategy.ComputeRate, line by line."""
+    base_rate = stats(context, level)[0]
+    morale_multiplier = lerp(0.5, 1.5, context["morale"] / 100.0)
+    level_multiplier = 1.0 + (level - 1.0) * params["levelScaling"]
+    focus_multiplier = 1.0 + params["focusBonus"]
+    return base_rate * morale_multiplier * level_multiplier * context["office"] * context["global"] * focus_multiplier
+
+
+def scalar_yield(params, level, context):
+    """BaseYieldStrategy.ComputeYield without the experience term."""
+    difficulty = np.interp(level, *zip(*context["difficulty"]))
+    base_reward = [value * difficulty for value in context["reward"]]
+    quality_multiplier = lerp(params["qualityCurveStart"], params["qualityCurveEnd"], stats(context, level)[1] / 100.0)
+    return [value * quality_multiplier * context["revenue"] for value in base_reward]
+
+
+COMBINATIONS = [
+    PARAMETERS,
+    PARAMETERS | {"levelScaling": 0.25, "focusBonus": 0.0, "qualityCurveStart": 0.2, "qualityCurveEnd": 3.0},
+]
+
+
+def as_arrays(combinations):
+    return {name: np.array([params[name] for params in combinations]) for name in PARAMETERS}
+
+
+@pytest.mark.parametrize("context", [CONTEXT, CONTEXT | {"morale": 100.0, "quality": 95.0}])
+def test_vectorized_strategies_match_the_scalar_transcription(context):
+    level = np.array([1.0, 2.0, 10.0, 60.0])
+    rate = compute_rate(as_arrays(COMBINATIONS), level, context)
+    reward = compute_yield(as_arrays(COMBINATIONS), level, context)
+    for i, params in enumerate(COMBINATIONS):
+        for j, at in enumerate(level):
+            assert rate[i, j] == pytest.approx(scalar_rate(params, at, context))
+            np.testing.assert_allclose(reward[i, j], scalar_yield(params, at, context))
+
+
+def test_task_seconds_at_level_ten_with_default_strategy():
+    context = CONTEXT | {"morale": 100.0, "productivity": 1.0, "office": 1.0, "global": 1.0}
+    seconds = evaluate(as_arrays([PARAMETERS]), context, 10)["task_seconds"]
+    # 30 / (Stats 1.9 * morale 1.5 * levelScaling 1.9 * focus 1.2)
+    assert seconds[0, 9] == pytest.approx(4.617, abs=1e-3)
@@ -0,0 +1,36 @@
+import numpy as np
+
+from timestep_drift import MAX_DELTA_TIME, PROFILES, FixedStepClock, check, exact, frame_deltas, integrate
+
+
+def test_clock_spends_banked_time_in_whole_steps():
+    clock = FixedStepClock(step=0.0625, max_steps=8)
+    assert clock.consume(np.array([0.15625, 0.03125, 0.0], np.float32)).tolist() == [2, 1, 0]
+    assert clock.accumulator == 0.0
+
+
+def test_clock_caps_steps_per_frame_and_drops_the_excess():
+    clock = FixedStepClock(step=0.0625, max_steps=4)
+    # 1 s banks 16 steps: 4 run, the bank is clipped to 8 steps, and the 4 left run next frame
+    assert clock.consume(np.array([1.0, 0.0], np.float32)).tolist() == [4, 4]
+    assert (clock.dropped, clock.accumulator) == (0.5, 0.0)
+
+
+def test_frame_deltas_cover_the_horizon_and_hitches_are_clipped():
+    raw = np.concatenate(list(frame_deltas(PROFILES["phone-throttled"], 300.0, seed=2, max_delta=np.inf)))
+    assert raw.sum(dtype=np.float64) >= 300.0
+    deltas = np.concatenate(list(frame_deltas(PROFILES["phone-throttled"], 300.0, seed=2)))
+    assert deltas.max() <= np.float32(MAX_DELTA_TIME)
+    # The same frames, so clipping only loses the hitches' excess
+    np.testing.assert_array_equal(deltas, np.minimum(raw, MAX_DELTA_TIME).astype(np.float32))
+
+
+def test_each_task_finishes_on_the_first_tick_after_its_duration():
+    # 2.5 s tasks on 1 s ticks finish every 3 s; after ten the level 2 task needs 2.27 s
+    result = integrate([np.arange(1.0, 34.0)], [1.0], 2.5)
+    assert (result["completed"][0], result["level"][0]) == (11, 2.0)
+    assert exact([1.0], 2.5, 33.0)[0] > 11
+
+
+def test_integration_matches_the_tick_loop():
+    assert check(seconds=120.0, employees=8) == 0
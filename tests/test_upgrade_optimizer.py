@@ -0,0 +1,34 @@
+import pytest
+
+from upgrade_optimizer import Problem, main, synthetic_upgrades
+
+
+def problem(goal, goal_level):
+    upgrades = synthetic_upgrades(20, max_level=4, seed=1)
+    return upgrades, Problem(upgrades, [[1.0, 0.1, 0.0]], ["default"], goal, goal_level)
+
+
+def test_goal_level_within_the_upgrade_levels_is_kept():
+    upgrades, p = problem("upgrade_5", 1)
+    assert p.goal_level == 1
+    top = upgrades[p.goal].max_level
+    assert problem("upgrade_5", top)[1].goal_level == top
+
+
+@pytest.mark.parametrize("extra", [1, 10])
+def test_goal_level_above_the_maximum_is_rejected(extra):
+    upgrades, p = problem("upgrade_5", 1)
+    with pytest.raises(ValueError, match="upgrade_5 has levels 1 to"):
+        problem("upgrade_5", upgrades[p.goal].max_level + extra)
+
+
+@pytest.mark.parametrize("goal, message", [
+    ("upgrade_299:5", "upgrade_299 has levels 1 to 3, not 5"),
+    ("upgrade_299:0", "upgrade_299 has levels 1 to 3, not 0"),
+    ("upgrade_299:x", "--goal level must be a whole number"),
+])
+def test_command_line_rejects_an_unreachable_goal_level(goal, message, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--synthetic", "300", "--goal", goal])
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err